@@ -14,7 +14,6 @@ import os
 import math
 import json
 import subprocess
-from lxml import etree
 import platform
 import re
 from datetime import datetime
@@ -22,6 +21,8 @@ import warnings
 from tkinter import messagebox
 import gettext
 import copy
+import io
+from contextlib import contextmanager
 
 # Configurer gettext pour l'internationalisation
 _locale_dir = os.path.join(os.path.dirname(__file__), 'locale')
@@ -49,11 +50,33 @@ try:
     # Tentative d'import en tant que package
     from geometry import Point, Segment, Arc, BezierCurve
     from duplicate_remover import DuplicateRemover
+    from profiling import StageProfiler
+    from cancellation import CancelToken, OperationCancelled, DeadlineExceeded, TimeBudget
+    from progress import ProgressTracker, DEFAULT_WEIGHTS, console_logger, logger as progress_logger
+    from result_cache import ResultCache, default_cache_dir
+    from incremental import SegmentClusters, path_key, zone_signature, repair_tour
+    from document_index import DocumentIndex
+    from computed_style import ColorTable, ComputedStyles, UNSET
+    from path_data import parse_path, format_path, ARITY, PathWriter
+    from machine_export import CutSettings, EXPORT_FORMATS, write_tour
+    from trail_cover import cover_with_trails
+    from endpoint_welding import EndpointWelder
     from ui.gui import show_gui
 except ImportError:
     # Fallback en imports absolus
     from geometry import Point, Segment, Arc, BezierCurve
     from duplicate_remover import DuplicateRemover
+    from profiling import StageProfiler
+    from cancellation import CancelToken, OperationCancelled, DeadlineExceeded, TimeBudget
+    from progress import ProgressTracker, DEFAULT_WEIGHTS, console_logger, logger as progress_logger
+    from result_cache import ResultCache, default_cache_dir
+    from incremental import SegmentClusters, path_key, zone_signature, repair_tour
+    from document_index import DocumentIndex
+    from computed_style import ColorTable, ComputedStyles, UNSET
+    from path_data import parse_path, format_path, ARITY, PathWriter
+    from machine_export import CutSettings, EXPORT_FORMATS, write_tour
+    from trail_cover import cover_with_trails
+    from endpoint_welding import EndpointWelder
     from ui.gui import show_gui
 
 class OptimLaser(inkex.EffectExtension):
@@ -61,6 +84,31 @@ class OptimLaser(inkex.EffectExtension):
     """Extension Inkscape pour l'optimisation de découpe laser"""
     _distance_cache = {}
     ListeDeGris = []
+    # Jeton sans annulation ni échéance, remplacé pendant _run_pipeline
+    _cancel_token = CancelToken()
+    # Suivi inactif (sans étapes prévues), remplacé pendant _run_pipeline
+    _progress = ProgressTracker()
+    # Clé du résultat à mettre en cache (None = cache désactivé)
+    _cache_key = None
+    # Chemins repris d'un passage précédent, ignorés par les doublons et la fusion
+    _settled_paths = frozenset()
+    # Enregistrement du passage précédent (None = mode incrémental inactif)
+    _incremental_record = None
+    # Index des éléments rendus et des calques (None = à reconstruire)
+    _doc_index = None
+    # Styles calculés de l'index courant et table des couleurs du traitement
+    _styles = None
+    _colors = None
+    # Chemins analysés, par élément : {élément: PathData} (None = aucun)
+    _parsed_paths = None
+    # Soudure des extrémités de la fusion en cours (None hors de _optimize_path)
+    _welder = None
+    # Saut plus court (unités utilisateur) : la tête est déjà en place, pas de nouveau perçage
+    PIERCE_FREE_DISTANCE = 0.01
+    # Distance de soudure des extrémités avant la fusion (unités utilisateur). Plus
+    # large (tolérance des doublons), elle soude des extrémités voisines sans lien et
+    # crée des jonctions qui coupent les chaînes
+    WELD_TOLERANCE = 0.01
     
     def add_arguments(self, pars):
         """Ajoute les arguments de la ligne de commande (pour compatibilité)"""
@@ -114,54 +162,121 @@ class OptimLaser(inkex.EffectExtension):
             self.SupprimerCouleursNonGerees = params.get('SupprimerCouleursNonGerees', True)
             self.SauvegarderSousDecoupe = params.get('SauvegarderSousDecoupe', True)
             self.remove_duplicates_all_colors = params.get('remove_duplicates_all_colors', False)
+            self.performance_report = params.get('performance_report', False)
+            self.profiler = params.get('profiler', 'none')
+            self.max_seconds = params.get('max_seconds', 0)
+            self.result_cache = params.get('result_cache', True)
+            self.incremental = params.get('incremental', False)
+            self.output_precision = params.get('output_precision', 0.0)
+            self.relative_commands = params.get('relative_commands', False)
+            self.compound_paths = params.get('compound_paths', False)
+            self.machine_export = params.get('machine_export', 'none')
+            self.eulerian_chaining = params.get('eulerian_chaining', False)
+            self.start_cost = params.get('start_cost', 0.0)
+            self.simplify_tolerance = params.get('simplify_tolerance', 0.0)
             
             # Lancer l'optimisation
             self._run_optimization()
     
-    def _update_progress_window(self, task_text=None):
+    def _update_progress_window(self, task_text=None, percent=None):
         """Met à jour la fenêtre de progression
         
         Args:
             task_text: Texte de la tâche en cours à afficher (optionnel)
+            percent: Avancement global en pourcentage (optionnel)
         """
         if hasattr(self, 'gui_instance') and self.gui_instance:
-            self.gui_instance.update_progress(task_text)
+            self.gui_instance.update_progress(task_text, percent)
+    
+    def _create_progress(self, resume=False):
+        """Crée le suivi d'avancement des étapes prévues pour ce traitement.
+        
+        Args:
+            resume: True si les étapes jusqu'à la fusion sont reprises d'un point de reprise
+        """
+        if resume:
+            plan = ['checkpoint']
+        else:
+            plan = ['gray_save', 'ungroup', 'color_filter', 'subpaths']
+            if self._incremental_record is not None:
+                plan.append('zones')
+            plan += ['dedup', 'merge']
+        if self.enable_global_optimization:
+            plan.append('ordering')
+        elif self._output_writer() is not None:
+            plan.append('output')
+        if getattr(self, 'machine_export', 'none') in EXPORT_FORMATS:
+            plan.append('export')
+        plan += ['gray_restore', 'save']
+        if hasattr(self, 'gui_instance') and self.gui_instance:
+            return ProgressTracker(plan, callback=self._update_progress_window)
+        # Sans interface : les compteurs sont journalisés sur stderr
+        return ProgressTracker(plan, log=console_logger())
+    
+    @contextmanager
+    def _stage(self, name, label, message):
+        """Encadre une étape : mesure (profileur) et avancement (fenêtre ou journal).
+        
+        Args:
+            name: Identifiant de l'étape
+            label: Libellé court du rapport de performances
+            message: Texte affiché pendant l'étape
+        """
+        with self._profiler.stage(name, label) as record, self._progress.stage(name, message):
+            yield record
+    
+    @contextmanager
+    def _time_slice(self, name):
+        """Donne à l'étape interruptible name sa part de la durée maximale.
+        
+        Quand l'échéance est atteinte, l'étape s'arrête en gardant son meilleur
+        résultat partiel ; elle est notée comme écourtée et le traitement continue.
+        L'annulation par l'utilisateur reste propagée.
+        """
+        token = self._budget.token(name, self._is_cancel_requested)
+        self._cancel_token = token
+        try:
+            yield token
+        except DeadlineExceeded:
+            # Le document reste cohérent entre deux points de contrôle
+            pass
+        finally:
+            self._budget.record(name, token)
+            self._cancel_token = CancelToken(self._is_cancel_requested)
+    
+    def _truncated_stage_labels(self):
+        """Libellés des étapes écourtées faute de temps."""
+        labels = {r.name: r.label for r in self._profiler.records}
+        return [labels.get(name, name) for name in self._budget.truncated]
   
     def save_gray_elements(self):
         """
         Sauvegarde les éléments gris (remplissage ou contour) et leur couche dans ListeDeGris.
         """
         self.ListeDeGris = []
-        for element in self.svg.descendants():
-            # Ignorer les éléments à l'intérieur de <defs>, <marker>, <pattern>, etc.
-            if self._is_in_defs(element):
+        index = self._document_index()
+        styles = self._computed_styles()
+        is_gray = styles.colors.is_gray
+        # Éléments déjà sauvegardés avec leur ancêtre (ils héritent de sa couleur)
+        saved = set()
+        # Éléments rendus uniquement (pas ceux de <defs>, <marker>, <pattern>, etc.)
+        for element in index.elements:
+            record = styles.record(element)
+            if element.getparent() in saved:
+                saved.add(element)
+                if is_gray(record.fill):
+                    element.style['fill'] = 'none'
                 continue
-            couche = self.find_layer(element)
-            style = element.style
-            style_save = element.style
-            # Vérifier le remplissage gris
-            fill_value = style.get('fill', None)
-            is_gray_fill = False
-            if fill_value and fill_value.lower() != 'none':
-                fill_color = inkex.Color(style('fill', None))
-                r, v, b = fill_color.to_rgb()
-                if (r == v and r == b and v == b):
-                    is_gray_fill = True
-                    style['fill'] = 'none'
-            # Vérifier le contour gris
-            stroke_value = style.get('stroke', None)
-            is_gray_stroke = False
-            if stroke_value and stroke_value.lower() != 'none':
-                try:
-                    stroke_color = inkex.Color(style('stroke', None))
-                    r, v, b = stroke_color.to_rgb()
-                    if (r == v and r == b and v == b):
-                        is_gray_stroke = True
-                except Exception:
-                    pass
+            is_gray_fill = is_gray(record.fill)
+            is_gray_stroke = is_gray(record.stroke)
             # Ajouter à ListeDeGris si l'un ou l'autre est gris
             if is_gray_fill or is_gray_stroke:
-                self.ListeDeGris.append((copy.deepcopy(element), couche, style_save))
+                style_save = element.style
+                if is_gray_fill:
+                    style = element.style
+                    style['fill'] = 'none'
+                saved.add(element)
+                self.ListeDeGris.append((copy.deepcopy(element), index.layer(element), style_save))
     
     def restore_gray_elements(self):
         """
@@ -197,6 +312,7 @@ class OptimLaser(inkex.EffectExtension):
             compteur_gris += 1
 
         self.ListeDeGris = []
+        self._invalidate_document_index()
                 
     def remove_unmanaged_colors(self):
         """Supprime les éléments dont la couleur de trait n'est pas gérée par la découpeuse laser"""
@@ -213,20 +329,18 @@ class OptimLaser(inkex.EffectExtension):
         except Exception as e:
             return
 
-        # Suppression des éléments avec couleur de trait non gérée
-        for element in list(self.svg.descendants()):
-            # Ne pas toucher aux éléments dans <defs>/<marker>/<pattern>/etc.
-            if self._is_in_defs(element):
-                continue
-            if hasattr(element, 'style') and 'stroke' in element.style:
-                stroke_color = element.style.get('stroke', '#000000').lower()
-                if stroke_color.startswith('#'):
-                    stroke_color = stroke_color[1:]
-
-                if stroke_color not in color_order:
-                    parent = element.getparent()
-                    if parent is not None:
-                        parent.remove(element)
+        styles = self._computed_styles()
+        managed = {styles.colors.index('#' + color.lstrip('#')) for color in color_order}
+        # Suppression des éléments avec couleur de trait non gérée et des éléments
+        # masqués (display:none, visibility:hidden), que la découpeuse ne doit pas voir
+        # (éléments rendus uniquement : pas de <defs>/<marker>/<pattern>/etc.)
+        for element in self._document_index().elements:
+            record = styles.record(element)
+            if (record.stroke != UNSET and record.stroke not in managed) or not record.visible:
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
+        self._invalidate_document_index()
 
     def kill_other_inkscape_running(self):
         """Ferme toutes les autres instances d'inkscape"""
@@ -272,27 +386,35 @@ class OptimLaser(inkex.EffectExtension):
             pass
         
         # --- 2. Collecter tous les PathElement du SVG (en excluant ceux dans <defs>) ---
-        all_path_elems = [el for el in self.svg.xpath('//svg:path')
-                          if isinstance(el, PathElement) and not self._is_in_defs(el)]
+        all_path_elems = [el for el in self._document_index().elements
+                          if isinstance(el, PathElement)]
         if not all_path_elems:
             return {'improvement': 0.0, 'initial_idle': 0.0,
                     'final_idle': 0.0, 'estimated_time_s': 0.0, 'num_paths': 0}
         
         # --- 3. Extraire métadonnées de chaque chemin ---
+        incremental = self._incremental_record is not None
+        styles = self._computed_styles()
+        # Coût fixe de chaque départ de chemin : démarrage (réglage global) et perçage
+        # (par couleur), converti en distance à vide équivalente pour l'ordonnancement
+        start_cost = getattr(self, 'start_cost', 0.0)
+        idle_speed = getattr(self, 'idle_speed', 2800.0)
+        cut_settings = self._cut_settings()
         path_infos = []
         for el in all_path_elems:
             start, end = self.get_path_endpoints(el)
             if start is None or end is None:
                 continue
             
-            color_raw = '#000000'
-            if hasattr(el, 'style') and el.style:
-                color_raw = el.style.get('stroke', '#000000')
-            color_hex = color_raw.lower().lstrip('#')
+            color_hex = styles.colors.hex(styles.cut_color(el))
             
-            path_abs = el.path.to_absolute()
-            is_closed = any(seg.letter == 'Z' for seg in path_abs if hasattr(seg, 'letter'))
-            cut_length = self._approximate_path_length(path_abs)
+            data = self._path_data(el)
+            # Contour fermé (Z, ou boucle refermée par la fusion, extrémités soudées) : entrée à choisir
+            vertices = data.contour_vertices(self.WELD_TOLERANCE)
+            is_closed = data.is_closed or vertices is not None
+            cut_length = self._approximate_path_length(data.to_inkex())
+            settings = cut_settings.get(color_hex)
+            pierce_time = start_cost + (settings.pierce_time if settings is not None else 0.0)
             
             path_infos.append({
                 'element': el,
@@ -302,6 +424,16 @@ class OptimLaser(inkex.EffectExtension):
                 'color': color_hex,
                 'is_closed': is_closed,
                 'cut_length': cut_length,
+                # Durée d'un perçage (s) et pénalité équivalente en distance à vide
+                'pierce_time': pierce_time,
+                'pierce': pierce_time * idle_speed,
+                # Contour fermé : points d'entrée possibles et sommet choisi
+                'vertices': vertices,
+                'entry': 0,
+                # Sens inversé, appliqué au SVG par _reorder_and_rename_svg
+                'reversed': False,
+                # Empreinte du tracé avant inversion (mode incrémental)
+                'key': path_key(el.get('d', ''), el.get('style') or '') if incremental else None,
             })
         
         if not path_infos:
@@ -326,8 +458,24 @@ class OptimLaser(inkex.EffectExtension):
         
         # --- 6. Appliquer la stratégie choisie ---
         strategy = getattr(self, 'optimization_strategy', _('Plus proche voisin'))
+        # Ordre du passage précédent à réparer (mode incrémental)
+        previous_tour = self._previous_tour(path_infos) if incremental else None
+        
+        # Travail prévu : un placement par chemin, plus pour le 2-opt une ligne
+        # par chemin et par passe (une convergence anticipée complète le groupe)
+        if previous_tour is not None:
+            self._progress.set_total(len(path_infos), _("chemins placés"))
+        elif strategy == _('Optimisation locale'):
+            max_iter = getattr(self, 'max_iterations', 50)
+            self._progress.set_total(
+                sum(len(g) + (max_iter * (len(g) - 1) if len(g) >= 3 else 0) for g in by_color.values()),
+                _("opérations"))
+        else:
+            self._progress.set_total(len(path_infos), _("chemins placés"))
         
-        if strategy == _('Optimisation locale'):
+        if previous_tour is not None:
+            final_order = self._order_incremental(by_color, sorted_colors, previous_tour)
+        elif strategy == _('Optimisation locale'):
             final_order = self._order_two_opt(by_color, sorted_colors)
         elif strategy == _('Zonage'):
             final_order = self._order_clustering(by_color, sorted_colors)
@@ -335,6 +483,9 @@ class OptimLaser(inkex.EffectExtension):
             # "Plus proche voisin" ou valeur par défaut
             final_order = self._order_nearest_neighbor(by_color, sorted_colors)
         
+        if incremental:
+            self._record_tour(final_order)
+        
         # --- 7. Distance à vide finale ---
         final_idle = self._total_idle_distance(final_order)
         improvement = ((initial_idle - final_idle) / initial_idle * 100) if initial_idle > 0 else 0.0
@@ -349,7 +500,9 @@ class OptimLaser(inkex.EffectExtension):
         
         cut_time = total_cut / laser_speed if laser_speed > 0 else 0.0
         idle_time = final_idle / idle_speed if idle_speed > 0 else 0.0
-        estimated_time = cut_time + idle_time
+        pierced = self._pierced_paths(final_order)
+        pierce_time = sum(pi['pierce_time'] for pi in pierced)
+        estimated_time = cut_time + idle_time + pierce_time
         
         return {
             'improvement': improvement,
@@ -360,6 +513,9 @@ class OptimLaser(inkex.EffectExtension):
             'total_cut_length': total_cut,
             'cut_time_s': cut_time,
             'idle_time_s': idle_time,
+            'pierces': len(pierced),
+            'pierce_time_s': pierce_time,
+            'pierce_share': (pierce_time / estimated_time * 100) if estimated_time > 0 else 0.0,
             'strategy': strategy,
         }
     
@@ -382,42 +538,63 @@ class OptimLaser(inkex.EffectExtension):
         """
         final_order = []
         current_point = start_point
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
         
         for color in sorted_colors:
             group = by_color[color]
             remaining = list(range(len(group)))
+            hop = self._hop_cost_function(group[0]['pierce'] if group else 0.0)
             
-            while remaining:
-                best_idx = None
-                best_dist = float('inf')
-                best_reverse = False
+            try:
+                while remaining:
+                    tick()
+                    best_idx = None
+                    best_dist = float('inf')
+                    best_reverse = False
+                    best_entry = 0
                 
-                for idx in remaining:
-                    p = group[idx]
-                    d_start = math.dist(current_point, p['start'])
-                    d_end = math.dist(current_point, p['end'])
+                    for idx in remaining:
+                        p = group[idx]
+                        if p['vertices']:
+                            # Contour fermé : entrée par le sommet le plus proche
+                            d_entry, entry = self._nearest_vertex(p, current_point, hop)
+                            if d_entry < best_dist:
+                                best_dist = d_entry
+                                best_idx = idx
+                                best_reverse = False
+                                best_entry = entry
+                            continue
+                        d_start = hop(current_point, p['start'])
+                        d_end = hop(current_point, p['end'])
                     
-                    if d_start <= d_end:
-                        if d_start < best_dist:
-                            best_dist = d_start
-                            best_idx = idx
-                            best_reverse = False
-                    else:
-                        if d_end < best_dist:
-                            best_dist = d_end
-                            best_idx = idx
-                            best_reverse = not p['is_closed']
+                        if d_start <= d_end:
+                            if d_start < best_dist:
+                                best_dist = d_start
+                                best_idx = idx
+                                best_reverse = False
+                        else:
+                            if d_end < best_dist:
+                                best_dist = d_end
+                                best_idx = idx
+                                best_reverse = not p['is_closed']
                 
-                if best_idx is None:
-                    break
+                    if best_idx is None:
+                        break
                 
-                p = group[best_idx]
-                if best_reverse:
-                    self._reverse_path_in_svg(p)
+                    p = group[best_idx]
+                    if best_reverse:
+                        self._reverse_path(p)
+                    elif p['vertices']:
+                        self._set_entry(p, best_entry)
                 
-                final_order.append(p)
-                current_point = p['end']
-                remaining.remove(best_idx)
+                    final_order.append(p)
+                    current_point = p['end']
+                    remaining.remove(best_idx)
+                    advance()
+            except DeadlineExceeded:
+                # Délai écoulé : les chemins non placés gardent leur ordre d'origine
+                final_order.extend(group[idx] for idx in remaining)
         
         return final_order
     
@@ -441,6 +618,9 @@ class OptimLaser(inkex.EffectExtension):
         final_order = []
         current_point = (0.0, 0.0)
         max_iter = getattr(self, 'max_iterations', 50)
+        tick = self._cancel_token.tick
+        progress = self._progress
+        done = 0
         
         for color in sorted_colors:
             group = by_color[color]
@@ -449,46 +629,58 @@ class OptimLaser(inkex.EffectExtension):
             
             # Phase 1 : solution initiale par nearest-neighbor
             nn_order = self._nn_for_group(group, current_point)
+            hop = self._hop_cost_function(group[0]['pierce'])
             
             # Phase 2 : amélioration 2-opt
             n = len(nn_order)
+            done += n
             if n >= 3:
-                improved = True
-                iteration = 0
-                while improved and iteration < max_iter:
-                    improved = False
-                    iteration += 1
-                    for i in range(n - 1):
-                        for j in range(i + 2, n):
-                            # Coût actuel des arêtes (i→i+1) et (j→j+1 ou fin)
-                            end_i = nn_order[i]['end']
-                            start_i1 = nn_order[i + 1]['start']
-                            old_d1 = math.dist(end_i, start_i1)
+                done += max_iter * (n - 1)
+                try:
+                    improved = True
+                    iteration = 0
+                    while improved and iteration < max_iter:
+                        improved = False
+                        iteration += 1
+                        progress.count(_("passes 2-opt"))
+                        for i in range(n - 1):
+                            tick()
+                            progress.advance()
+                            for j in range(i + 2, n):
+                                # Coût actuel des arêtes (i→i+1) et (j→j+1 ou fin)
+                                end_i = nn_order[i]['end']
+                                start_i1 = nn_order[i + 1]['start']
+                                old_d1 = hop(end_i, start_i1)
                             
-                            if j < n - 1:
-                                end_j = nn_order[j]['end']
-                                start_j1 = nn_order[j + 1]['start']
-                                old_d2 = math.dist(end_j, start_j1)
-                            else:
-                                old_d2 = 0.0
+                                if j < n - 1:
+                                    end_j = nn_order[j]['end']
+                                    start_j1 = nn_order[j + 1]['start']
+                                    old_d2 = hop(end_j, start_j1)
+                                else:
+                                    old_d2 = 0.0
                             
-                            # Coût si on inverse le segment [i+1..j]
-                            # Nouvelle arête : end_i → start de l'ancien j (maintenant i+1)
-                            new_d1 = math.dist(end_i, nn_order[j]['start'])
+                                # Coût si on inverse le segment [i+1..j]
+                                # Nouvelle arête : end_i → start de l'ancien j (maintenant i+1)
+                                new_d1 = hop(end_i, nn_order[j]['start'])
                             
-                            if j < n - 1:
-                                # Nouvelle arête : end de l'ancien i+1 (maintenant j) → start_j1
-                                new_d2 = math.dist(nn_order[i + 1]['end'], start_j1)
-                            else:
-                                new_d2 = 0.0
+                                if j < n - 1:
+                                    # Nouvelle arête : end de l'ancien i+1 (maintenant j) → start_j1
+                                    new_d2 = hop(nn_order[i + 1]['end'], start_j1)
+                                else:
+                                    new_d2 = 0.0
                             
-                            # Gain = anciennes distances - nouvelles
-                            # NB: les distances internes du segment inversé sont
-                            # recalculées via les start/end (pas les mêmes liaisons)
-                            if (new_d1 + new_d2) < (old_d1 + old_d2) - 0.01:
-                                # Inverser le sous-segment [i+1..j]
-                                nn_order[i + 1:j + 1] = nn_order[i + 1:j + 1][::-1]
-                                improved = True
+                                # Gain = anciens coûts - nouveaux (distances, plus les perçages)
+                                # NB: les distances internes du segment inversé sont
+                                # recalculées via les start/end (pas les mêmes liaisons)
+                                if (new_d1 + new_d2) < (old_d1 + old_d2) - 0.01:
+                                    # Inverser le sous-segment [i+1..j]
+                                    nn_order[i + 1:j + 1] = nn_order[i + 1:j + 1][::-1]
+                                    improved = True
+                except DeadlineExceeded:
+                    # Délai écoulé : on garde le meilleur ordre obtenu pour ce groupe
+                    pass
+            
+            progress.advance_to(done)
             
             # Appliquer les inversions de chemins ouverts si bénéfiques
             self._apply_reversals_for_group(nn_order, current_point)
@@ -561,7 +753,9 @@ class OptimLaser(inkex.EffectExtension):
             cp = current_point
             for band_num, strip_id in enumerate(sorted_strip_ids):
                 strip_paths = strips[strip_id]
-                strip_order = self._nn_for_group(strip_paths, cp)
+                # Entrées des contours fermés choisies après coup, une fois
+                # l'ordre de la bande (et son sens de parcours) connu
+                strip_order = self._nn_for_group(strip_paths, cp, choose_entries=False)
                 if strip_order:
                     self._apply_reversals_for_group(strip_order, cp)
                     # Serpentin : inverser le sens une bande sur deux
@@ -577,71 +771,188 @@ class OptimLaser(inkex.EffectExtension):
         
         return final_order
     
+    # ──────────── Mode incrémental : réparation de l'ordre précédent ──────────
+    
+    def _previous_tour(self, path_infos):
+        """
+        Ordre de découpe du passage précédent, par couleur, s'il peut être réparé.
+        
+        Il faut les mêmes réglages d'ordre de découpe et qu'au moins la moitié
+        des chemins actuels y figurent ; sinon la stratégie choisie est appliquée.
+        
+        Returns:
+            dict couleur → [(empreinte, inversé), ...], ou None
+        """
+        record = self._incremental_record or {}
+        tour = record.get('tour')
+        current = json.loads(json.dumps(self._result_cache_settings(self.ORDERING_SETTINGS)))
+        if not tour or record.get('ordering') != current:
+            return None
+        known = set()
+        for entries in tour.values():
+            known.update(key for key, _reversed in entries)
+        if sum(1 for pi in path_infos if pi['key'] in known) * 2 < len(path_infos):
+            return None
+        return tour
+    
+    def _order_incremental(self, by_color, sorted_colors, previous_tour):
+        """
+        Répare l'ordre du passage précédent, groupe-couleur par groupe-couleur.
+        
+        Les chemins inchangés gardent leur rang et leur sens ; les nouveaux sont
+        insérés puis un 2-opt local est appliqué autour des modifications.
+        
+        Args:
+            by_color: dict couleur → liste de path_infos
+            sorted_colors: couleurs triées selon l'ordre du JSON
+            previous_tour: dict couleur → [(empreinte, inversé), ...]
+            
+        Returns:
+            liste ordonnée de path_infos
+        """
+        final_order = []
+        current_point = (0.0, 0.0)
+        inserted = 0
+        for color in sorted_colors:
+            group = by_color[color]
+            order, count = repair_tour(
+                group, previous_tour.get(color, []), current_point,
+                self._reverse_path, tick=self._cancel_token.tick,
+                advance=self._progress.advance, max_passes=getattr(self, 'max_iterations', 50),
+                distance=self._hop_cost_function(group[0]['pierce'] if group else 0.0))
+            self._apply_reversals_for_group(order, current_point)
+            inserted += count
+            final_order.extend(order)
+            if order:
+                current_point = order[-1]['end']
+        self._progress.count(_("chemins insérés"), inserted)
+        return final_order
+    
+    def _record_tour(self, final_order):
+        """Note l'ordre et le sens des chemins pour le prochain passage incrémental."""
+        tour = {}
+        for pi in final_order:
+            tour.setdefault(pi['color'], []).append([pi['key'], pi['reversed']])
+        self._tour = tour
+    
     # ──────────────────── Sous-méthodes communes ────────────────────
     
-    def _nn_for_group(self, group, start_point):
+    def _nn_for_group(self, group, start_point, choose_entries=True):
         """
         Nearest-neighbor simple pour un groupe de chemins.
         Retourne une nouvelle liste ordonnée (ne modifie pas le SVG).
+        
+        Avec choose_entries, chaque contour fermé est abordé par son sommet le plus
+        proche ; sinon son entrée est laissée à _apply_reversals_for_group.
         """
         remaining = list(range(len(group)))
         order = []
         current = start_point
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
+        hop = self._hop_cost_function(group[0]['pierce'] if group else 0.0)
         
-        while remaining:
-            best_idx = None
-            best_dist = float('inf')
+        try:
+            while remaining:
+                tick()
+                best_idx = None
+                best_dist = float('inf')
+                best_entry = 0
             
-            for idx in remaining:
-                p = group[idx]
-                d = min(math.dist(current, p['start']),
-                        math.dist(current, p['end']))
-                if d < best_dist:
-                    best_dist = d
-                    best_idx = idx
+                for idx in remaining:
+                    p = group[idx]
+                    entry = 0
+                    if p['vertices'] and choose_entries:
+                        d, entry = self._nearest_vertex(p, current, hop)
+                    else:
+                        d = min(hop(current, p['start']),
+                                hop(current, p['end']))
+                    if d < best_dist:
+                        best_dist = d
+                        best_idx = idx
+                        best_entry = entry
             
-            if best_idx is None:
-                break
+                if best_idx is None:
+                    break
             
-            p = group[best_idx]
-            order.append(p)
-            # Choisir le point de sortie le plus logique
-            if math.dist(current, p['start']) <= math.dist(current, p['end']):
-                current = p['end']
-            else:
-                current = p['start']
-            remaining.remove(best_idx)
+                p = group[best_idx]
+                order.append(p)
+                # Choisir le point de sortie le plus logique
+                if p['vertices'] and choose_entries:
+                    # Contour fermé : entrée (et sortie) au sommet le plus proche
+                    self._set_entry(p, best_entry)
+                    current = p['end']
+                elif hop(current, p['start']) <= hop(current, p['end']):
+                    current = p['end']
+                else:
+                    current = p['start']
+                remaining.remove(best_idx)
+                advance()
+        except DeadlineExceeded:
+            # Délai écoulé : les chemins non placés gardent leur ordre d'origine
+            order.extend(group[idx] for idx in remaining)
         
         return order
     
     def _apply_reversals_for_group(self, ordered_group, start_point):
         """
-        Passe finale sur un groupe ordonné : inverse les chemins ouverts
-        quand cela réduit la distance à vide.
-        Modifie les éléments SVG in-place.
+        Passe finale sur un groupe ordonné : inverse les chemins ouverts et choisit
+        le sommet d'entrée des contours fermés quand cela réduit la distance à vide
+        (perçages compris).
         """
+        hop = self._hop_cost_function(ordered_group[0]['pierce'] if ordered_group else 0.0)
         for pos in range(len(ordered_group)):
             pi = ordered_group[pos]
-            if pi['is_closed']:
-                continue
-            
             prev_end = start_point if pos == 0 else ordered_group[pos - 1]['end']
             next_start = ordered_group[pos + 1]['start'] if pos < len(ordered_group) - 1 else None
             
-            cost_normal = math.dist(prev_end, pi['start'])
-            cost_reversed = math.dist(prev_end, pi['end'])
+            if pi['is_closed']:
+                if pi['vertices'] and len(pi['vertices']) > 1:
+                    # Entrée et sortie au même sommet : coût du saut d'arrivée et du suivant
+                    costs = [hop(prev_end, v) + (hop(v, next_start) if next_start else 0.0)
+                             for v in pi['vertices']]
+                    best = min(range(len(costs)), key=costs.__getitem__)
+                    if costs[best] < costs[pi['entry']] - 0.01:
+                        self._set_entry(pi, best)
+                continue
+            
+            cost_normal = hop(prev_end, pi['start'])
+            cost_reversed = hop(prev_end, pi['end'])
             if next_start:
-                cost_normal += math.dist(pi['end'], next_start)
-                cost_reversed += math.dist(pi['start'], next_start)
+                cost_normal += hop(pi['end'], next_start)
+                cost_reversed += hop(pi['start'], next_start)
             
             if cost_reversed < cost_normal - 0.01:
-                self._reverse_path_in_svg(pi)
+                self._reverse_path(pi)
+    
+    @staticmethod
+    def _nearest_vertex(pi, point, hop):
+        """(coût, indice) du sommet du contour fermé pi le plus proche de point."""
+        best, best_index = float('inf'), 0
+        for index, vertex in enumerate(pi['vertices']):
+            d = hop(point, vertex)
+            if d < best:
+                best, best_index = d, index
+        return best, best_index
     
-    def _reverse_path_in_svg(self, pi):
-        """Inverse un chemin dans le SVG et met à jour start/end dans pi."""
-        reversed_path = self._reverse_path_object(pi['element'].path.to_absolute())
-        pi['element'].path = reversed_path
+    @staticmethod
+    def _set_entry(pi, index):
+        """Fait commencer et finir le contour fermé pi à son sommet index.
+        
+        Comme pour l'inversion, le tracé n'est réécrit que par _reorder_and_rename_svg.
+        """
+        pi['entry'] = index
+        pi['start'] = pi['end'] = pi['vertices'][index]
+    
+    @staticmethod
+    def _reverse_path(pi):
+        """Inverse le sens d'un chemin dans l'état de l'ordonnancement (start/end et drapeau).
+        
+        Le SVG n'est pas modifié ici : le tracé n'est réécrit qu'une fois, par
+        _reorder_and_rename_svg, pour les chemins dont le sens final est inversé.
+        """
         pi['start'], pi['end'] = pi['end'], pi['start']
+        pi['reversed'] = not pi['reversed']
     
     # ──────────────────── Sous-méthodes d'optimisation ────────────────────
     
@@ -665,10 +976,36 @@ class OptimLaser(inkex.EffectExtension):
             total += math.dist(end, start)
         return total
     
+    @classmethod
+    def _hop_cost_function(cls, pierce):
+        """
+        Coût d'un saut a → b pour l'ordonnancement : la distance, plus la pénalité
+        de perçage pierce si la tête n'est pas déjà au début du chemin suivant.
+        
+        Sans pénalité, c'est math.dist : l'ordre obtenu est celui des distances seules.
+        """
+        if not pierce:
+            return math.dist
+        dist = math.dist
+        free = cls.PIERCE_FREE_DISTANCE
+        
+        def cost(a, b):
+            d = dist(a, b)
+            return d + pierce if d > free else d
+        return cost
+    
+    @classmethod
+    def _pierced_paths(cls, path_list):
+        """Chemins qui demandent un perçage : le premier, puis chaque chemin précédé d'un saut."""
+        return [pi for i, pi in enumerate(path_list)
+                if i == 0 or math.dist(path_list[i - 1]['end'], pi['start']) > cls.PIERCE_FREE_DISTANCE]
+    
     def _reorder_and_rename_svg(self, ordered_paths):
         """
         Réordonne les éléments <path> dans le DOM SVG selon l'ordre optimisé
         et les renomme chemin1, chemin2, ..., cheminN.
+        Les chemins dont le sens final est inversé, et les contours fermés dont le
+        sommet d'entrée a changé, sont réécrits à cette occasion.
         """
         if not ordered_paths:
             return
@@ -687,16 +1024,89 @@ class OptimLaser(inkex.EffectExtension):
         # Les remettre dans l'ordre optimal avec nouveau nom
         for idx, pi in enumerate(ordered_paths, start=1):
             el = pi['element']
+            if pi['reversed']:
+                el.path = self._reverse_path_object(self._path_data(el).to_inkex())
+            elif pi.get('entry'):
+                el.set('d', self._path_data(el).rotated(pi['entry']).d)
             el.set('id', f'chemin{idx}')
             first_parent.append(el)
+        self._write_compact_output(ordered_paths)
+        self._invalidate_document_index()
+    
+    def _output_writer(self):
+        """
+        Écriture des tracés du fichier de découpe selon les options de sortie, ou
+        None si les tracés gardent l'écriture d'inkex.
+        
+        La précision (en mm) est convertie en nombre de décimales dans les unités
+        du document.
+        """
+        precision = float(getattr(self, 'output_precision', 0.0) or 0.0)
+        relative = bool(getattr(self, 'relative_commands', False))
+        compound = bool(getattr(self, 'compound_paths', False))
+        if precision <= 0 and not relative and not compound:
+            return None
+        decimals = None
+        if precision > 0:
+            step = self.svg.unittouu(f'{precision}mm')
+            decimals = max(0, math.ceil(-math.log10(step) - 1e-9))
+        return PathWriter(decimals, relative)
+    
+    def _write_compact_output(self, ordered_paths):
+        """
+        Réécrit les tracés ordonnés selon les options de sortie.
+        
+        En mode chemin composé, les chemins consécutifs de même couleur et de même
+        parent deviennent les sous-chemins d'un seul élément (celui du premier,
+        renommé cheminN), dans l'ordre de découpe.
+        """
+        writer = self._output_writer()
+        if writer is None:
+            return
+        if getattr(self, 'compound_paths', False):
+            runs = []
+            for pi in ordered_paths:
+                if (runs and runs[-1][0]['color'] == pi['color']
+                        and runs[-1][0]['element'].getparent() is pi['element'].getparent()):
+                    runs[-1].append(pi)
+                else:
+                    runs.append([pi])
+        else:
+            runs = [[pi] for pi in ordered_paths]
+        
+        for idx, run in enumerate(runs, start=1):
+            codes, coords = [], []
+            for pi in run:
+                data = self._path_data(pi['element'])
+                codes.append(data.codes)
+                coords.extend(data.coords)
+            el = run[0]['element']
+            el.set('d', writer.write(''.join(codes), coords))
+            if len(runs) != len(ordered_paths):
+                el.set('id', f'chemin{idx}')
+            for pi in run[1:]:
+                pi['element'].getparent().remove(pi['element'])
+    
+    def _write_output_in_document_order(self):
+        """
+        Applique les options de sortie quand l'ordre de découpe n'est pas optimisé :
+        les chemins de découpe sont réécrits dans l'ordre du document.
+        """
+        styles = self._computed_styles()
+        paths = [{'element': el, 'color': styles.cut_color(el)}
+                 for el in self._document_index().elements
+                 if isinstance(el, PathElement) and self._path_data(el).start is not None]
+        self._write_compact_output(paths)
+        self._invalidate_document_index()
     
     def _optimize_path(self):
         """
         Affiche un tableau debug : ID chemin | Couleur chemin | coordonnée de début | coordonnée de fin
         Chaque chemin 2 fois (début-fin et fin-début)
         """
-        path_elements = [el for el in self.svg.descendants()
-                         if isinstance(el, inkex.PathElement) and not self._is_in_defs(el)]
+        settled = self._settled_paths
+        path_elements = [el for el in self._document_index().elements
+                         if isinstance(el, inkex.PathElement) and el not in settled]
         if not path_elements:
             return
 
@@ -704,7 +1114,10 @@ class OptimLaser(inkex.EffectExtension):
             return (round(pt[0], 4), round(pt[1], 4))
 
         table = []
-        path_data = {}  # Stocker les infos des chemins pour la fusion
+        path_data = {}  # Registre id → élément, couleur, extrémités, tracé ; tenu à jour par les fusions
+        styles = self._computed_styles()
+        # Extrémités distantes de moins de WELD_TOLERANCE : même sommet
+        welder = self._welder = EndpointWelder(self.WELD_TOLERANCE)
         
         #extrait les informations des chemins SVG
         for el in path_elements:
@@ -713,17 +1126,18 @@ class OptimLaser(inkex.EffectExtension):
                 continue
             
             # Ignorer les chemins de texte ou police
-            style_str = str(el.style).lower() if hasattr(el, 'style') else ''
+            style_str = (el.get('style') or '').lower()
             if 'text' in style_str or 'font' in style_str:
                 continue
             
-            color = el.style.get('stroke', '#000000').lower() if hasattr(el, 'style') else '#000000'
-            # Extraire les coordonnées du d (en ignorant les commandes)
-            coords = [float(x) for x in re.findall(r'[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?', d)]
-            if len(coords) < 4:
+            # Indice de couleur : les fusions comparent des entiers
+            color = styles.cut_color(el)
+            # Extrémités du tracé (analyse partagée : arcs, relatifs, H/V compris)
+            data = self._path_data(el)
+            if len(data) < 2 or data.start is None:
                 continue
-            start = (round(coords[0], 4), round(coords[1], 4))
-            end = (round(coords[-2], 4), round(coords[-1], 4))
+            start = point_tuple(data.start)
+            end = point_tuple(data.end)
             
             elem_id = el.get('id')
             table.append({'id': elem_id, 'color': color, 'start': start, 'end': end, 'd': d})
@@ -735,9 +1149,24 @@ class OptimLaser(inkex.EffectExtension):
                 'color': color,
                 'start': start,
                 'end': end,
-                'path': el.path,
+                'path': data.to_inkex(),
+                # Sommets soudés des extrémités (clés des fusions)
+                'start_vertex': welder.vertex(start),
+                'end_vertex': welder.vertex(end),
             }
 
+        # Travail prévu : au plus un chemin absorbé par chemin existant ; la fin
+        # anticipée (plus rien à fusionner) complète l'étape
+        progress = self._progress
+        progress.set_total(len(path_data), _("chemins"))
+        
+        if getattr(self, 'eulerian_chaining', False):
+            self._chain_eulerian_trails(path_data)
+            progress.complete()
+            self._welder = None
+            self._invalidate_document_index()
+            return
+        
         # Calculer les POINTS CRITIQUES UNE SEULE FOIS
         critical_points = self._compute_critical_points(path_data)
         
@@ -747,6 +1176,7 @@ class OptimLaser(inkex.EffectExtension):
         
         while iteration < max_iterations:
             iteration += 1
+            self._cancel_token.check()
             groups_to_merge = self._find_mergeable_paths(path_data, critical_points)
             
             if not groups_to_merge:
@@ -763,6 +1193,41 @@ class OptimLaser(inkex.EffectExtension):
             for path_id in merged_ids:
                 if path_id in path_data:
                     del path_data[path_id]
+        progress.complete()
+        self._welder = None
+        self._invalidate_document_index()
+    
+    def _chain_eulerian_trails(self, path_data):
+        """
+        Enchaîne les chemins de chaque couleur en un minimum de tracés continus.
+        
+        Les chemins ouverts d'une couleur forment un graphe (sommets : extrémités
+        soudées, comme pour les points critiques) couvert par le plus petit nombre
+        de pistes (cf. trail_cover) : les pistes traversent les jonctions de trois
+        chemins ou plus, que la fusion par chaînes laisse de côté. Les chemins
+        fermés et ceux à plusieurs sous-chemins restent tels quels.
+        
+        Args:
+            path_data: Dictionnaire des chemins, mis à jour par les fusions
+        """
+        by_color = {}
+        for path_id, info in path_data.items():
+            data = self._path_data(info['element'])
+            if data.is_closed or data.codes.count('M') != 1:
+                continue
+            by_color.setdefault(info['color'], []).append(path_id)
+        
+        groups, orientations = [], []
+        for ids in by_color.values():
+            self._cancel_token.check()
+            edges = [(path_data[path_id]['start_vertex'], path_data[path_id]['end_vertex'])
+                     for path_id in ids]
+            for trail in cover_with_trails(edges):
+                if len(trail) > 1:
+                    groups.append([ids[edge_id] for edge_id, _r in trail])
+                    orientations.append([reverse for _e, reverse in trail])
+        
+        self._merge_touching_paths(path_data, groups, orientations)
     
     def _compute_critical_points(self, path_data):
         """
@@ -773,7 +1238,7 @@ class OptimLaser(inkex.EffectExtension):
             path_data: Dictionnaire des chemins
             
         Returns:
-            Set de points critiques: ((x,y), color)
+            Set de points critiques: (sommet soudé, color)
         """
         if not path_data:
             return set()
@@ -782,8 +1247,8 @@ class OptimLaser(inkex.EffectExtension):
         point_connections = {}  # (point, color) -> list of path_id
         
         for path_id, data in path_data.items():
-            start_key = (round(data['start'][0], 2), round(data['start'][1], 2))
-            end_key = (round(data['end'][0], 2), round(data['end'][1], 2))
+            start_key = data['start_vertex']
+            end_key = data['end_vertex']
             color = data['color']
             
             key_start = (start_key, color)
@@ -820,8 +1285,8 @@ class OptimLaser(inkex.EffectExtension):
         point_connections = {}  # (point, color) -> list of path_id
         
         for path_id, data in path_data.items():
-            start_key = (round(data['start'][0], 2), round(data['start'][1], 2))
-            end_key = (round(data['end'][0], 2), round(data['end'][1], 2))
+            start_key = data['start_vertex']
+            end_key = data['end_vertex']
             color = data['color']
             
             key_start = (start_key, color)
@@ -872,18 +1337,13 @@ class OptimLaser(inkex.EffectExtension):
         """
         # Vérifier l'orientation correcte de la paire initiale
         # Au point de départ, on doit avoir: fin(path_id1) = début(path_id2)
-        path1_end = path_data[path_id1]['end']
-        path1_start = path_data[path_id1]['start']
-        path2_start = path_data[path_id2]['start']
-        path2_end = path_data[path_id2]['end']
-        
-        path1_start_key = (round(path1_start[0], 2), round(path1_start[1], 2))
-        path1_end_key = (round(path1_end[0], 2), round(path1_end[1], 2))
-        path2_start_key = (round(path2_start[0], 2), round(path2_start[1], 2))
-        path2_end_key = (round(path2_end[0], 2), round(path2_end[1], 2))
+        path1_start_key = path_data[path_id1]['start_vertex']
+        path1_end_key = path_data[path_id1]['end_vertex']
+        path2_start_key = path_data[path_id2]['start_vertex']
+        path2_end_key = path_data[path_id2]['end_vertex']
         
         # Déterminer l'ordre correct
-        start_point_key = start_point[0]  # start_point est ((x,y), color), on prend (x,y)
+        start_point_key = start_point[0]  # start_point est (sommet, color), on prend le sommet
         
         # Vérifier les 4 orientations possibles
         orientation = None
@@ -918,8 +1378,7 @@ class OptimLaser(inkex.EffectExtension):
             
             # Chercher une continuation EN AVANT (après le dernier chemin)
             last_id = chain[-1]
-            last_end = path_data[last_id]['end']
-            last_end_key = (round(last_end[0], 2), round(last_end[1], 2))
+            last_end_key = path_data[last_id]['end_vertex']
             last_color = path_data[last_id]['color']
             
             lookup_key = (last_end_key, last_color)
@@ -929,8 +1388,7 @@ class OptimLaser(inkex.EffectExtension):
                 
                 if next_id not in processed_paths and next_id in path_data:
                     # Vérifier que l'autre extrémité de next_id n'est pas un point critique
-                    next_end = path_data[next_id]['end']
-                    next_end_key = (round(next_end[0], 2), round(next_end[1], 2))
+                    next_end_key = path_data[next_id]['end_vertex']
                     next_color = path_data[next_id]['color']
                     critical_key = (next_end_key, next_color)
                     
@@ -941,8 +1399,7 @@ class OptimLaser(inkex.EffectExtension):
             
             # Chercher une continuation EN ARRIÈRE (avant le premier chemin)
             first_id = chain[0]
-            first_start = path_data[first_id]['start']
-            first_start_key = (round(first_start[0], 2), round(first_start[1], 2))
+            first_start_key = path_data[first_id]['start_vertex']
             first_color = path_data[first_id]['color']
             
             lookup_key = (first_start_key, first_color)
@@ -952,13 +1409,11 @@ class OptimLaser(inkex.EffectExtension):
                 
                 if prev_id not in processed_paths and prev_id in path_data:
                     # Vérifier que la fin de prev_id correspond au début de first_id
-                    prev_end = path_data[prev_id]['end']
-                    prev_end_key = (round(prev_end[0], 2), round(prev_end[1], 2))
+                    prev_end_key = path_data[prev_id]['end_vertex']
                     
                     if prev_end_key == first_start_key:
                         # Vérifier que l'autre extrémité de prev_id n'est pas un point critique
-                        prev_start = path_data[prev_id]['start']
-                        prev_start_key = (round(prev_start[0], 2), round(prev_start[1], 2))
+                        prev_start_key = path_data[prev_id]['start_vertex']
                         prev_color = path_data[prev_id]['color']
                         critical_key = (prev_start_key, prev_color)
                         
@@ -969,65 +1424,60 @@ class OptimLaser(inkex.EffectExtension):
         
         return chain
     
-    def _merge_touching_paths(self, path_data, groups_to_merge):
+    def _merge_touching_paths(self, path_data, groups_to_merge, orientations=None):
         """
         Fusionne les groupes de chemins connectés préalablement identifiés
         
         Args:
             path_data: Dictionnaire contenant les infos de chaque chemin
             groups_to_merge: Liste des groupes de chemins à fusionner
+            orientations: Sens de parcours de chaque groupe (cf. _merge_path_group), ou None
         """
         if not groups_to_merge:
             return
         
         # Fusionner chaque groupe
+        tick = self._cancel_token.tick
         for group_idx, group in enumerate(groups_to_merge, 1):
+            tick()
             try:
-                merged_id = self._merge_path_group(group, path_data)
+                merged = self._merge_path_group(
+                    group, path_data, orientations[group_idx - 1] if orientations else None)
             except Exception as e:
                 continue
             
             # Ajouter le chemin fusionné à path_data si fusion réussie
-            if merged_id:
-                # Le nouveau chemin est first_path_id + '_merged'
-                first_path_id = group[0]
-                new_path_id = first_path_id + '_merged'
-                
-                # Récupérer l'élément fusionné du SVG
-                merged_element = self.svg.getElementById(new_path_id)
-                if merged_element is not None:
-                    # Extraire les coordonnées du nouveau chemin
-                    d = merged_element.get('d')
-                    if d:
-                        coords = [float(x) for x in re.findall(r'[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?', d)]
-                        if len(coords) >= 4:
-                            start = (round(coords[0], 4), round(coords[1], 4))
-                            end = (round(coords[-2], 4), round(coords[-1], 4))
-                            
-                            # Ajouter à path_data
-                            path_data[new_path_id] = {
-                                'element': merged_element,
-                                'color': path_data[first_path_id].get('color', '#000000'),
-                                'start': start,
-                                'end': end,
-                                'path': merged_element.path,
-                            }
+            if merged:
+                self._progress.advance(len(group) - 1)
+                self._progress.count(_("fusions"))
+                new_path_id, merged_element, merged_path, start, end = merged
+                path_data[new_path_id] = {
+                    'element': merged_element,
+                    'color': path_data[group[0]].get('color', '#000000'),
+                    'start': start,
+                    'end': end,
+                    'path': merged_path,
+                    'start_vertex': self._welder.vertex(start),
+                    'end_vertex': self._welder.vertex(end),
+                }
                 
                 # Supprimer les anciens chemins de path_data
                 for path_id in group:
                     if path_id in path_data:
                         del path_data[path_id]
     
-    def _merge_path_group(self, group_ids, path_data):
+    def _merge_path_group(self, group_ids, path_data, reversed_flags=None):
         """
         Fusionne un groupe de chemins connectés en un seul chemin
         
         Args:
             group_ids: Liste des IDs des chemins à fusionner
             path_data: Dict des chemins
+            reversed_flags: Sens de parcours imposé (un booléen par chemin, True = inversé) ;
+                sans lui, la chaîne est reconstituée à partir des extrémités
             
         Returns:
-            L'ID du chemin fusionné, ou None si échec
+            (ID, élément, inkex.Path, début, fin) du chemin fusionné, ou None si échec
         """
         if len(group_ids) < 2:
             return None
@@ -1036,7 +1486,10 @@ class OptimLaser(inkex.EffectExtension):
         group_data = {path_id: path_data[path_id] for path_id in group_ids}
         
         # Construire une chaîne de chemins connectés
-        merged_path = self._build_merged_path(group_ids, group_data)
+        if reversed_flags is not None:
+            merged_path = self._concat_paths(list(zip(group_ids, reversed_flags)), group_data)
+        else:
+            merged_path = self._build_merged_path(group_ids, group_data)
         
         if merged_path is None:
             return None
@@ -1052,6 +1505,13 @@ class OptimLaser(inkex.EffectExtension):
         merged_element.path = merged_path
         merged_element.style = first_element.style
         
+        # Extrémités telles qu'écrites dans d (mêmes arrondis que _optimize_path)
+        data = self._path_data(merged_element)
+        if data.start is None:
+            return None
+        start = (round(data.start[0], 4), round(data.start[1], 4))
+        end = (round(data.end[0], 4), round(data.end[1], 4))
+        
         # Remplacer le premier élément par le fusionné
         parent = first_element.getparent()
         if parent is not None:
@@ -1064,7 +1524,7 @@ class OptimLaser(inkex.EffectExtension):
             if parent is not None:
                 parent.remove(element)
         
-        return merged_id
+        return merged_id, merged_element, merged_path, start, end
     
     def _build_merged_path(self, group_ids, group_data):
         """
@@ -1085,15 +1545,12 @@ class OptimLaser(inkex.EffectExtension):
             return group_data[group_ids[0]]['path']
         
         # Construire un graphe d'adjacence avec les bonnes connexions
-        # Clé: (start ou end, point), Valeur: (path_id, orientation)
-        point_map = {}  # point -> list of (path_id, is_end)
+        # Clé: sommet soudé, Valeur: (path_id, orientation)
+        point_map = {}  # sommet -> list of (path_id, is_end)
         
         for path_id in group_ids:
-            start = group_data[path_id]['start']
-            end = group_data[path_id]['end']
-            
-            start_key = (round(start[0], 2), round(start[1], 2))
-            end_key = (round(end[0], 2), round(end[1], 2))
+            start_key = group_data[path_id]['start_vertex']
+            end_key = group_data[path_id]['end_vertex']
             
             if start_key not in point_map:
                 point_map[start_key] = []
@@ -1136,14 +1593,12 @@ class OptimLaser(inkex.EffectExtension):
                         # Le chemin finit à current_point, donc il faut le prendre en normal
                         # Le début du chemin suivant sera donc au début de ce chemin
                         should_reverse = True
-                        next_point_key = (round(group_data[path_id]['start'][0], 2), 
-                                        round(group_data[path_id]['start'][1], 2))
+                        next_point_key = group_data[path_id]['start_vertex']
                     else:
                         # Le chemin commence à current_point, donc il faut le prendre en normal
                         # Le prochain point sera la fin du chemin
                         should_reverse = False
-                        next_point_key = (round(group_data[path_id]['end'][0], 2), 
-                                        round(group_data[path_id]['end'][1], 2))
+                        next_point_key = group_data[path_id]['end_vertex']
                     
                     ordered_paths.append((path_id, should_reverse))
                     processed.add(path_id)
@@ -1158,11 +1613,22 @@ class OptimLaser(inkex.EffectExtension):
                         # Prendre ce chemin
                         ordered_paths.append((path_id, False))
                         processed.add(path_id)
-                        current_point = (round(group_data[path_id]['end'][0], 2), 
-                                       round(group_data[path_id]['end'][1], 2))
+                        current_point = group_data[path_id]['end_vertex']
                         break
         
-        # Fusionner les chemins dans l'ordre trouvé
+        return self._concat_paths(ordered_paths, group_data)
+    
+    def _concat_paths(self, ordered_paths, group_data):
+        """
+        Met bout à bout des chemins dont chaque fin touche le début du suivant
+        
+        Args:
+            ordered_paths: Liste de (ID, à inverser), dans l'ordre du tracé
+            group_data: Dict des données
+            
+        Returns:
+            inkex.Path fusionné
+        """
         merged = None
         
         for i, (path_id, should_reverse) in enumerate(ordered_paths):
@@ -1265,19 +1731,31 @@ class OptimLaser(inkex.EffectExtension):
         
         return inkex.Path(reversed_commands)
 
-    def _save_optimized_file(self):
+    def _save_optimized_file(self, data=None):
+         """Enregistre le fichier de découpe (ou remplace le document par data, déjà optimisé).
+         
+         Args:
+             data: Contenu optimisé repris du cache (None = document courant)
+         """
          if self.SauvegarderSousDecoupe:
             current_file_name = self.document_path()
             base_name, extension = os.path.splitext(current_file_name)
             new_file_name = base_name + " - decoupe" + extension
             with open(new_file_name, 'wb') as output_file:
-                self.save(output_file)
+                if data is not None:
+                    output_file.write(data)
+                else:
+                    self.save(output_file)
             self.document = inkex.load_svg(current_file_name)
             self.kill_other_inkscape_running()
 
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
                 subprocess.Popen(["inkscape", new_file_name])
+         elif data is not None:
+            # Modification du fichier original : Inkscape reçoit le document en cache
+            self.document = inkex.load_svg(io.BytesIO(data))
+            self.svg = self.document.getroot()
     
     def _restore_original_file(self):
         """Restaure le fichier original à son état initial (avant optimisation).
@@ -1296,21 +1774,58 @@ class OptimLaser(inkex.EffectExtension):
         except Exception:
             pass
     
-    def _show_cancel_confirmation(self):
-        """Affiche un message d'annulation dans la fenêtre de progression."""
+    def _show_cancel_confirmation(self, reason=None):
+        """Affiche un message d'annulation dans la fenêtre de progression.
+        
+        Args:
+            reason: Motif affiché à la place de « Traitement annulé. » (optionnel)
+        """
         if hasattr(self, 'gui_instance') and self.gui_instance:
             self.gui_instance.complete_progress(
-                _("Traitement annulé.") + "\n" + _("Le fichier original a été restauré."),
+                (reason or _("Traitement annulé.")) + "\n" + _("Le fichier original a été restauré."),
                 on_cancel=None
             )
 
     def find_layer(self, element):
-        while element is not None:
-            if isinstance(element, etree._Element):
-                if element.tag == inkex.addNS('g', 'svg') and element.get(inkex.addNS('groupmode', 'inkscape')) == 'layer':
-                    return element
-            element = element.getparent()
-        return None
+        """Calque contenant l'élément (l'élément lui-même s'il est un calque), ou None."""
+        return self._document_index().layer(element)
+
+    def _document_index(self):
+        """Index des éléments rendus et de leur calque, reconstruit après une restructuration."""
+        index = self._doc_index
+        if index is None or index.root is not self.svg:
+            index = self._doc_index = DocumentIndex(self.svg, self._NON_RENDERED_TAGS)
+        return index
+
+    def _invalidate_document_index(self):
+        """À appeler par les étapes qui ajoutent, suppriment ou déplacent des éléments."""
+        self._doc_index = None
+
+    def _computed_styles(self):
+        """Styles calculés des éléments de l'index courant (reconstruits avec lui)."""
+        index = self._document_index()
+        styles = self._styles
+        if styles is None or styles.index is not index:
+            if self._colors is None:
+                self._colors = ColorTable()
+            styles = self._styles = ComputedStyles(index, self.svg.stylesheets, self._colors)
+        return styles
+
+    def _path_data(self, element):
+        """
+        Chemin analysé de l'élément (cf. path_data.parse_path).
+
+        L'analyse est mémorisée par élément et refaite seulement si son attribut d
+        a changé : toutes les étapes partagent la même analyse.
+        """
+        parsed = self._parsed_paths
+        if parsed is None:
+            parsed = self._parsed_paths = {}
+        d = element.attrib.get('d', '')
+        data = parsed.get(element)
+        if data is None or data.d != d:
+            data = parsed[element] = parse_path(d)
+        return data
 
     # Tags d'éléments non-rendus directement : leurs descendants ne doivent pas être modifiés
     # par l'optimisation (sinon Inkscape peut crasher en chargeant le SVG, ex. lors de la création
@@ -1331,13 +1846,7 @@ class OptimLaser(inkex.EffectExtension):
         Important : sans ce filtre, l'extension vide les markers/patterns en décomposant
         leurs paths internes, ce qui fait planter Inkscape lors du chargement du fichier découpe.
         """
-        cur = element.getparent() if hasattr(element, 'getparent') else None
-        while cur is not None:
-            tag = getattr(cur, 'tag', None)
-            if tag in self._NON_RENDERED_TAGS:
-                return True
-            cur = cur.getparent() if hasattr(cur, 'getparent') else None
-        return False
+        return not self._document_index().is_rendered(element)
 
     def _transform_scale_factor(self, transform):
         """Retourne le facteur d'échelle moyen d'un inkex.Transform.
@@ -1436,94 +1945,144 @@ class OptimLaser(inkex.EffectExtension):
             return element.to_path_element()
 
     def ungroup_and_apply_transform_to_children(self):
-        """Décompose les groupes et applique la transformation à leurs enfants"""
-        Nouvelle_selection = []
-        elements_to_process = [elem for elem in self.svg.descendants()
-                            if not isinstance(elem, inkex.TextElement)
-                            and not self._is_in_defs(elem)]
-
-        def recursive_ungroup(element):
-            """Décompose les groupes et applique la transformation à leurs enfants"""
-            children_to_process = []
-            for child in element.getchildren():
-                if isinstance(child, inkex.Group):
-                    for grandchild in child.getchildren():
-                        if hasattr(grandchild, 'to_path_element'):
-                            grandchild = self.custom_to_path_element(grandchild)
-                            # Calculer les scale factors AVANT d'appliquer les transforms (sinon ils sont déjà absorbés)
-                            sf_gc = self._transform_scale_factor(grandchild.transform)
-                            sf_c = self._transform_scale_factor(child.transform)
-                            grandchild.path = grandchild.path.transform(grandchild.transform)
-                            grandchild.path = grandchild.path.transform(child.transform)
-                            grandchild.attrib.pop('transform', None)
-                            parent_style = inkex.Style(child.attrib.get('style', ''))
-                            child_style = inkex.Style(grandchild.attrib.get('style', ''))
-                            for key, value in parent_style.items():
-                                if key not in child_style or child_style[key] is None:
-                                    child_style[key] = value
-                            # Adapter stroke-width pour préserver l'épaisseur visuelle
-                            self._scale_stroke_width(child_style, sf_gc * sf_c)
-                            grandchild.attrib['style'] = str(child_style)
-                        element.append(grandchild)
-                        children_to_process.append(grandchild)
-                    element.remove(child)
-                else:
-                    if hasattr(child, 'to_path_element'):
-                        child = self.custom_to_path_element(child)
-                        parent_style = inkex.Style(element.attrib.get('style', ''))
-                        child_style = inkex.Style(child.attrib.get('style', ''))
-                        for key, value in parent_style.items():
-                            if key not in child_style or child_style[key] is None:
-                                child_style[key] = value
-                        child.attrib['style'] = str(child_style)
-                        children_to_process.append(child)
-                        Nouvelle_selection.append(child)
-            return children_to_process
-
-        while elements_to_process:
-            current_element = elements_to_process.pop()
-            if isinstance(current_element, inkex.Group):
-                elements_to_process.extend(recursive_ungroup(current_element))
-
-        for element in self.svg.descendants():
-            if self._is_in_defs(element):
+        """
+        Décompose les groupes et applique la transformation à leurs enfants.
+
+        Les groupes contenus dans un groupe (calque compris) sont dissous : leurs
+        éléments remontent, convertis en chemins, à la fin du groupe de plus haut
+        niveau (le conteneur). Un seul parcours en profondeur porte la matrice
+        composée et le style hérité des groupes traversés : chaque élément reçoit
+        sa matrice finale en une fois. Les formes (rectangle, cercle...) restées
+        directement dans leur conteneur sont converties en chemins sur place.
+        """
+        tick = self._cancel_token.tick
+        progress = self._progress
+        index = self._document_index()
+        shapes = (inkex.Circle, inkex.Ellipse, inkex.Rectangle, inkex.Line, inkex.Polyline, inkex.Polygon)
+
+        # Conteneurs (groupes dont le parent n'est pas un groupe) et formes à convertir
+        # sur place ; le contenu des groupes dissous est traité avec leur conteneur
+        containers = []
+        in_place = []
+        for element in index.elements:
+            parent = element.getparent()
+            if isinstance(parent, inkex.Group) and isinstance(parent.getparent(), inkex.Group):
                 continue
-            if isinstance(element, (inkex.Circle, inkex.Ellipse, inkex.Rectangle, inkex.Line, inkex.Polyline, inkex.Polygon)):
-                if hasattr(element, 'to_path_element'):
-                    parent = element.getparent()
-                    new_path = self.custom_to_path_element(element)
-                    if 'transform' in element.attrib:
-                        transform = inkex.Transform(element.get('transform'))
-                        sf = self._transform_scale_factor(transform)
-                        new_path.path = new_path.path.transform(transform)
-                        new_path.attrib.pop('transform', None)
-                        # Adapter stroke-width pour préserver l'épaisseur visuelle
-                        new_style = inkex.Style(new_path.attrib.get('style', ''))
-                        self._scale_stroke_width(new_style, sf)
-                        new_path.attrib['style'] = str(new_style)
-                    if parent is not None:
-                        parent.replace(element, new_path)
-                        Nouvelle_selection.append(new_path)
+            if isinstance(element, inkex.Group):
+                if not isinstance(parent, inkex.Group):
+                    containers.append(element)
+            elif isinstance(element, shapes):
+                in_place.append(element)
+        progress.set_total(len(index.elements), _("éléments"))
+
+        for container in containers:
+            self._flatten_group(container, tick, progress)
+
+        for element in in_place:
+            tick()
+            progress.advance()
+            parent = element.getparent()
+            new_path = self.custom_to_path_element(element)
+            if 'transform' in element.attrib:
+                transform = inkex.Transform(element.get('transform'))
+                sf = self._transform_scale_factor(transform)
+                new_path.path = new_path.path.transform(transform)
+                new_path.attrib.pop('transform', None)
+                # Adapter stroke-width pour préserver l'épaisseur visuelle
+                new_style = inkex.Style(new_path.attrib.get('style', ''))
+                self._scale_stroke_width(new_style, sf)
+                new_path.attrib['style'] = str(new_style)
+            if parent is not None:
+                parent.replace(element, new_path)
+        progress.complete()
+        self._invalidate_document_index()
+
+    def _flatten_group(self, container, tick, progress):
+        """
+        Dissout les groupes contenus dans container et place leurs éléments à sa fin.
+
+        Ordre obtenu : pour chaque groupe dissous, ses éléments directs puis le
+        contenu de ses sous-groupes, groupe après groupe. Le style d'un élément
+        complète le sien par celui de ses groupes (le plus proche l'emporte) ;
+        stroke-width est ramené dans l'espace du conteneur par le facteur d'échelle
+        de la matrice composée.
+        """
+        groups = [child for child in container if isinstance(child, inkex.Group)]
+        if not groups:
+            return
+        lifted = []
+        # Pile de (groupe, matrice vers l'espace du conteneur, style hérité)
+        stack = [(group, group.transform, self._inherited_style(group, group.transform, inkex.Style()))
+                 for group in reversed(groups)]
+        while stack:
+            group, matrix, inherited = stack.pop()
+            tick()
+            progress.advance()
+            subgroups = []
+            for child in group:
+                if isinstance(child, inkex.Group):
+                    subgroups.append(child)
+                    continue
+                progress.advance()
+                if hasattr(child, 'to_path_element'):
+                    child = self.custom_to_path_element(child)
+                    total = matrix @ child.transform
+                    child.path = child.path.transform(total)
+                    child.attrib.pop('transform', None)
+                    style = inkex.Style(child.attrib.get('style', ''))
+                    # Adapter stroke-width pour préserver l'épaisseur visuelle
+                    self._scale_stroke_width(style, self._transform_scale_factor(total))
+                    for key, value in inherited.items():
+                        if key not in style or style[key] is None:
+                            style[key] = value
+                    child.attrib['style'] = str(style)
+                lifted.append(child)
+            for subgroup in reversed(subgroups):
+                sub_matrix = matrix @ subgroup.transform
+                stack.append((subgroup, sub_matrix, self._inherited_style(subgroup, sub_matrix, inherited)))
+
+        for group in groups:
+            container.remove(group)
+        for element in lifted:
+            container.append(element)
+
+    def _inherited_style(self, group, matrix, inherited):
+        """Style transmis par un groupe dissous : le sien (stroke-width ramené dans
+        l'espace du conteneur), complété par celui de ses ancêtres dissous."""
+        style = inkex.Style(group.attrib.get('style', ''))
+        self._scale_stroke_width(style, self._transform_scale_factor(matrix))
+        for key, value in inherited.items():
+            if key not in style or style[key] is None:
+                style[key] = value
+        return style
 
     def replace_with_subpaths(self):
         """Remplace les chemins complexes par des segments simples"""
         self.numeroChemin = 0
-
-        for element in self.svg.descendants():
+        tick = self._cancel_token.tick
+        progress = self._progress
+        # Éléments rendus uniquement : ne pas décomposer les paths à l'intérieur de
+        # <defs>/<marker>/<pattern>/etc. (sinon Inkscape crash en chargeant le
+        # fichier découpe — markers vidés).
+        index = self._document_index()
+        descendants = index.elements
+        progress.set_total(len(descendants), _("éléments"))
+        # Écart maximal de la simplification des polylignes, en unités utilisateur
+        simplify_mm = float(getattr(self, 'simplify_tolerance', 0.0) or 0.0)
+        simplify = self.svg.unittouu(f'{simplify_mm}mm') if simplify_mm > 0 else 0.0
+
+        for element in descendants:
+            tick()
+            progress.advance()
             # Ignorer explicitement les TextElements
             if isinstance(element, inkex.TextElement):
                 continue
 
-            # Ne pas décomposer les paths à l'intérieur de <defs>/<marker>/<pattern>/etc.
-            # (sinon Inkscape crash en chargeant le fichier découpe — markers vidés).
-            if self._is_in_defs(element):
-                continue
-
             if (isinstance(element, (inkex.PathElement, inkex.Circle, inkex.Ellipse,
                                 inkex.Rectangle, inkex.Line, inkex.Polyline, inkex.Polygon))
                 and not any('font' in key.lower() for key in element.style.keys())):
                 parent = element.getparent()
-                couche = self.find_layer(element)
+                couche = index.layer(element)
                 style = element.style
                 fill_value = style.get('fill', None)
                 if fill_value and fill_value.lower() != 'none':
@@ -1540,153 +2099,127 @@ class OptimLaser(inkex.EffectExtension):
                     element.attrib.pop('transform', None)
                     element.path = path
 
-                path = element.path.to_non_shorthand()
-
-
-                if len(path) > 0:
-                    segments = iter(path)
-                    segmentPrev = next(segments)
-                    # Premier point du sous-chemin courant (mis à jour à chaque commande M)
-                    Premier = segmentPrev
-
-                    for segment in segments:
-                        debut = None
-                        fin = None
-                        segment_path = None
-
-                        if segment.letter == 'M':
+                if isinstance(element, inkex.PathElement):
+                    data = self._path_data(element)
+                else:
+                    data = parse_path(str(element.path))
+                transform = str(element.transform)
+                if simplify:
+                    # Coordonnées locales : l'écart est ramené à l'échelle de l'élément
+                    data = data.simplified(simplify / self._transform_scale_factor(element.transform))
+
+                if len(data) > 0:
+                    coords = data.coords
+                    # Point courant et premier point du sous-chemin courant
+                    # (mis à jour à chaque commande M)
+                    current = premier = None
+
+                    for code, i in data.commands():
+                        n = ARITY[code]
+                        if code == 'M':
                             # Nouveau sous-chemin : pas de segment à dessiner, on met juste à jour
                             # le point de départ pour le prochain Z éventuel
-                            Premier = segment
-                            segmentPrev = segment
+                            current = premier = (coords[i], coords[i + 1])
                             continue
-                        elif segment.letter == 'Z':
-                            # Fermeture : générer le segment du dernier point au début du sous-chemin (Premier)
-                            # quel que soit le nombre de Z (corrige le bug où val_Z n'était jamais incrémenté)
-                            if segmentPrev.letter == 'C':
-                                debut = (round(segmentPrev.x4, 6), round(segmentPrev.y4, 6))
-                            elif segmentPrev.letter == 'Q':
-                                debut = (round(segmentPrev.x3, 6), round(segmentPrev.y3, 6))
-                            else:
-                                debut = (round(segmentPrev.x, 6), round(segmentPrev.y, 6))
-                            fin = (round(Premier.x, 6), round(Premier.y, 6))
-                            segment_path = inkex.Path([inkex.paths.Move(*debut)] + [inkex.paths.Line(*fin)])
-                            segmentPrev = segment
+                        if current is None:
+                            continue
+                        if code == 'Z':
+                            # Fermeture : générer le segment du dernier point au début du sous-chemin
+                            debut = (round(current[0], 6), round(current[1], 6))
+                            fin = (round(premier[0], 6), round(premier[1], 6))
+                            segment_d = format_path('ML', debut + fin)
+                            current = premier
                         else:
                             # Segment de dessin (L, A, C, Q)
-                            debut = segmentPrev.end_point(None, None)
-                            fin = segment.end_point(None, None)
-                            segment_path = inkex.Path([inkex.paths.Move(*debut)] + [segment])
-                            segmentPrev = segment
+                            debut = current
+                            fin = (coords[i + n - 2], coords[i + n - 1])
+                            segment_d = format_path('M' + code, list(debut) + coords[i:i + n])
+                            current = fin
 
-                        if segment_path is not None and debut != fin:
+                        if debut != fin:
                             self.numeroChemin += 1
                             new_element = inkex.PathElement(
                                 id=f"chemin{self.numeroChemin}",
-                                d=str(segment_path),
+                                d=segment_d,
                                 style=str(style),
-                                transform=str(element.transform)
+                                transform=transform
                             )
-
-                            path_commands = [cmd.letter for cmd in new_element.path]
-                            if not all(cmd == 'M' for cmd in path_commands):
-                                if couche is not None:
-                                    couche.append(new_element)
-                                else:
-                                    self.document.getroot().append(new_element)
+                            if couche is not None:
+                                couche.append(new_element)
+                            else:
+                                self.document.getroot().append(new_element)
+                            progress.count(_("segments émis"))
 
                     parent.remove(element)
+        self._invalidate_document_index()
 
     def get_path_endpoints(self, element):
         """Retourne les points de début et fin d'un chemin selon son type"""
         if not isinstance(element, inkex.PathElement):
             return None, None
 
-        try:
-            # Obtenir le chemin en coordonnées absolues
-            path = element.path.to_absolute()
-            path_list = list(path)
-            
-            if not path_list:
-                return None, None
-
-            # Point de début (toujours la commande M)
-            start_cmd = path_list[0]
-            start = (float(start_cmd.x), float(start_cmd.y))
-
-            # Point de fin : regarder le dernier segment qui n'est pas Z
-            end = None
-            for cmd in reversed(path_list):
-                if cmd.letter == 'Z':
-                    end = start  # Fermé = revenir au départ
-                    break
-                elif cmd.letter == 'M':
-                    end = (float(cmd.x), float(cmd.y))
-                    break
-                elif cmd.letter == 'L':
-                    end = (float(cmd.x), float(cmd.y))
-                    break
-                elif cmd.letter == 'A':
-                    end = (float(cmd.x), float(cmd.y))
-                    break
-                elif cmd.letter == 'C':
-                    # inkex Curve: x4, y4 est le point final
-                    try:
-                        end = (float(cmd.x4), float(cmd.y4))
-                    except AttributeError:
-                        try:
-                            end = (float(cmd.x3), float(cmd.y3))
-                        except AttributeError:
-                            end = (float(cmd.x), float(cmd.y))
-                    break
-                elif cmd.letter == 'Q':
-                    # inkex Quadratic: x3, y3 est le point final
-                    try:
-                        end = (float(cmd.x3), float(cmd.y3))
-                    except AttributeError:
-                        end = (float(cmd.x), float(cmd.y))
-                    break
-                elif cmd.letter in ['S', 'T']:
-                    # Ces commandes ont aussi un point final
-                    try:
-                        end = (float(cmd.x), float(cmd.y))
-                    except AttributeError:
-                        pass
-                    break
-            
-            if end is None:
-                return None, None
-
-            return start, end
-        except Exception as e:
-            # En cas d'erreur, retourner None
+        # Analyse partagée : commandes absolues, H/V/S/T normalisées.
+        # Un sous-chemin fermé (Z) se termine à son point de départ.
+        data = self._path_data(element)
+        start, end = data.start, data.end
+        if start is None or end is None:
             return None, None
+        return start, end
 
 
     def adjust_overlapping_segments(self):
         """Identifie et ajuste les chemins qui se chevauchent (lignes, arcs et courbes de Bézier)"""
+        to_remove = set()
+        try:
+            self._find_overlapping_paths(to_remove)
+        except DeadlineExceeded:
+            # Délai de l'étape écoulé : on supprime les doublons déjà identifiés
+            pass
+        self._progress.count(_("doublons supprimés"), len(to_remove))
+        
+        # Les chemins créés par les regroupements ne sont jamais dans to_remove :
+        # l'index d'avant l'étape suffit
+        count_removed = 0
+        for element in self._document_index().elements:
+            if isinstance(element, inkex.PathElement) and element.get('id') in to_remove:
+                parent = element.getparent()
+                if parent is not None:
+                    parent.remove(element)
+                    count_removed += 1
+        self._invalidate_document_index()
+
+        return count_removed > 0
+    
+    def _find_overlapping_paths(self, to_remove):
+        """Complète to_remove avec les IDs des chemins en double, couleur par couleur
+        
+        Interruptible (DeadlineExceeded) entre deux comparaisons : to_remove contient
+        alors les doublons trouvés jusque-là.
+        """
         path_elements = []
         skipped_count = 0
-        for element in self.svg.descendants():
-            if not isinstance(element, inkex.PathElement):
-                continue
-            # Ne pas comparer les paths internes des markers/patterns/etc.
-            if self._is_in_defs(element):
+        tick = self._cancel_token.tick
+        settled = self._settled_paths
+        styles = self._computed_styles()
+        # Éléments rendus uniquement : pas les paths internes des markers/patterns/etc.
+        for element in self._document_index().elements:
+            tick()
+            if not isinstance(element, inkex.PathElement) or element in settled:
                 continue
-            # Convertir en chemin absolu pour gérer les commandes relatives (minuscules)
-            abs_path = element.path.to_absolute()
-            path = list(abs_path)
-            if len(path) < 2 or path[0].letter != 'M':
+            # Analyse partagée : commandes absolues, formes abrégées normalisées
+            data = self._path_data(element)
+            codes, coords = data.codes, data.coords
+            if len(codes) < 2 or codes[0] != 'M':
                 skipped_count += 1
                 continue
-            start_point = (float(path[0].x), float(path[0].y))
+            start_point = (coords[0], coords[1])
             
             # Déterminer le type principal et le endpoint (dernier segment)
             path_type = None
             end_point = None
             
-            # Identifier le type dominant du chemin (utiliser .upper() pour gérer les deux cas)
-            cmd_types = set(cmd.letter.upper() for cmd in path[1:] if cmd.letter.upper() != 'Z')
+            # Identifier le type dominant du chemin, d'après les commandes écrites
+            cmd_types = set(data.letters[1:]) - {'Z'}
             if not cmd_types:
                 skipped_count += 1
                 continue
@@ -1705,27 +2238,15 @@ class OptimLaser(inkex.EffectExtension):
                 continue
             
             # Trouver le endpoint (dernier point du dernier segment de dessin)
-            last_draw_cmd = None
-            for cmd in reversed(path):
-                if cmd.letter in ['L', 'A', 'C', 'Q']:
-                    last_draw_cmd = cmd
-                    break
+            for code, i in data.commands():
+                if code in 'LACQ':
+                    n = ARITY[code]
+                    end_point = (coords[i + n - 2], coords[i + n - 1])
             
-            if last_draw_cmd is None:
+            if end_point is None:
                 skipped_count += 1
                 continue
             
-            if last_draw_cmd.letter == 'L':
-                end_point = (float(last_draw_cmd.x), float(last_draw_cmd.y))
-            elif last_draw_cmd.letter == 'A':
-                end_point = (float(last_draw_cmd.x), float(last_draw_cmd.y))
-            elif last_draw_cmd.letter == 'C':
-                # inkex Curve: x4,y4 = endpoint
-                end_point = (float(last_draw_cmd.x4), float(last_draw_cmd.y4))
-            elif last_draw_cmd.letter == 'Q':
-                # inkex Quadratic: x3,y3 = endpoint
-                end_point = (float(last_draw_cmd.x3), float(last_draw_cmd.y3))
-            
             # Vérification de la validité des points
             if (not isinstance(start_point, tuple) or not isinstance(end_point, tuple) or
                 len(start_point) != 2 or len(end_point) != 2 or
@@ -1749,14 +2270,13 @@ class OptimLaser(inkex.EffectExtension):
                     'id': element.get('id'),
                     'start': start_point,
                     'end': end_point,
-                    'style': element.style,
                     'length': length,
                     'vector': vector,
-                    'color': element.style.get('stroke', '#000000').lower(),
+                    'color': styles.cut_color(element),
                     'path_type': path_type,
                     'is_horizontal': is_horizontal,
                     'is_vertical': is_vertical,
-                    'orig_path': abs_path
+                    'orig_path': data.to_inkex()
                 })
         
         # Si l'option est activée, regrouper tous les paths (limités aux couleurs de découpe)
@@ -1769,13 +2289,14 @@ class OptimLaser(inkex.EffectExtension):
             try:
                 with open(json_path, 'r') as f:
                     config = json.load(f)
-                    cutting_colors = {'#' + c.lower().lstrip('#') for c in config.get('colors', [])}
+                    cutting_colors = {styles.colors.index('#' + c.lstrip('#'))
+                                      for c in config.get('colors', [])}
             except Exception:
                 pass
 
             filtered_paths = [
                 p for p in path_elements
-                if not cutting_colors or p['color'].lower() in cutting_colors
+                if not cutting_colors or p['color'] in cutting_colors
             ]
             # Unifier la couleur de détection pour autoriser la fusion inter-couleurs
             # (sous-fonctions comme _build_curve_chains regroupent par 'color')
@@ -1790,7 +2311,22 @@ class OptimLaser(inkex.EffectExtension):
                     paths_by_color[color] = []
                 paths_by_color[color].append(path)
 
-        to_remove = set()
+        # Travail prévu : paires de droites et arcs, puis paires de courbes de chaque
+        # couleur (chaînes, chevauchements partiels dans les deux sens, résiduel) ;
+        # c'est un majorant : les paires réellement testées sont signalées au fil de l'eau
+        progress = self._progress
+        budgets = {}
+        for color, paths in paths_by_color.items():
+            n_straight = sum(1 for p in paths if p['path_type'] == 'L')
+            n_arcs = sum(1 for p in paths if p['path_type'] == 'A')
+            n_curves = len(paths) - n_straight
+            budgets[color] = (n_straight * (n_straight - 1) // 2 + n_arcs, 2 * n_curves * (n_curves - 1))
+        progress.set_total(sum(simple + curves for simple, curves in budgets.values()), _("paires testées"))
+        
+        # Droites et arcs de toutes les couleurs d'abord, courbes ensuite : si le délai
+        # de l'étape s'écoule, les doublons les moins coûteux sont déjà trouvés
+        done = 0
+        curve_groups = []
         for color, paths in paths_by_color.items():
             # Séparer les chemins par type
             straight_paths = [p for p in paths if p['path_type'] == 'L']
@@ -1802,25 +2338,33 @@ class OptimLaser(inkex.EffectExtension):
             if straight_paths:
                 self._find_overlapping_straight_segments(straight_paths, to_remove)
             
-            # Traiter les chemins courbes
-            curve_paths = arc_paths + cubic_bezier_paths + quadratic_bezier_paths
-            if curve_paths:
-                self._find_overlapping_curve_segments(curve_paths, to_remove)
+            # Traiter les arcs simples par union d'intervalles angulaires
+            if arc_paths:
+                progress.advance(len(arc_paths))
+                arc_paths = self._find_overlapping_arc_segments(arc_paths, to_remove)
+            
+            done += budgets[color][0]
+            progress.advance_to(done)
+            
+            # Chemins courbes à traiter ensuite (les arcs restants ne sont comparés
+            # aux Bézier que s'il y en a : doublons arc/Bézier d'une même forme)
+            bezier_paths = cubic_bezier_paths + quadratic_bezier_paths
+            curve_paths = (arc_paths + bezier_paths) if bezier_paths else arc_paths
+            curve_groups.append((color, curve_paths))
         
-        count_removed = 0
-        for element in list(self.svg.descendants()):
-            if self._is_in_defs(element):
-                continue
-            if isinstance(element, inkex.PathElement) and element.get('id') in to_remove:
-                parent = element.getparent()
-                if parent is not None:
-                    parent.remove(element)
-                    count_removed += 1
-
-        return count_removed > 0
+        # Traiter les chemins courbes
+        for color, curve_paths in curve_groups:
+            if len(curve_paths) >= 2:
+                self._find_overlapping_curve_segments(curve_paths, to_remove)
+            done += budgets[color][1]
+            progress.advance_to(done)
     
     def _find_overlapping_straight_segments(self, segments, to_remove):
-        """Trouve les segments droits qui se chevauchent"""
+        """Trouve les segments droits qui se chevauchent
+        
+        Seules les paires presque parallèles et voisines fournies par l'index des
+        droites de DuplicateRemover sont testées, au lieu de toutes les paires.
+        """
         tolerance = self.tolerance
         
         # Organiser les segments par orientation (horizontaux, verticaux, diagonaux)
@@ -1828,18 +2372,30 @@ class OptimLaser(inkex.EffectExtension):
         vertical_segments = [s for s in segments if s['is_vertical']]
         diagonal_segments = [s for s in segments if not s['is_horizontal'] and not s['is_vertical']]
         
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
+        # Test ci-dessous : |cos| > 0.99 et extrémité à moins de la tolérance
+        max_angle = math.acos(0.99)
+        remover = DuplicateRemover(tolerance=tolerance, angle_tolerance=max_angle / 2)
+        
         # Traiter chaque groupe séparément pour éviter de comparer des segments d'orientation différente
         for segment_group in [horizontal_segments, vertical_segments, diagonal_segments]:
             # Construire un graphe d'adjacence des segments qui se chevauchent
             overlap_graph = {}
+            candidates = {}
+            points = [{'start': Point(*s['start']), 'end': Point(*s['end'])} for s in segment_group]
+            for i, j in remover.find_parallel_line_pairs(points, max_angle):
+                candidates.setdefault(i, []).append(j)
             
             # Remplir le graphe
             for i in range(len(segment_group)):
+                tick()
+                advance(len(segment_group) - i - 1)
                 path1 = segment_group[i]
                 if path1['id'] not in overlap_graph:
                     overlap_graph[path1['id']] = {'path': path1, 'overlaps': set()}
                 
-                for j in range(i + 1, len(segment_group)):
+                for j in candidates.get(i, ()):
                     path2 = segment_group[j]
                     
                     # Si les segments ont la même orientation (vecteurs colinéaires)
@@ -1890,6 +2446,155 @@ class OptimLaser(inkex.EffectExtension):
             # Traiter les groupes de segments qui se chevauchent
             self._process_overlapping_groups(overlap_graph, to_remove)
 
+    def _find_overlapping_arc_segments(self, arc_paths, to_remove):
+        """Fusionne les arcs simples qui se chevauchent sur une même ellipse.
+        
+        Les arcs sont regroupés par ellipse porteuse (centre, rx, ry, rotation à la
+        tolérance près) grâce à une grille sur les centres, puis l'union de leurs
+        intervalles angulaires est calculée par tri : chaque composante qui regroupe
+        plusieurs arcs est remplacée par l'arc (ou les deux demi-arcs pour un tour
+        complet) qui la couvre, comme les droites sont remplacées par leur étendue.
+        
+        Args:
+            arc_paths: Chemins de type 'A'
+            to_remove: Ensemble des IDs à supprimer (complété in-place)
+            
+        Returns:
+            Les chemins d'arc qui n'ont pas été traités ici (arcs multiples,
+            arcs dégénérés) ou qui restent inchangés
+        """
+        tolerance = self.tolerance
+        two_pi = 2.0 * math.pi
+        
+        # Convertir les chemins « M A » en arcs géométriques
+        arcs = []
+        others = []
+        for p in arc_paths:
+            cmds = list(p['orig_path'])
+            if len(cmds) != 2 or cmds[1].letter != 'A':
+                others.append(p)
+                continue
+            cmd = cmds[1]
+            arc = Arc(Point(*p['start']), Point(*p['end']), abs(float(cmd.rx)), abs(float(cmd.ry)),
+                      float(cmd.x_axis_rotation), bool(cmd.large_arc), bool(cmd.sweep))
+            center, rx, ry, phi, theta1, dtheta = arc.to_center_parameterization()
+            if abs(dtheta) < 1e-9:
+                others.append(p)
+                continue
+            arcs.append((p, arc, center))
+        
+        # Regrouper par ellipse porteuse : grille sur les centres + union-find
+        cell = max(tolerance, 1e-6)
+        grid = {}
+        for idx, (_, _, center) in enumerate(arcs):
+            grid.setdefault((int(math.floor(center.x / cell)), int(math.floor(center.y / cell))), []).append(idx)
+        parent = list(range(len(arcs)))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for (gx, gy), members in grid.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for j in grid.get((gx + dx, gy + dy), ()):
+                        for i in members:
+                            if i < j and find(i) != find(j) and arcs[i][1].shares_ellipse_with(arcs[j][1], tolerance):
+                                parent[find(j)] = find(i)
+        
+        ellipses = {}
+        for idx in range(len(arcs)):
+            ellipses.setdefault(find(idx), []).append(idx)
+        
+        kept = list(others)
+        for members in ellipses.values():
+            if len(members) < 2:
+                kept.extend(arcs[i][0] for i in members)
+                continue
+            
+            # Intervalles dans le repère angulaire de l'arc de référence
+            ref = arcs[members[0]][1]
+            _, rx_ref, _, _, _, _ = ref.to_center_parameterization()
+            angle_tol = tolerance / max(rx_ref, 1e-9)
+            intervals = []
+            spans = {}
+            for i in members:
+                arc = arcs[i][1]
+                _, _, _, _, _, dtheta = arc.to_center_parameterization()
+                first, last = (arc.start, arc.end) if dtheta >= 0 else (arc.end, arc.start)
+                spans[i] = abs(dtheta)
+                intervals.append(((ref.angle_of_point(first)) % two_pi, abs(dtheta), i, first, last))
+            intervals.sort(key=lambda item: item[0])
+            
+            # Union linéaire (seuls les vrais chevauchements fusionnent, pas les contacts).
+            # Les extrémités d'origine sont conservées pour que la fusion des chemins
+            # connectés retrouve exactement les mêmes points.
+            components = []
+            for lo, span, i, first, last in intervals:
+                if components and lo < components[-1][1] - angle_tol:
+                    comp = components[-1]
+                    if lo + span > comp[1]:
+                        comp[1], comp[4] = lo + span, last
+                    comp[2].append(i)
+                else:
+                    components.append([lo, lo + span, [i], first, last])
+            # Bouclage : la dernière composante peut recouvrir le début de la première
+            if len(components) > 1 and components[-1][1] - two_pi > components[0][0] + angle_tol:
+                last_comp = components.pop()
+                first_comp = components[0]
+                first_comp[0], first_comp[3] = last_comp[0] - two_pi, last_comp[3]
+                if last_comp[1] - two_pi > first_comp[1]:
+                    first_comp[1], first_comp[4] = last_comp[1] - two_pi, last_comp[4]
+                first_comp[2].extend(last_comp[2])
+            
+            for lo, hi, group, start, end in components:
+                if len(group) < 2:
+                    kept.append(arcs[group[0]][0])
+                    continue
+                span = min(hi - lo, two_pi)
+                # Si un arc couvre déjà toute l'union, le plus long est conservé tel quel
+                covering = max(sorted(group), key=lambda i: arcs[i][0]['length'])
+                if spans[covering] >= span - angle_tol:
+                    kept.append(arcs[covering][0])
+                else:
+                    covering = None
+                    self._emit_merged_arc(ref, lo, span, start, end, [arcs[i][0] for i in group])
+                for i in group:
+                    if i != covering:
+                        to_remove.add(arcs[i][0]['id'])
+        
+        return kept
+    
+    def _emit_merged_arc(self, ref, lo, span, start, end, group_paths):
+        """Crée le chemin couvrant l'intervalle angulaire [lo, lo + span] de l'ellipse de ref.
+        
+        start et end sont les extrémités d'origine de l'intervalle. Un tour complet
+        est écrit en deux demi-arcs (un arc SVG ne peut pas relier un point à lui-même).
+        """
+        center, rx, ry, phi, _, _ = ref.to_center_parameterization()
+        rotation = math.degrees(phi)
+        if span >= 2.0 * math.pi - 1e-6:
+            halfway = ref.point_at_angle(lo + math.pi)
+            steps = [(start, 0), (halfway, 0), (start, 0)]
+        else:
+            steps = [(start, 0), (end, 1 if span > math.pi else 0)]
+        
+        commands = [inkex.paths.Move(start.x, start.y)]
+        for point, large_arc in steps[1:]:
+            commands.append(inkex.paths.Arc(rx, ry, rotation, large_arc, 1, point.x, point.y))
+        
+        first_path = group_paths[0]
+        new_element = inkex.PathElement(
+            id=f"chemin_fusionne_{first_path['id']}",
+            d=str(inkex.Path(commands)),
+            style=str(first_path['element'].style)
+        )
+        parent = first_path['element'].getparent()
+        if parent is not None:
+            parent.append(new_element)
+    
     def _process_overlapping_groups(self, overlap_graph, to_remove):
         """Traite les groupes de chemins qui se chevauchent.
         Pour les droites (L): crée un segment couvrant l'étendue maximale.
@@ -1954,7 +2659,7 @@ class OptimLaser(inkex.EffectExtension):
                         new_element = inkex.PathElement(
                             id=f"chemin_fusionne_{path_id}",
                             d=str(new_path),
-                            style=str(first_path['style'])
+                            style=str(first_path['element'].style)
                         )
                         
                         parent = first_path['element'].getparent()
@@ -2175,7 +2880,9 @@ class OptimLaser(inkex.EffectExtension):
         tolerance = self.tolerance
         
         # Échantillonner les points pour chaque segment (plus de points pour meilleure précision)
+        tick = self._cancel_token.tick
         for seg in segments:
+            tick()
             path_cmds = list(seg['orig_path'])
             seg['sampled_points'] = self._sample_points_on_path(path_cmds, num_samples=30)
         
@@ -2198,13 +2905,17 @@ class OptimLaser(inkex.EffectExtension):
             return
         
         overlap_graph = {}
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
         
         for i in range(len(remaining)):
+            advance(len(remaining) - i - 1)
             path1 = remaining[i]
             if path1['id'] not in overlap_graph:
                 overlap_graph[path1['id']] = {'path': path1, 'overlaps': set()}
             
             for j in range(i + 1, len(remaining)):
+                tick()
                 path2 = remaining[j]
                 
                 # Pré-filtre : bounding box basée sur les points échantillonnés
@@ -2275,6 +2986,7 @@ class OptimLaser(inkex.EffectExtension):
             by_color.setdefault(color, []).append(seg)
         
         all_chains = []
+        tick = self._cancel_token.tick
         
         for color, color_segs in by_color.items():
             # Utiliser des copies superficielles pour ne pas muter les segments originaux
@@ -2293,6 +3005,7 @@ class OptimLaser(inkex.EffectExtension):
                 # Extension vers l'avant (à partir du end du dernier segment)
                 extended = True
                 while extended:
+                    tick()
                     extended = False
                     last_seg = seg_dict[chain_ids[-1]]
                     chain_end = last_seg['end']
@@ -2330,6 +3043,7 @@ class OptimLaser(inkex.EffectExtension):
                 # Extension vers l'arrière (à partir du start du premier segment)
                 extended = True
                 while extended:
+                    tick()
                     extended = False
                     first_seg = seg_dict[chain_ids[0]]
                     chain_start = first_seg['start']
@@ -2414,13 +3128,17 @@ class OptimLaser(inkex.EffectExtension):
         Quand un chevauchement est détecté, on garde la chaîne avec le plus de 
         segments (plus fidèle à la courbe originale) et on supprime l'autre.
         """
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
         for i in range(len(chains)):
+            advance(len(chains) - i - 1)
             chain1 = chains[i]
             # Sauter si tous les segments de cette chaîne sont déjà supprimés
             if all(sid in to_remove for sid in chain1['segment_ids']):
                 continue
             
             for j in range(i + 1, len(chains)):
+                tick()
                 chain2 = chains[j]
                 if all(sid in to_remove for sid in chain2['segment_ids']):
                     continue
@@ -2483,12 +3201,16 @@ class OptimLaser(inkex.EffectExtension):
         Utilise la distance de Hausdorff dirigée : si tous les points de A sont
         proches de B, alors A est un sous-ensemble géométrique de B.
         """
+        tick = self._cancel_token.tick
+        advance = self._progress.advance
         for i in range(len(chains)):
+            advance(len(chains) - 1)
             chain_a = chains[i]
             if all(sid in to_remove for sid in chain_a['segment_ids']):
                 continue
             
             for j in range(len(chains)):
+                tick()
                 if i == j:
                     continue
                 chain_b = chains[j]
@@ -2600,6 +3322,380 @@ class OptimLaser(inkex.EffectExtension):
                 return True
         return False
     
+    def _count_shapes(self):
+        """Nombre d'éléments de dessin du document (hors éléments non rendus)."""
+        shapes = (inkex.PathElement, inkex.Rectangle, inkex.Circle, inkex.Ellipse,
+                  inkex.Line, inkex.Polyline, inkex.Polygon)
+        return sum(1 for el in self._document_index().elements if isinstance(el, shapes))
+    
+    def _cut_settings(self):
+        """
+        Réglages de découpe par couleur ('rrggbb' → CutSettings) pour l'export machine.
+        
+        Dans OptimLaser.json, "color_presets" associe une couleur à un préréglage
+        de "speeds" ; un préréglage peut indiquer sa puissance ("power", en %) et
+        sa durée de perçage ("pierce_time", en s). Les autres couleurs utilisent
+        la vitesse de découpe choisie, à 100 %, sans durée de perçage.
+        """
+        settings = {}
+        try:
+            with open(os.path.join(os.path.dirname(__file__), 'OptimLaser.json'), 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            speeds = config.get('speeds', {})
+            for color, preset in config.get('color_presets', {}).items():
+                value = speeds.get(preset)
+                if isinstance(value, dict):
+                    settings[color.lower().lstrip('#')] = CutSettings(
+                        float(value.get('value', self.laser_speed)), float(value.get('power', 100.0)),
+                        float(value.get('pierce_time', 0.0)))
+                elif value is not None:
+                    settings[color.lower().lstrip('#')] = CutSettings(float(value))
+        except Exception:
+            pass
+        return settings
+    
+    def _export_machine_file(self, svg=None):
+        """
+        Écrit le fichier machine (G-code ou HPGL) à côté du dessin.
+        
+        Les tracés sont écrits dans l'ordre du document, qui est l'ordre de
+        découpe après _reorder_and_rename_svg, et dans leur sens final. Les copies
+        des éléments gris (chemin_grisN) ne sont pas découpées.
+        
+        Args:
+            svg: Document à exporter (None = document courant)
+            
+        Returns:
+            Nom du fichier écrit, ou None si l'export est désactivé
+        """
+        writer_class = EXPORT_FORMATS.get(getattr(self, 'machine_export', 'none'))
+        if writer_class is None:
+            return None
+        svg = self.svg if svg is None else svg
+        index = DocumentIndex(svg, self._NON_RENDERED_TAGS)
+        styles = ComputedStyles(index, svg.stylesheets, ColorTable())
+        paths = [el for el in index.elements
+                 if isinstance(el, inkex.PathElement)
+                 and not (el.get('id') or '').startswith('chemin_gris')]
+        
+        per_color = self._cut_settings()
+        default = CutSettings(float(getattr(self, 'laser_speed', 25.0)))
+        uu_per_mm = svg.unittouu('1mm') or 1.0
+        x0, y0, _width, height = svg.get_viewbox()
+        bottom = y0 + height
+        
+        def to_machine(x, y):
+            return ((x - x0) / uu_per_mm, (bottom - y) / uu_per_mm)
+        
+        progress = self._progress
+        progress.set_total(len(paths), _("chemins"))
+        tick = self._cancel_token.tick
+        
+        def tour():
+            for el in paths:
+                tick()
+                progress.advance()
+                transform = el.composed_transform()
+                if transform:
+                    data = parse_path(str(el.path.transform(transform)))
+                else:
+                    data = self._path_data(el)
+                color = styles.colors.hex(styles.cut_color(el))
+                yield data, per_color.get(color, default), '#' + color
+        
+        base_name, _extension = os.path.splitext(self.document_path())
+        file_name = base_name + " - decoupe" + writer_class.extension
+        with open(file_name, 'w', encoding='ascii', newline='\n') as stream:
+            write_tour(writer_class(stream), tour(), to_machine, 1.0 / uu_per_mm)
+        return file_name
+    
+    def _performance_base_path(self):
+        """Chemin (sans extension) des fichiers de rapport de performances."""
+        base_name, _extension = os.path.splitext(self.document_path())
+        return base_name + " - performances"
+    
+    # Paramètres des étapes jusqu'à la fusion (clé des points de reprise)
+    PREPARATION_SETTINGS = ('tolerance', 'enable_partial_overlap', 'overlap_threshold',
+                            'SupprimerCouleursNonGerees', 'remove_duplicates_all_colors',
+                            'eulerian_chaining', 'simplify_tolerance')
+    # Paramètres de l'ordre de découpe et des statistiques
+    ORDERING_SETTINGS = ('enable_global_optimization', 'optimization_strategy', 'max_iterations',
+                         'zonage_direction', 'zonage_size_mm', 'laser_speed', 'idle_speed',
+                         'incremental', 'output_precision', 'relative_commands', 'compound_paths',
+                         'start_cost')
+    
+    def _result_cache_settings(self, names=PREPARATION_SETTINGS + ORDERING_SETTINGS):
+        """Paramètres qui influencent le fichier de découpe produit (partie de la clé du cache)."""
+        colors = []
+        try:
+            with open(os.path.join(os.path.dirname(__file__), 'OptimLaser.json'), 'r') as f:
+                colors = [c.lower().lstrip('#') for c in json.load(f).get('colors', [])]
+        except Exception:
+            pass
+        settings = {name: getattr(self, name, None) for name in names}
+        settings['colors'] = colors
+        if 'start_cost' in names:
+            settings['pierce_times'] = {color: cut.pierce_time for color, cut in self._cut_settings().items()
+                                        if cut.pierce_time}
+        return settings
+    
+    def _load_cached_result(self):
+        """Restitue le résultat mis en cache pour ce dessin et ces réglages.
+        
+        Calcule aussi la clé sous laquelle le résultat de ce traitement sera
+        enregistré (self._cache_key, None si le cache est désactivé).
+        
+        Returns:
+            Les statistiques du résultat restitué, ou None s'il n'est pas en cache
+        """
+        self._result_cache = None
+        self._cache_key = None
+        if not getattr(self, 'result_cache', False):
+            return None
+        self._result_cache = ResultCache()
+        buffer = io.BytesIO()
+        self.save(buffer)
+        self._input_document = buffer.getvalue()
+        self._cache_key = self._result_cache.key(self._input_document, self._result_cache_settings(), __version__)
+        hit = self._result_cache.get(self._cache_key)
+        if hit is None:
+            return None
+        data, stats = hit
+        if getattr(self, 'machine_export', 'none') in EXPORT_FORMATS:
+            self._export_machine_file(inkex.load_svg(io.BytesIO(data)).getroot())
+        self._save_optimized_file(data)
+        return stats
+    
+    def _store_cached_result(self, stats):
+        """Met en cache le document optimisé (sauf si une étape a été écourtée)."""
+        if self._cache_key is None or self._budget.truncated:
+            return
+        buffer = io.BytesIO()
+        self.save(buffer)
+        self._result_cache.put(self._cache_key, buffer.getvalue(), stats)
+    
+    def _find_checkpoint(self):
+        """Cherche le point de reprise (document après fusion) de ce dessin.
+        
+        La clé ne dépend que des réglages des étapes jusqu'à la fusion : changer
+        de stratégie d'ordre de découpe réutilise le même point de reprise.
+        
+        Returns:
+            Le document après fusion (octets), ou None s'il n'y en a pas
+        """
+        self._checkpoints = None
+        self._checkpoint_key = None
+        if self._cache_key is None:
+            return None
+        self._checkpoints = ResultCache(os.path.join(default_cache_dir(), 'checkpoints'))
+        self._checkpoint_key = self._checkpoints.key(
+            self._input_document, self._result_cache_settings(self.PREPARATION_SETTINGS), __version__)
+        hit = self._checkpoints.get(self._checkpoint_key)
+        return hit[0] if hit is not None else None
+    
+    def _restore_checkpoint(self, data):
+        """Remplace le document par le point de reprise data.
+        
+        Les éléments gris sont relevés sur le document d'origine, puis rattachés
+        aux calques du point de reprise (mêmes id : le dégroupement conserve les calques).
+        """
+        self.save_gray_elements()
+        self.document = inkex.load_svg(io.BytesIO(data))
+        self.svg = self.document.getroot()
+        self.ListeDeGris = [
+            (element, self.svg.getElementById(couche.get('id')) if couche is not None else None, style)
+            for element, couche, style in self.ListeDeGris
+        ]
+    
+    def _store_checkpoint(self):
+        """Enregistre le document après fusion (sauf si une étape a été écourtée)."""
+        if self._checkpoint_key is None or self._budget.truncated:
+            return
+        buffer = io.BytesIO()
+        self.save(buffer)
+        self._checkpoints.put(self._checkpoint_key, buffer.getvalue(), {})
+    
+    # ──────────── Mode incrémental : zones inchangées ──────────
+    
+    def _load_incremental_record(self):
+        """Charge l'enregistrement du passage précédent sur ce dessin (mode incrémental).
+        
+        L'enregistrement est rangé sous le chemin du fichier et les réglages des
+        étapes jusqu'à la fusion : il survit aux retouches du dessin.
+        """
+        self._incremental_record = None
+        self._incremental_store = None
+        self._zones = {}
+        self._tour = None
+        self._zone_summary = None
+        if not getattr(self, 'incremental', False):
+            return
+        try:
+            document = self.document_path()
+        except Exception:
+            return
+        self._incremental_store = ResultCache(os.path.join(default_cache_dir(), 'incremental'))
+        self._incremental_key = self._incremental_store.key(
+            document.encode('utf-8'), self._result_cache_settings(self.PREPARATION_SETTINGS), __version__)
+        record = {}
+        hit = self._incremental_store.get(self._incremental_key)
+        if hit is not None:
+            try:
+                record = json.loads(hit[0].decode('utf-8'))
+            except ValueError:
+                record = {}
+        self._incremental_record = record
+    
+    def _store_incremental_record(self):
+        """Enregistre zones et ordre de découpe pour le prochain passage (sauf étape écourtée)."""
+        if self._incremental_store is None or self._budget.truncated:
+            return
+        record = {
+            'zones': self._zones,
+            'ordering': self._result_cache_settings(self.ORDERING_SETTINGS),
+            'tour': self._tour,
+        }
+        self._incremental_store.put(self._incremental_key, json.dumps(record).encode('utf-8'), {})
+    
+    def _segment_bbox(self, element):
+        """Boîte (xmin, ymin, xmax, ymax) d'un segment.
+        
+        Pour un tracé sans arc ni transformation, la boîte des points de contrôle
+        (qui contient la courbe) suffit et évite le calcul exact d'inkex.
+        """
+        if not element.attrib.get('transform'):
+            box = self._path_data(element).bbox()
+            if box is not None:
+                return box
+        box = element.bounding_box()
+        if box is None:
+            return (0.0, 0.0, 0.0, 0.0)
+        return (box.left, box.top, box.right, box.bottom)
+    
+    def _reuse_unchanged_zones(self):
+        """
+        Regroupe les segments en zones et reprend le résultat des zones inchangées.
+        
+        Les segments d'une zone dont l'empreinte figure dans l'enregistrement
+        précédent sont remplacés par les chemins dédoublonnés et fusionnés de ce
+        passage ; ces chemins sont ensuite ignorés par les doublons et la fusion.
+        Les autres zones sont notées pour l'enregistrement de leur résultat.
+        """
+        segments = [el for el in self._document_index().elements
+                    if isinstance(el, inkex.PathElement)]
+        progress = self._progress
+        progress.set_total(len(segments), _("segments"))
+        tick = self._cancel_token.tick
+        boxes = []
+        for el in segments:
+            tick()
+            boxes.append(self._segment_bbox(el))
+            progress.advance()
+        
+        # Les fusions relient des extrémités égales au centième près
+        self._zone_clusters = SegmentClusters(boxes, max(self.tolerance, 0.01))
+        members = {}
+        for i, label in enumerate(self._zone_clusters.labels()):
+            members.setdefault(label, []).append(i)
+        
+        previous = (self._incremental_record or {}).get('zones') or {}
+        settled = set()
+        self._changed_zones = {}
+        for indices in members.values():
+            signature = zone_signature(
+                path_key(segments[i].get('d', ''), segments[i].get('style') or '') for i in indices)
+            outputs = previous.get(signature)
+            if outputs is None:
+                self._changed_zones[self._zone_clusters.root(indices[0])] = signature
+                continue
+            self._zones[signature] = outputs
+            
+            # Les chemins repris prennent la place du premier segment de la zone
+            anchor = segments[indices[0]]
+            parents = {}
+            for i in indices:
+                parent = segments[i].getparent()
+                parents.setdefault(parent.get('id'), parent)
+            for d, style, parent_id in outputs:
+                new_element = inkex.PathElement()
+                new_element.set('id', f"chemin_repris{len(settled) + 1}")
+                new_element.set('d', d)
+                new_element.set('style', style)
+                parent = parents.get(parent_id)
+                if parent is None or parent is anchor.getparent():
+                    anchor.addprevious(new_element)
+                else:
+                    parent.append(new_element)
+                settled.add(new_element)
+            for i in indices:
+                segments[i].getparent().remove(segments[i])
+            progress.count(_("zones reprises"))
+        
+        self._invalidate_document_index()
+        self._settled_paths = settled
+        self._zone_summary = (len(members) - len(self._changed_zones), len(members))
+    
+    def _record_changed_zones(self):
+        """Note le résultat (chemins après fusion) des zones recalculées.
+        
+        Chaque chemin est rattaché à sa zone par son point de départ. Si un
+        chemin ne peut pas être rattaché, aucune zone recalculée n'est notée :
+        elles le seront au prochain passage.
+        """
+        outputs = {root: [] for root in self._changed_zones}
+        for el in self._document_index().elements:
+            if not isinstance(el, inkex.PathElement) or el in self._settled_paths:
+                continue
+            d = el.get('d', '')
+            start = self._path_data(el).start
+            root = self._zone_clusters.locate(start) if start is not None else None
+            if root not in outputs:
+                return
+            parent = el.getparent()
+            outputs[root].append([d, el.get('style') or '', parent.get('id') if parent is not None else None])
+        for root, signature in self._changed_zones.items():
+            self._zones[signature] = outputs[root]
+    
+    def _create_profiler(self):
+        """Crée le profileur d'étapes selon les options choisies.
+        
+        Les mesures de base sont toujours prises (leur coût est négligeable) ;
+        le profilage détaillé n'est activé qu'avec le rapport de performances.
+        """
+        detailed = getattr(self, 'profiler', 'none') if getattr(self, 'performance_report', False) else 'none'
+        dump_base = None
+        if detailed != 'none':
+            try:
+                dump_base = self._performance_base_path()
+            except Exception:
+                detailed = 'none'
+        return StageProfiler(counter=self._count_shapes, profiler=detailed, dump_base=dump_base)
+    
+    def _write_performance_report(self, stats=None):
+        """Écrit le rapport de performances (JSON + CSV) si l'option est active.
+        
+        Returns:
+            Le tableau texte des étapes à afficher dans le bilan, ou None
+        """
+        if not getattr(self, 'performance_report', False):
+            return None
+        summary = self._profiler.summary_text()
+        metadata = {
+            'version': __version__,
+            'strategy': self.optimization_strategy if self.enable_global_optimization else None,
+            'tolerance': self.tolerance,
+            'max_seconds': getattr(self, 'max_seconds', 0),
+            'truncated': list(self._budget.truncated),
+            'stats': stats or {},
+        }
+        try:
+            metadata['file'] = os.path.basename(self.document_path())
+            written = self._profiler.write_report(self._performance_base_path(), metadata)
+            summary += "\n" + _("Rapport : {}").format(os.path.basename(written[0]))
+        except Exception as e:
+            summary += "\n" + _("Rapport non enregistré : {}").format(str(e))
+        return summary
+    
     def _run_optimization(self):
         # % Sauvegarde du fichier actuel avant optimisation
         # Rafraîchir la fenêtre de progression
@@ -2620,76 +3716,27 @@ class OptimLaser(inkex.EffectExtension):
             messagebox.showwarning(_('Attention !'), _('Vous devez enregistrer le fichier puis relancer l\'extension.'))
             return
         
-        # % Sauvegarder les éléments gris
-        self._update_progress_window(_("Sauvegarde des éléments gris..."))
-        self.save_gray_elements()
-
-        # % Appliquer la transformation d'un groupe à chacun de ses éléments enfants
-        self._update_progress_window(_("Dégroupement et transformation des éléments..."))
-        self.ungroup_and_apply_transform_to_children()
-        if self._is_cancel_requested():
-            self._restore_original_file()
-            self._show_cancel_confirmation()
-            return
-       
-        # % Supprimer tout ce qui a des lignes qui ne sont pas dans les couleurs gérées
-        self._update_progress_window(_("Suppression des couleurs non gérées..."))
-        self.remove_unmanaged_colors()
-        if self._is_cancel_requested():
-            self._restore_original_file()
-            self._show_cancel_confirmation()
-            return
-
-        # % Découpage en chemins simples
-        self._update_progress_window(_("Découpage en chemins simples..."))
-        self.replace_with_subpaths()
-        if self._is_cancel_requested():
-            self._restore_original_file()
-            self._show_cancel_confirmation()
-            return
+        # % Dessin et réglages déjà traités : le résultat en cache est restitué tel quel
+        cached_stats = self._load_cached_result()
         
-        # % Suppression de doublons
-        self._update_progress_window(_("Suppression des doublons..."))
-        self.adjust_overlapping_segments()
-        if self._is_cancel_requested():
+        # % Traitement dans un thread de travail : la fenêtre de progression reste
+        # réactive (Tk ne doit être manipulé que depuis ce thread-ci)
+        try:
+            if cached_stats is not None:
+                stats, performance_text = cached_stats, None
+            elif hasattr(self, 'gui_instance') and self.gui_instance:
+                stats, performance_text = self.gui_instance.run_in_background(self._run_pipeline)
+            else:
+                stats, performance_text = self._run_pipeline()
+        except DeadlineExceeded:
             self._restore_original_file()
-            self._show_cancel_confirmation()
+            self._show_cancel_confirmation(_("Délai maximal de traitement dépassé."))
             return
-        
-        # % Optimisation des chemins
-        self._update_progress_window(_("Optimisation des chemins..."))
-        self._optimize_path()
-        if self._is_cancel_requested():
+        except OperationCancelled:
             self._restore_original_file()
             self._show_cancel_confirmation()
             return
         
-        # % Optimisation de l'ordre de découpe
-        self._update_progress_window(_("Optimisation de l'ordre de découpe..."))
-        
-        stats = None
-        if self.enable_global_optimization:
-            stats = self._optimize_path_order()
-            if stats and stats.get('estimated_time_s', 0) > 0:
-                minutes = int(stats['estimated_time_s'] // 60)
-                seconds = int(stats['estimated_time_s'] % 60)
-                self._update_progress_window(
-                    _("Optimisation terminée : {} chemins, "
-                    "trajet à vide réduit de {:.1f}%, "
-                    "durée estimée : {}m{:02d}s").format(
-                        stats['num_paths'], stats['improvement'], minutes, seconds)
-                )
-        
-        # % Remettre les éléments gris
-        self._update_progress_window(_("Restauration des éléments gris..."))
-        self.restore_gray_elements()
-                
-        # % Création du fichier de découpe
-        # Rafraîchir la fenêtre de progression
-        self._update_progress_window(_("Création du fichier de découpe..."))  
-        
-        self._save_optimized_file()
-        
         # Compléter la barre de progression avec le résumé
         result_text = _("Traitement terminé.")
         if stats is not None:
@@ -2702,14 +3749,133 @@ class OptimLaser(inkex.EffectExtension):
                     + _("Trajet à vide réduit de {:.1f}%").format(stats['improvement']) + "\n"
                     + _("Durée estimée de découpe : {}m{:02d}s").format(minutes, seconds)
                 )
+                if stats.get('pierce_time_s'):
+                    result_text += "\n" + _("{} perçages ({:.0f}% de la durée)").format(
+                        stats['pierces'], stats['pierce_share'])
             except Exception:
                 pass
         
+        if cached_stats is not None:
+            result_text += "\n" + _("Résultat repris du cache (dessin et réglages inchangés)")
+        elif getattr(self, '_zone_summary', None):
+            result_text += "\n" + _("Zones reprises sans recalcul : {} sur {}").format(*self._zone_summary)
+        
+        # Signaler les étapes arrêtées par la durée maximale
+        truncated = self._truncated_stage_labels() if cached_stats is None else []
+        if truncated:
+            result_text += "\n" + _("Écourté (durée maximale) : {}").format(", ".join(truncated))
+            if not (hasattr(self, 'gui_instance') and self.gui_instance):
+                progress_logger.warning("%s", result_text.splitlines()[-1])
+        
         if hasattr(self, 'gui_instance') and self.gui_instance:
             self.gui_instance.complete_progress(
                 result_text,
-                on_cancel=self._restore_original_file
+                on_cancel=self._restore_original_file,
+                details_text=performance_text
             )
     
+    def _run_pipeline(self):
+        """Enchaîne les étapes de l'optimisation (exécuté hors du thread Tk).
+        
+        Returns:
+            (stats, texte des performances)
+            
+        Raises:
+            OperationCancelled: si l'utilisateur annule (DeadlineExceeded si le délai est écoulé)
+        """
+        # % Jeton consulté dans les boucles longues pour réagir vite à l'annulation
+        self._cancel_token = CancelToken(self._is_cancel_requested)
+        
+        # % Mesure de chaque étape (temps, CPU, mémoire, nombre d'éléments)
+        self._profiler = self._create_profiler()
+        # % Document après fusion déjà calculé avec ces réglages : seul l'ordre est refait
+        checkpoint = self._find_checkpoint()
+        # % Passage précédent sur ce dessin (mode incrémental)
+        self._load_incremental_record()
+        # % Avancement réel : travail prévu et effectué par étape, temps restant
+        self._progress = self._create_progress(resume=checkpoint is not None)
+        stage = self._stage
+        
+        # % Durée maximale répartie entre les étapes interruptibles (0 = sans limite)
+        anytime = ([] if checkpoint is not None else ['dedup', 'merge'])
+        anytime += ['ordering'] if self.enable_global_optimization else []
+        self._budget = TimeBudget(getattr(self, 'max_seconds', 0),
+                                  {name: DEFAULT_WEIGHTS[name] for name in anytime})
+        time_slice = self._time_slice
+        
+        if checkpoint is not None:
+            with stage('checkpoint', _("Point de reprise"), _("Reprise des chemins déjà dédoublonnés et fusionnés...")):
+                self._restore_checkpoint(checkpoint)
+            if self._incremental_record is not None:
+                self._zones = self._incremental_record.get('zones') or {}
+        else:
+            # % Sauvegarder les éléments gris
+            with stage('gray_save', _("Sauvegarde des gris"), _("Sauvegarde des éléments gris...")):
+                self.save_gray_elements()
+
+            # % Appliquer la transformation d'un groupe à chacun de ses éléments enfants
+            with stage('ungroup', _("Dégroupement"), _("Dégroupement et transformation des éléments...")):
+                self.ungroup_and_apply_transform_to_children()
+            self._cancel_token.check()
+           
+            # % Supprimer tout ce qui a des lignes qui ne sont pas dans les couleurs gérées
+            with stage('color_filter', _("Filtrage des couleurs"), _("Suppression des couleurs non gérées...")):
+                self.remove_unmanaged_colors()
+            self._cancel_token.check()
+
+            # % Découpage en chemins simples
+            with stage('subpaths', _("Découpage en chemins"), _("Découpage en chemins simples...")):
+                self.replace_with_subpaths()
+            self._cancel_token.check()
+            
+            # % Zones inchangées depuis le passage précédent : résultat repris tel quel
+            if self._incremental_record is not None:
+                with stage('zones', _("Zones inchangées"), _("Reprise des zones inchangées...")):
+                    self._reuse_unchanged_zones()
+                self._cancel_token.check()
+            
+            # % Suppression de doublons
+            with stage('dedup', _("Doublons"), _("Suppression des doublons...")), time_slice('dedup'):
+                self.adjust_overlapping_segments()
+            self._cancel_token.check()
+            
+            # % Optimisation des chemins
+            with stage('merge', _("Fusion des chemins"), _("Optimisation des chemins...")), time_slice('merge'):
+                self._optimize_path()
+            self._cancel_token.check()
+            if self._incremental_record is not None:
+                self._record_changed_zones()
+            
+            # % Point de reprise pour les prochains essais de stratégie
+            self._store_checkpoint()
+        
+        # % Optimisation de l'ordre de découpe
+        stats = None
+        if self.enable_global_optimization:
+            with stage('ordering', _("Ordre de découpe"), _("Optimisation de l'ordre de découpe...")), time_slice('ordering'):
+                stats = self._optimize_path_order()
+        elif self._output_writer() is not None:
+            # % Options de sortie appliquées dans l'ordre du document
+            with stage('output', _("Écriture compacte"), _("Écriture compacte des tracés...")):
+                self._write_output_in_document_order()
+        
+        # % Fichier machine (G-code, HPGL) dans l'ordre de découpe
+        if getattr(self, 'machine_export', 'none') in EXPORT_FORMATS:
+            with stage('export', _("Export machine"), _("Écriture du fichier machine...")):
+                self._export_machine_file()
+        
+        # % Remettre les éléments gris
+        with stage('gray_restore', _("Restauration des gris"), _("Restauration des éléments gris...")):
+            self.restore_gray_elements()
+                
+        # % Création du fichier de découpe
+        with stage('save', _("Enregistrement"), _("Création du fichier de découpe...")):
+            self._store_cached_result(stats)
+            self._store_incremental_record()
+            self._save_optimized_file()
+        
+        performance_text = self._write_performance_report(stats)
+        return stats, performance_text
+    
 if __name__ == '__main__':
     OptimLaser().run()
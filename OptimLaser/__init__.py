@@ -13,12 +13,40 @@ __license__ = "GPLv2"
 try:
     from .geometry import Point, Vector, Segment, Arc, BezierCurve
     from .duplicate_remover import DuplicateRemover
+    from .profiling import StageProfiler
+    from .cancellation import CancelToken, OperationCancelled, DeadlineExceeded, TimeBudget
+    from .progress import ProgressTracker
+    from .result_cache import ResultCache
+    from .incremental import SegmentClusters, repair_tour
+    from .document_index import DocumentIndex
+    from .computed_style import ColorTable, ComputedStyles, StyleRecord
+    from .path_data import PathData, PathWriter, parse_path, format_path
+    from .machine_export import CutSettings, GcodeWriter, HpglWriter, write_tour
+    from .trail_cover import cover_with_trails
+    from .endpoint_welding import EndpointWelder
 except ImportError:
     # Fallback pour les imports directs
     from geometry import Point, Vector, Segment, Arc, BezierCurve
     from duplicate_remover import DuplicateRemover
+    from profiling import StageProfiler
+    from cancellation import CancelToken, OperationCancelled, DeadlineExceeded, TimeBudget
+    from progress import ProgressTracker
+    from result_cache import ResultCache
+    from incremental import SegmentClusters, repair_tour
+    from document_index import DocumentIndex
+    from computed_style import ColorTable, ComputedStyles, StyleRecord
+    from path_data import PathData, PathWriter, parse_path, format_path
+    from machine_export import CutSettings, GcodeWriter, HpglWriter, write_tour
+    from trail_cover import cover_with_trails
+    from endpoint_welding import EndpointWelder
 
 __all__ = [
     'Point', 'Vector', 'Segment', 'Arc', 'BezierCurve',
-    'DuplicateRemover'
+    'DuplicateRemover', 'StageProfiler',
+    'CancelToken', 'OperationCancelled', 'DeadlineExceeded', 'TimeBudget', 'ProgressTracker',
+    'ResultCache', 'SegmentClusters', 'repair_tour',
+    'DocumentIndex', 'ColorTable', 'ComputedStyles', 'StyleRecord',
+    'PathData', 'PathWriter', 'parse_path', 'format_path',
+    'CutSettings', 'GcodeWriter', 'HpglWriter', 'write_tour', 'cover_with_trails',
+    'EndpointWelder'
 ]
@@ -0,0 +1,162 @@
+"""
+Module d'annulation coopérative - Arrêt rapide des boucles longues
+
+Un CancelToken est consulté à intervalles réguliers dans les boucles coûteuses
+(comparaisons de paires, passes 2-opt, fusions). Il lève OperationCancelled
+quand l'utilisateur a demandé l'annulation et DeadlineExceeded quand le délai
+imparti est écoulé, ce qui interrompt l'étape en cours en quelques dizaines de
+millisecondes quelle que soit la taille du problème.
+
+Un TimeBudget répartit une durée totale entre les étapes interruptibles : chaque
+étape reçoit un jeton dont l'échéance correspond à sa part du temps restant, et
+garde son meilleur résultat partiel quand cette échéance est atteinte.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+__all__ = ['CancelToken', 'OperationCancelled', 'DeadlineExceeded', 'TimeBudget']
+
+
+class OperationCancelled(Exception):
+    """Levée quand l'utilisateur a demandé l'annulation du traitement."""
+
+
+class DeadlineExceeded(OperationCancelled):
+    """Levée quand le délai accordé au traitement est écoulé."""
+
+
+class CancelToken:
+    """
+    Jeton d'annulation et d'échéance partagé par les étapes d'un traitement.
+
+    tick() est assez léger pour être appelé à chaque itération d'une boucle :
+    il ne fait qu'une comparaison d'horloge, la vérification complète (drapeau
+    d'annulation et échéance) n'ayant lieu qu'une fois par intervalle.
+    """
+
+    def __init__(self, cancel_requested: Optional[Callable[[], bool]] = None,
+                 deadline: Optional[float] = None, interval: float = 0.02):
+        """
+        Initialise le jeton.
+
+        Args:
+            cancel_requested: Fonction indiquant si l'annulation est demandée (optionnel)
+            deadline: Échéance absolue en secondes (horloge time.monotonic), ou None
+            interval: Intervalle minimal entre deux vérifications complètes, en secondes
+        """
+        self._cancel_requested = cancel_requested
+        self.deadline = deadline
+        self.interval = interval
+        self._cancelled = False
+        self._next_check = 0.0
+        # Vrai dès que check() a levé DeadlineExceeded (étape écourtée)
+        self.deadline_hit = False
+
+    @classmethod
+    def with_timeout(cls, seconds: Optional[float], **kwargs) -> 'CancelToken':
+        """Crée un jeton dont l'échéance est dans seconds secondes (None = sans échéance)."""
+        deadline = time.monotonic() + seconds if seconds else None
+        return cls(deadline=deadline, **kwargs)
+
+    def cancel(self):
+        """Demande l'annulation : le prochain contrôle lèvera OperationCancelled."""
+        self._cancelled = True
+        self._next_check = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """True si l'annulation a été demandée."""
+        if not self._cancelled and self._cancel_requested is not None:
+            try:
+                self._cancelled = bool(self._cancel_requested())
+            except Exception:
+                pass
+        return self._cancelled
+
+    @property
+    def expired(self) -> bool:
+        """True si l'échéance est dépassée."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Secondes restantes avant l'échéance (None si pas d'échéance)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        """
+        Vérifie immédiatement l'annulation et l'échéance.
+
+        Raises:
+            OperationCancelled: si l'annulation a été demandée
+            DeadlineExceeded: si l'échéance est dépassée
+        """
+        now = time.monotonic()
+        self._next_check = now + self.interval
+        if self.cancelled:
+            raise OperationCancelled()
+        if self.deadline is not None and now >= self.deadline:
+            self.deadline_hit = True
+            raise DeadlineExceeded()
+
+    def tick(self):
+        """Point de contrôle de boucle : vérifie au plus une fois par intervalle."""
+        if time.monotonic() >= self._next_check:
+            self.check()
+
+
+class TimeBudget:
+    """
+    Répartit une durée totale entre les étapes interruptibles d'un traitement.
+
+    Chaque étape reçoit, au moment où elle démarre, une part du temps restant
+    proportionnelle à son poids parmi les étapes qui restent : le temps non
+    consommé par une étape (ou par les étapes non interruptibles) profite
+    ainsi aux suivantes.
+
+    Utilisation :
+        budget = TimeBudget(120, {'dedup': 60, 'ordering': 18})
+        token = budget.token('dedup', cancel_requested)
+        ...
+        budget.record('dedup', token)
+        budget.truncated  # ['dedup'] si l'échéance a été atteinte
+    """
+
+    def __init__(self, seconds: Optional[float], weights: Dict[str, float]):
+        """
+        Initialise le budget.
+
+        Args:
+            seconds: Durée totale en secondes (None ou 0 = sans limite)
+            weights: Poids des étapes interruptibles, dans l'ordre d'exécution
+        """
+        self.seconds = float(seconds) if seconds and seconds > 0 else None
+        self.deadline = time.monotonic() + self.seconds if self.seconds else None
+        self.weights = dict(weights)
+        self.truncated: List[str] = []
+
+    def token(self, name: str, cancel_requested: Optional[Callable[[], bool]] = None) -> CancelToken:
+        """
+        Crée le jeton de l'étape name avec sa part du temps restant.
+
+        Args:
+            name: Identifiant de l'étape (clé de weights)
+            cancel_requested: Fonction indiquant si l'annulation est demandée
+
+        Returns:
+            Un CancelToken (sans échéance si le budget est illimité)
+        """
+        if self.deadline is None:
+            return CancelToken(cancel_requested)
+        weight = self.weights.pop(name, 0.0)
+        remaining_weight = weight + sum(self.weights.values())
+        share = weight / remaining_weight if remaining_weight > 0 else 1.0
+        now = time.monotonic()
+        return CancelToken(cancel_requested, deadline=now + max(0.0, self.deadline - now) * share)
+
+    def record(self, name: str, token: CancelToken):
+        """Note l'étape comme écourtée si son échéance a été atteinte."""
+        if token.deadline_hit and name not in self.truncated:
+            self.truncated.append(name)
@@ -0,0 +1,235 @@
+"""
+Module de style calculé - Couleurs et propriétés utiles à la découpe, résolues une fois
+
+Les étapes n'ont besoin que de quelques propriétés de style : couleur du trait,
+couleur du remplissage, épaisseur du trait et visibilité. Elles sont résolues en
+un passage sur les éléments rendus, en tenant compte des règles des feuilles
+<style> (sélecteurs de classe, d'id...), des attributs de présentation, de
+l'attribut style et de l'héritage. Chaque élément reçoit un enregistrement
+compact dont les couleurs sont des indices entiers dans une table commune : les
+étapes comparent des entiers au lieu d'analyser des chaînes.
+
+Les enregistrements décrivent le document lors de la construction de l'index
+(cf. DocumentIndex) : ils sont reconstruits avec lui.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import inkex
+
+__all__ = ['ColorTable', 'ComputedStyles', 'StyleRecord', 'NO_COLOR', 'UNSET']
+
+# Indices réservés de la table des couleurs
+UNSET = 0      # propriété absente de l'élément et de ses ancêtres
+NO_COLOR = 1   # valeur 'none'
+
+_HEX6 = re.compile(r'#([0-9a-fA-F]{6})$')
+_HEX3 = re.compile(r'#([0-9a-fA-F]{3})$')
+_LEADING_NUMBER = re.compile(r'\s*([-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)')
+
+# Propriétés résolues ; 'display' n'est pas héritée mais masque tout le sous-arbre
+_PROPERTIES = ('stroke', 'fill', 'stroke-width', 'visibility', 'display')
+
+
+class ColorTable:
+    """
+    Table des couleurs rencontrées, chacune identifiée par un indice entier.
+
+    Deux écritures d'une même couleur ('red', '#F00', 'rgb(255,0,0)') reçoivent le
+    même indice ; chaque chaîne distincte n'est analysée qu'une fois.
+    """
+
+    def __init__(self):
+        # Clé canonique : 'rrggbb' pour une couleur, chaîne en minuscules sinon (url(#...))
+        self._keys: List[str] = ['', 'none']
+        self._gray: List[bool] = [False, False]
+        self._by_key: Dict[str, int] = {'': UNSET, 'none': NO_COLOR}
+        self._by_raw: Dict[str, int] = {}
+
+    def index(self, raw: Optional[str]) -> int:
+        """Indice de la couleur écrite raw (UNSET si raw est vide ou None)."""
+        if raw is None:
+            return UNSET
+        found = self._by_raw.get(raw)
+        if found is not None:
+            return found
+        key, gray = self._parse(raw)
+        found = self._by_key.get(key)
+        if found is None:
+            found = self._by_key[key] = len(self._keys)
+            self._keys.append(key)
+            self._gray.append(gray)
+        self._by_raw[raw] = found
+        return found
+
+    @staticmethod
+    def _parse(raw: str) -> Tuple[str, bool]:
+        text = raw.strip().lower()
+        if text in ('', 'none'):
+            return text, False
+        match = _HEX6.match(text)
+        if match:
+            hex6 = match.group(1)
+        else:
+            match = _HEX3.match(text)
+            if match:
+                hex6 = ''.join(c * 2 for c in match.group(1))
+            else:
+                try:
+                    r, g, b = inkex.Color(text).to_rgb()
+                except Exception:
+                    # Dégradé, motif, currentColor... : identifié par son écriture
+                    return text.lstrip('#'), False
+                return f'{r:02x}{g:02x}{b:02x}', r == g == b
+        return hex6, hex6[0:2] == hex6[2:4] == hex6[4:6]
+
+    def hex(self, index: int) -> str:
+        """Couleur sous la forme 'rrggbb' ('none' pour NO_COLOR, '' pour UNSET)."""
+        return self._keys[index]
+
+    def is_gray(self, index: int) -> bool:
+        """True si la couleur a trois composantes égales (noir et blanc compris)."""
+        return self._gray[index]
+
+
+@dataclass(frozen=True)
+class StyleRecord:
+    """
+    Style calculé d'un élément.
+
+    Attributes:
+        stroke (int): Indice de la couleur du trait (UNSET, NO_COLOR ou une couleur)
+        fill (int): Indice de la couleur du remplissage
+        stroke_width (float): Épaisseur du trait, en unités utilisateur (1 par défaut)
+        visible (bool): False si l'élément ou un ancêtre est masqué (display:none,
+            visibility:hidden|collapse)
+    """
+    stroke: int = UNSET
+    fill: int = UNSET
+    stroke_width: float = 1.0
+    visible: bool = True
+    # Valeurs héritables brutes, pour la résolution des descendants
+    _visibility: str = 'visible'
+    _displayed: bool = True
+
+
+_ROOT = StyleRecord()
+
+
+class ComputedStyles:
+    """
+    Styles calculés des éléments rendus d'un document.
+
+    Utilisation :
+        styles = ComputedStyles(index, svg.stylesheets, couleurs)
+        record = styles.record(element)
+        if record.stroke == couleurs.index('#ff0000'): ...
+    """
+
+    def __init__(self, index, stylesheets, colors: ColorTable):
+        """
+        Résout le style de chaque élément de l'index, dans l'ordre du document.
+
+        Args:
+            index: DocumentIndex du document
+            stylesheets: Feuilles de style du document (svg.stylesheets)
+            colors: Table des couleurs, partagée d'une reconstruction à l'autre
+        """
+        self.index = index
+        self.colors = colors
+        # Règles utiles : (vérification du sélecteur, spécificité, propriétés déclarées)
+        self._rules = []
+        for sheet in stylesheets:
+            for rule in sheet:
+                declared = {name: (rule.get(name), rule.get_importance(name))
+                            for name in _PROPERTIES if name in rule}
+                if declared:
+                    for selector, check in zip(rule.rules, rule.checks):
+                        self._rules.append((check, selector.specificity, declared))
+        # Même style hérité et mêmes déclarations → même enregistrement
+        self._memo: Dict[tuple, StyleRecord] = {}
+        # Déclarations de chaque attribut style distinct (analysé une seule fois)
+        self._inline: Dict[str, list] = {}
+        self._records: Dict = {}
+        for element in index.elements:
+            parent = element.getparent()
+            self._records[element] = self._resolve(
+                element, self._records.get(parent, _ROOT) if parent is not None else _ROOT)
+
+    def record(self, element) -> StyleRecord:
+        """Style calculé de l'élément (calculé à la demande s'il a été créé après l'index)."""
+        found = self._records.get(element)
+        if found is None:
+            parent = element.getparent()
+            found = self._records[element] = self._resolve(
+                element, self.record(parent) if parent is not None else _ROOT)
+        return found
+
+    def cut_color(self, element) -> int:
+        """
+        Indice de la couleur de découpe : couleur du trait, noir si aucun trait
+        n'est défini (convention des étapes d'optimisation).
+        """
+        stroke = self.record(element).stroke
+        return self.colors.index('#000000') if stroke == UNSET else stroke
+
+    def _declared(self, element) -> tuple:
+        """Valeurs déclarées pour l'élément, par ordre croissant de priorité."""
+        found = []
+        for check, specificity, declared in self._rules:
+            if check(element):
+                for name, (value, important) in declared.items():
+                    found.append(((important, specificity), name, value))
+        attrib = element.attrib
+        # Attributs de présentation : spécificité nulle
+        for name in _PROPERTIES:
+            value = attrib.get(name)
+            if value is not None:
+                found.append(((False, (0, 0, 0)), name, value))
+        style = attrib.get('style')
+        if style:
+            inline = self._inline.get(style)
+            if inline is None:
+                parsed = inkex.Style(style)
+                inline = self._inline[style] = [
+                    ((parsed.get_importance(name), (float('inf'), 0, 0)), name, parsed.get(name))
+                    for name in _PROPERTIES if name in parsed]
+            found.extend(inline)
+        found.sort(key=lambda item: item[0])
+        return tuple((name, value) for _, name, value in found)
+
+    def _resolve(self, element, parent: StyleRecord) -> StyleRecord:
+        if not isinstance(element.tag, str):
+            return parent
+        declared = self._declared(element)
+        key = (parent, declared)
+        found = self._memo.get(key)
+        if found is not None:
+            return found
+
+        values = dict(declared)
+        stroke, fill = parent.stroke, parent.fill
+        stroke_width, visibility = parent.stroke_width, parent._visibility
+        value = values.get('stroke')
+        if value is not None and value.strip() != 'inherit':
+            stroke = self.colors.index(value)
+        value = values.get('fill')
+        if value is not None and value.strip() != 'inherit':
+            fill = self.colors.index(value)
+        value = values.get('stroke-width')
+        if value is not None:
+            match = _LEADING_NUMBER.match(value)
+            if match:
+                stroke_width = float(match.group(1))
+        value = values.get('visibility')
+        if value is not None and value.strip() != 'inherit':
+            visibility = value.strip().lower()
+        displayed = parent._displayed and (values.get('display') or '').strip().lower() != 'none'
+
+        found = self._memo[key] = StyleRecord(
+            stroke=stroke, fill=fill, stroke_width=stroke_width,
+            visible=displayed and visibility not in ('hidden', 'collapse'),
+            _visibility=visibility, _displayed=displayed)
+        return found
@@ -0,0 +1,92 @@
+"""
+Module d'index du document - Éléments rendus et calque de chaque élément
+
+Un seul parcours en profondeur du document relève, dans l'ordre du document,
+les éléments rendus (hors contenu de <defs>, <marker>, <pattern>...) et le
+calque auquel chacun appartient. Les étapes consultent l'index au lieu de
+remonter les ancêtres de chaque élément.
+
+L'index décrit le document tel qu'il était lors de sa construction : une étape
+qui restructure l'arbre (suppression, ajout ou déplacement d'éléments) doit
+l'invalider pour qu'il soit reconstruit à la prochaine consultation.
+"""
+
+from typing import Dict, FrozenSet, List, Optional
+
+import inkex
+
+__all__ = ['DocumentIndex']
+
+_LAYER_TAG = inkex.addNS('g', 'svg')
+_GROUPMODE = inkex.addNS('groupmode', 'inkscape')
+
+
+def _is_layer(element) -> bool:
+    return element.tag == _LAYER_TAG and element.get(_GROUPMODE) == 'layer'
+
+
+class DocumentIndex:
+    """
+    Index des éléments rendus d'un document et de leur calque.
+
+    Utilisation :
+        index = DocumentIndex(svg, non_rendered_tags)
+        for element in index.elements:      # ordre du document, racine comprise
+            couche = index.layer(element)
+    """
+
+    def __init__(self, root, non_rendered_tags: FrozenSet[str]):
+        """
+        Construit l'index en un parcours du document.
+
+        Args:
+            root: Élément racine (svg)
+            non_rendered_tags: Tags des conteneurs dont les descendants ne sont pas rendus
+        """
+        self.root = root
+        self.non_rendered_tags = non_rendered_tags
+        # Éléments rendus, dans l'ordre du document (racine comprise)
+        self.elements: List = []
+        self._layers: Dict = {}
+        self._hidden = set()
+
+        stack = [(root, None, False)]
+        while stack:
+            element, layer, hidden = stack.pop()
+            # Commentaires et instructions de traitement
+            if not isinstance(element.tag, str):
+                continue
+            if _is_layer(element):
+                layer = element
+            if hidden:
+                self._hidden.add(element)
+            else:
+                self.elements.append(element)
+                self._layers[element] = layer
+            hidden = hidden or element.tag in non_rendered_tags
+            stack.extend((child, layer, hidden) for child in reversed(element))
+
+    def is_rendered(self, element) -> bool:
+        """True si aucun ancêtre de l'élément n'est un conteneur non rendu."""
+        if element in self._layers:
+            return True
+        if element in self._hidden:
+            return False
+        # Élément créé après la construction de l'index
+        cur = element.getparent()
+        while cur is not None:
+            if cur.tag in self.non_rendered_tags:
+                return False
+            cur = cur.getparent()
+        return True
+
+    def layer(self, element) -> Optional[inkex.BaseElement]:
+        """Calque contenant l'élément (l'élément lui-même s'il est un calque), ou None."""
+        if element in self._layers:
+            return self._layers[element]
+        # Élément créé après la construction de l'index
+        while element is not None:
+            if _is_layer(element):
+                return element
+            element = element.getparent()
+        return None
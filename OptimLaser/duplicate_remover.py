@@ -15,6 +15,10 @@ except ImportError:
 
 __all__ = ['DuplicateRemover', 'OverlapInfo']
 
+# Écart angulaire (radians) au-delà duquel les paires de droites sont
+# recherchées par segments courts plutôt que par droite canonique
+_NEAR_PARALLEL_ANGLE = 0.05
+
 
 
 @dataclass
@@ -48,7 +52,7 @@ class DuplicateRemover:
     """
     
     def __init__(self, tolerance: float = 0.1, enable_partial_overlap: bool = True,
-                 overlap_threshold: float = 0.7):
+                 overlap_threshold: float = 0.7, angle_tolerance: float = 0.01):
         """
         Initialise le détecteur de doublons.
         
@@ -56,15 +60,28 @@ class DuplicateRemover:
             tolerance: Tolérance spatiale en unités document
             enable_partial_overlap: Activer la détection de chevauchements partiels
             overlap_threshold: Ratio minimum de chevauchement pour considérer comme doublons
+            angle_tolerance: Largeur angulaire (radians) des seaux de l'index des droites
         """
         self.tolerance = tolerance
         self.enable_partial_overlap = enable_partial_overlap
         self.overlap_threshold = overlap_threshold
+        self.angle_tolerance = max(angle_tolerance, 1e-6)
     
     def find_duplicate_line_segments(self, segments: List[Dict]) -> List[OverlapInfo]:
         """
         Trouve les segments de droite superposés.
         
+        Deux segments de même couleur sont des doublons quand les deux extrémités
+        du plus court sont à moins de la tolérance de l'autre segment et que le
+        ratio de chevauchement (projections sur la direction du segment de plus
+        petit indice, rapportées au plus court) atteint overlap_threshold.
+        
+        Les segments sont indexés par droite canonique (angle, distance à l'origine)
+        puis comparés par balayage d'intervalles le long de chaque droite ; les
+        segments courts, seuls à pouvoir doubler une droite d'angle éloigné, sont
+        recherchés dans une grille. Seules les paires réellement candidates sont
+        testées, avec le même résultat que la comparaison de toutes les paires.
+        
         Args:
             segments: Liste de dictionnaires avec clés 'id', 'start', 'end', 'color'
             
@@ -73,72 +90,311 @@ class DuplicateRemover:
         """
         overlaps = []
         
-        # Grouper par couleur
+        # Grouper par couleur (en gardant l'indice d'origine pour un ordre stable)
         by_color = {}
-        for seg in segments:
+        for index, seg in enumerate(segments):
             color = seg.get('color', '#000000')
-            if color not in by_color:
-                by_color[color] = []
-            by_color[color].append(seg)
+            by_color.setdefault(color, []).append((index, seg))
         
         # Analyser chaque couleur
         for color, color_segs in by_color.items():
-            # Grouper par orientation
-            horizontal = [s for s in color_segs if abs(s['start'].y - s['end'].y) < self.tolerance]
-            vertical = [s for s in color_segs if abs(s['start'].x - s['end'].x) < self.tolerance]
-            diagonal = [s for s in color_segs if s not in horizontal and s not in vertical]
-            
-            # Analyser chaque groupe
-            for group in [horizontal, vertical, diagonal]:
-                overlaps.extend(self._find_overlapping_lines_in_group(group))
+            overlaps.extend(self._find_overlapping_lines_in_group(color_segs))
         
         return overlaps
     
-    def _find_overlapping_lines_in_group(self, segments: List[Dict]) -> List[OverlapInfo]:
+    def find_parallel_line_pairs(self, segments: List[Dict], max_angle: float) -> List[Tuple[int, int]]:
         """
-        Trouve les chevauchements dans un groupe de lignes orientées similairement.
+        Paires de segments presque parallèles et voisins, sans les tester.
+        
+        Retourne un surensemble des paires (i, j), i < j, dont les droites font
+        un angle d'au plus max_angle et qui passent à moins de la tolérance l'une
+        de l'autre : l'appelant applique ensuite son propre test à ces seules
+        paires au lieu de toutes.
         
         Args:
-            segments: Segments alignés
+            segments: Liste de dictionnaires avec clés 'start' et 'end' (Point)
+            max_angle: Écart angulaire maximal entre les droites (radians)
             
         Returns:
-            Liste des chevauchements
+            Paires d'indices triées
         """
-        overlaps = []
+        if len(segments) < 2:
+            return []
+        candidates, _ = self._near_parallel_candidates(list(enumerate(segments)), max_angle)
+        return sorted(candidates)
+    
+    def _build_line_index(self, indexed_segments: List[Tuple[int, Dict]]) -> Tuple[Dict, List[Dict], float, float]:
+        """
+        Construit l'index des segments par droite canonique.
         
-        for i, seg1 in enumerate(segments):
-            for j, seg2 in enumerate(segments):
-                if i >= j:
-                    continue
-                
-                seg_obj1 = Segment(seg1['start'], seg1['end'])
-                seg_obj2 = Segment(seg2['start'], seg2['end'])
-                
-                # Vérifier la colinéarité
-                if not seg_obj1.is_collinear_with(seg_obj2, self.tolerance):
-                    continue
-                
-                # Vérifier le chevauchement
-                if not seg_obj1.overlaps_with(seg_obj2, self.tolerance):
-                    continue
-                
-                # Calculer le ratio de chevauchement
-                overlap_ratio = self._calculate_overlap_ratio(seg1, seg2)
-                
-                if overlap_ratio >= self.overlap_threshold:
-                    # Déterminer les points de fusion
-                    merge_start, merge_end = self._get_merge_points(seg1, seg2)
-                    
-                    overlaps.append(OverlapInfo(
-                        segment1_id=seg1['id'],
-                        segment2_id=seg2['id'],
-                        overlap_ratio=overlap_ratio,
-                        merge_point1=merge_start,
-                        merge_point2=merge_end
-                    ))
+        Chaque segment est orienté dans [0, π) puis rangé dans un seau
+        (indice d'angle, indice de distance signée) de largeur angulaire
+        ``angle_tolerance``.
+        
+        Args:
+            indexed_segments: Liste de tuples (indice d'origine, segment)
+            
+        Returns:
+            Tuple (seaux {(ia, ir): [entrées]}, entrées, largeur des seaux de
+            distance, demi-diagonale de la boîte englobante)
+        """
+        # Centre de la boîte englobante : réduit l'effet bras de levier de l'angle
+        xs = [p.x for _, seg in indexed_segments for p in (seg['start'], seg['end'])]
+        ys = [p.y for _, seg in indexed_segments for p in (seg['start'], seg['end'])]
+        cx = (min(xs) + max(xs)) / 2.0
+        cy = (min(ys) + max(ys)) / 2.0
+        extent = max(math.hypot(max(xs) - cx, max(ys) - cy), 1.0)
+        
+        # Seaux de même largeur (au plus angle_tolerance) : π en est un multiple,
+        # l'écart en indices reste borné au passage π → 0
+        angle_bins = max(1, int(math.ceil(math.pi / self.angle_tolerance)))
+        angle_step = math.pi / angle_bins
+        rho_step = max(self.tolerance, 1e-9) + extent * angle_step
+        
+        entries = []
+        buckets = {}
+        for index, seg in indexed_segments:
+            start, end = seg['start'], seg['end']
+            dx = end.x - start.x
+            dy = end.y - start.y
+            length = math.hypot(dx, dy)
+            if length > 0:
+                ux, uy = dx / length, dy / length
+            else:
+                ux, uy = 1.0, 0.0
+            # Orientation canonique : angle dans [0, π)
+            if uy < 0 or (uy == 0 and ux < 0):
+                ux, uy = -ux, -uy
+            theta = math.atan2(uy, ux) % math.pi
+            rho = -uy * (start.x - cx) + ux * (start.y - cy)
+            key = (min(int(theta / angle_step), angle_bins - 1),
+                   int(math.floor(rho / rho_step)))
+            entry = {
+                'index': index,
+                'seg': seg,
+                'segment': Segment(start, end),
+                'key': key,
+                'bbox': (min(start.x, end.x), min(start.y, end.y),
+                         max(start.x, end.x), max(start.y, end.y)),
+                'direction': (dx / length, dy / length) if length > 0 else None,
+                'length': length,
+            }
+            entries.append(entry)
+            buckets.setdefault(key, []).append(entry)
+        
+        return buckets, entries, rho_step, extent
+    
+    def _neighbor_line_keys(self, key: Tuple[int, int], angle_bins: int,
+                            angle_span: int, rho_span: int) -> Set[Tuple[int, int]]:
+        """
+        Retourne les seaux voisins d'une droite canonique.
+        
+        Au passage de l'angle π → 0, la direction s'inverse et la distance
+        signée change de signe : le seau de distance ir devient -ir - 1.
+        """
+        ia, ir = key
+        keys = set()
+        for da in range(-angle_span, angle_span + 1):
+            na = ia + da
+            base = ir
+            if not 0 <= na < angle_bins:
+                na %= angle_bins
+                base = -ir - 1
+            for dr in range(-rho_span, rho_span + 1):
+                keys.add((na, base + dr))
+        return keys
+    
+    def _near_parallel_candidates(self, indexed_segments: List[Tuple[int, Dict]],
+                                  max_angle: float) -> Tuple[Set[Tuple[int, int]], Dict[int, Dict]]:
+        """
+        Paires candidates dont les droites font un angle d'au plus ``max_angle``.
+        
+        Deux droites d'écart angulaire φ qui passent à moins de la tolérance
+        l'une de l'autre dans la boîte englobante ont des distances signées
+        qui diffèrent d'au plus tolérance + étendue·φ : les seaux à explorer
+        en angle et en distance en découlent. Les segments de ces seaux sont
+        triés le long de la direction du seau et balayés ; une paire n'est
+        retenue que si leurs intervalles projetés se touchent.
+        
+        Returns:
+            Tuple (paires d'indices (i, j) avec i < j, entrées par indice)
+        """
+        buckets, entries, rho_step, extent = self._build_line_index(indexed_segments)
+        angle_bins = max(1, int(math.ceil(math.pi / self.angle_tolerance)))
+        angle_step = math.pi / angle_bins
+        angle_span = min(angle_bins, int(math.ceil(max_angle / angle_step)))
+        # +1 : arrondi du seau de distance au passage π → 0
+        rho_span = int(math.ceil((self.tolerance + extent * max_angle) / rho_step)) + 1
+        tolerance = self.tolerance
+        candidates = set()
+        
+        for key in buckets:
+            pool = []
+            for neighbor_key in self._neighbor_line_keys(key, angle_bins, angle_span, rho_span):
+                pool.extend(buckets.get(neighbor_key, ()))
+            if len(pool) < 2:
+                continue
+            
+            # Projection sur la direction centrale du seau
+            theta = (key[0] + 0.5) * angle_step
+            ux, uy = math.cos(theta), math.sin(theta)
+            spans = []
+            for entry in pool:
+                start, end = entry['seg']['start'], entry['seg']['end']
+                p1 = start.x * ux + start.y * uy
+                p2 = end.x * ux + end.y * uy
+                spans.append((min(p1, p2), max(p1, p2), entry))
+            spans.sort(key=lambda span: (span[0], span[2]['index']))
+            
+            # Balayage : ne garder actifs que les intervalles encore atteignables
+            active = []
+            for lo, hi, entry in spans:
+                active = [a for a in active if a[0] + tolerance >= lo]
+                for a_hi, other in active:
+                    first, second = (entry, other) if entry['index'] < other['index'] else (other, entry)
+                    if first['key'] != key or first['index'] == second['index']:
+                        continue
+                    candidates.add((first['index'], second['index']))
+                active.append((hi, entry))
+        
+        return candidates, {entry['index']: entry for entry in entries}
+    
+    def _short_segment_candidates(self, entries: Dict[int, Dict], max_length: float) -> Set[Tuple[int, int]]:
+        """
+        Paires candidates formées d'un segment court et d'un segment qui le frôle.
+        
+        Chaque segment est échantillonné tous les demi-pas de la grille (pas =
+        max_length, au moins deux fois la tolérance) et rangé dans les cases de
+        ses échantillons. Un point à moins de la tolérance d'un segment est alors
+        à moins d'un pas de l'un de ses échantillons : pour chaque segment d'au
+        plus max_length, les cases voisines de son début suffisent.
+        
+        Returns:
+            Ensemble de paires d'indices (i, j) avec i < j
+        """
+        cell = max(max_length, 2.0 * self.tolerance, 1e-9)
+        grid = {}
+        for index, entry in entries.items():
+            start, end = entry['seg']['start'], entry['seg']['end']
+            steps = max(1, int(math.ceil(entry['length'] / (cell / 2.0))))
+            cells = set()
+            for k in range(steps + 1):
+                t = k / steps
+                x = start.x + (end.x - start.x) * t
+                y = start.y + (end.y - start.y) * t
+                cells.add((int(math.floor(x / cell)), int(math.floor(y / cell))))
+            for key in cells:
+                grid.setdefault(key, []).append(index)
+        
+        candidates = set()
+        for index, entry in entries.items():
+            if entry['length'] > max_length:
+                continue
+            start = entry['seg']['start']
+            gx, gy = int(math.floor(start.x / cell)), int(math.floor(start.y / cell))
+            for nx in (gx - 1, gx, gx + 1):
+                for ny in (gy - 1, gy, gy + 1):
+                    for other in grid.get((nx, ny), ()):
+                        if other != index:
+                            candidates.add((min(index, other), max(index, other)))
+        return candidates
+    
+    def _find_overlapping_lines_in_group(self, indexed_segments: List[Tuple[int, Dict]]) -> List[OverlapInfo]:
+        """
+        Trouve les chevauchements dans un groupe de lignes de même couleur.
         
+        Les deux extrémités du plus court segment S doivent être à moins de la
+        tolérance de l'autre : pour un écart angulaire φ, |S|·sin φ ≤ 2·tolérance.
+        Les paires presque parallèles (φ ≤ _NEAR_PARALLEL_ANGLE) viennent de
+        l'index des droites canoniques ; les autres ont un segment plus court que
+        2·tolérance / sin(_NEAR_PARALLEL_ANGLE), recherché dans une grille : le
+        résultat est celui de la comparaison de toutes les paires.
+        
+        Args:
+            indexed_segments: Liste de tuples (indice d'origine, segment)
+            
+        Returns:
+            Liste des chevauchements, dans l'ordre des indices d'origine
+        """
+        if len(indexed_segments) < 2:
+            return []
+        
+        max_angle = max(self.angle_tolerance, _NEAR_PARALLEL_ANGLE)
+        candidates, entries = self._near_parallel_candidates(indexed_segments, max_angle)
+        max_length = 2.0 * self.tolerance / math.sin(min(max_angle, math.pi / 2))
+        candidates |= self._short_segment_candidates(entries, max_length)
+        
+        overlaps = []
+        tolerance = self.tolerance
+        for first_index, second_index in sorted(candidates):
+            first, second = entries[first_index], entries[second_index]
+            # Boîtes englobantes disjointes (à la tolérance près) : pas colinéaires
+            box1, box2 = first['bbox'], second['bbox']
+            if (box1[0] > box2[2] + tolerance or box2[0] > box1[2] + tolerance or
+                    box1[1] > box2[3] + tolerance or box2[1] > box1[3] + tolerance):
+                continue
+            if self._quick_overlap_ratio(first, second) < self.overlap_threshold - 1e-9:
+                continue
+            overlap = self._test_line_pair(first, second)
+            if overlap is not None:
+                overlaps.append(overlap)
         return overlaps
     
+    def _quick_overlap_ratio(self, first: Dict, second: Dict) -> float:
+        """
+        Ratio de chevauchement calculé sur les entrées d'index, sans objets.
+        
+        Même calcul que _calculate_overlap_ratio (projection sur la direction
+        du premier segment, rapporté au plus court) : sert de filtre rapide
+        avant les tests complets.
+        """
+        direction = first['direction']
+        min_len = min(first['length'], second['length'])
+        if direction is None or min_len == 0:
+            return 0.0
+        ux, uy = direction
+        origin = first['seg']['start']
+        p2_start = (second['seg']['start'].x - origin.x) * ux + (second['seg']['start'].y - origin.y) * uy
+        p2_end = (second['seg']['end'].x - origin.x) * ux + (second['seg']['end'].y - origin.y) * uy
+        overlap_len = min(first['length'], max(p2_start, p2_end)) - max(0.0, min(p2_start, p2_end))
+        return max(0.0, overlap_len) / min_len
+    
+    def _test_line_pair(self, first: Dict, second: Dict) -> Optional[OverlapInfo]:
+        """
+        Teste une paire candidate de l'index (colinéarité, ratio de chevauchement).
+        
+        Args:
+            first: Entrée d'index du segment de plus petit indice
+            second: Entrée d'index de l'autre segment
+            
+        Returns:
+            OverlapInfo si les segments se chevauchent assez, sinon None
+        """
+        seg1, seg2 = first['seg'], second['seg']
+        seg_obj1, seg_obj2 = first['segment'], second['segment']
+        
+        # Colinéarité : les deux extrémités du plus court près de l'autre segment
+        shorter, longer = ((seg_obj1, seg_obj2) if first['length'] <= second['length']
+                           else (seg_obj2, seg_obj1))
+        if (longer.point_to_segment_distance(shorter.start) >= self.tolerance or
+                longer.point_to_segment_distance(shorter.end) >= self.tolerance):
+            return None
+        
+        # Calculer le ratio de chevauchement
+        overlap_ratio = self._calculate_overlap_ratio(seg1, seg2)
+        if overlap_ratio < self.overlap_threshold:
+            return None
+        
+        # Déterminer les points de fusion
+        merge_start, merge_end = self._get_merge_points(seg1, seg2)
+        return OverlapInfo(
+            segment1_id=seg1['id'],
+            segment2_id=seg2['id'],
+            overlap_ratio=overlap_ratio,
+            merge_point1=merge_start,
+            merge_point2=merge_end
+        )
+    
     def _calculate_overlap_ratio(self, seg1: Dict, seg2: Dict) -> float:
         """
         Calcule le ratio de chevauchement entre deux segments colinéaires.
@@ -220,6 +476,11 @@ class DuplicateRemover:
         """
         Trouve les arcs superposés.
         
+        Les arcs sont comparés après conversion en paramétrisation centrée
+        (centre, rayons, rotation, intervalle angulaire) : deux arcs écrits
+        avec des paramètres différents mais équivalents sont détectés, ainsi
+        que les chevauchements partiels sur une même ellipse.
+        
         Args:
             arcs: Liste de dictionnaires avec clés 'id', 'start', 'end', 'arc_obj', 'color'
             
@@ -238,18 +499,54 @@ class DuplicateRemover:
                 
                 arc_obj1: Arc = arc1.get('arc_obj')
                 arc_obj2: Arc = arc2.get('arc_obj')
+                if not arc_obj1 or not arc_obj2:
+                    continue
                 
-                if arc_obj1 and arc_obj2 and arc_obj1.is_similar_to(arc_obj2, self.tolerance):
-                    overlaps.append(OverlapInfo(
-                        segment1_id=arc1['id'],
-                        segment2_id=arc2['id'],
-                        overlap_ratio=1.0,
-                        merge_point1=arc1['start'],
-                        merge_point2=arc1['end']
-                    ))
+                overlap_ratio = arc_obj1.overlap_ratio_with(arc_obj2, self.tolerance)
+                if overlap_ratio <= 0 or overlap_ratio < self.overlap_threshold:
+                    continue
+                
+                merge_start, merge_end = self._get_arc_merge_points(arc_obj1, arc_obj2)
+                overlaps.append(OverlapInfo(
+                    segment1_id=arc1['id'],
+                    segment2_id=arc2['id'],
+                    overlap_ratio=overlap_ratio,
+                    merge_point1=merge_start,
+                    merge_point2=merge_end
+                ))
         
         return overlaps
     
+    def _get_arc_merge_points(self, arc1: Arc, arc2: Arc) -> Tuple[Point, Point]:
+        """
+        Détermine les extrémités de l'union angulaire de deux arcs qui se chevauchent.
+        
+        Args:
+            arc1: Premier arc
+            arc2: Deuxième arc (même ellipse)
+            
+        Returns:
+            Tuple (point_début, point_fin) de l'arc couvrant les deux,
+            parcouru dans le sens trigonométrique
+        """
+        two_pi = 2.0 * math.pi
+        start1, span1 = arc1.angular_interval()
+        _, _, _, _, _, dtheta2 = arc2.to_center_parameterization()
+        # Début d'arc2 dans le sens trigonométrique, exprimé dans le repère d'arc1
+        first2 = arc2.start if dtheta2 >= 0 else arc2.end
+        offset2 = (arc1.angle_of_point(first2) - start1) % two_pi
+        span2 = abs(dtheta2)
+        
+        if offset2 > span1:
+            # arc2 commence après la fin d'arc1 : il recouvre son début en bouclant
+            offset2 -= two_pi
+        lo = min(0.0, offset2)
+        hi = max(span1, offset2 + span2)
+        if hi - lo >= two_pi - 1e-9:
+            # L'union fait le tour complet de l'ellipse
+            return arc1.start, arc1.start
+        return arc1.point_at_angle(start1 + lo), arc1.point_at_angle(start1 + hi)
+    
     def find_duplicate_bezier_curves(self, curves: List[Dict]) -> List[OverlapInfo]:
         """
         Trouve les courbes de Bézier superposées.
@@ -294,52 +591,82 @@ class DuplicateRemover:
     
     def _calculate_bezier_overlap(self, bezier1: BezierCurve, bezier2: BezierCurve) -> float:
         """
-        Calcule le ratio de chevauchement entre deux courbes de Bézier.
-        Compare les points de la courbe.
+        Calcule le ratio de chevauchement entre deux courbes de Bézier, sans échantillonnage.
+        
+        Les extrémités de chaque courbe sont projetées sur l'autre (Newton) pour
+        trouver la portion commune, puis les deux portions sont extraites par
+        subdivision de de Casteljau et leurs polygones de contrôle comparés
+        (après élévation au degré 3 et mise dans le même sens de parcours).
+        L'écart maximal entre points de contrôle homologues majore l'écart
+        entre les courbes : s'il est sous la tolérance, les portions sont confondues.
         
         Args:
             bezier1: Première courbe
             bezier2: Deuxième courbe
             
         Returns:
-            Ratio de chevauchement (0.0 à 1.0)
+            Ratio de chevauchement (0.0 à 1.0), rapporté à la courbe la plus courte
         """
+        tol = self.tolerance
         try:
-            # Échantillonner les deux courbes et comparer les points
-            samples = 50  # Beaucoup de points pour meilleure précision
-            matching_points = 0
-            
-            for i in range(samples + 1):
-                t = i / samples
-                
-                # Obtenir les points sur les deux courbes
-                p1 = bezier1.get_point_at(t)
-                p2 = bezier2.get_point_at(t)
-                
-                # Distance entre les points - tolérance TRÈS grande pour debugging
-                dist = p1.distance_to(p2)
-                
-                # Si les points sont proches, compter comme match
-                # Tolérance très grande pour permettre les duplicatas avec petites variations
-                distance_threshold = max(5.0, self.tolerance * 500)
-                if dist < distance_threshold:
-                    matching_points += 1
+            # Paramètres des extrémités de chaque courbe sur l'autre
+            t1s, d1s = bezier2.closest_parameter(bezier1.start)
+            t1e, d1e = bezier2.closest_parameter(bezier1.end)
+            t2s, d2s = bezier1.closest_parameter(bezier2.start)
+            t2e, d2e = bezier1.closest_parameter(bezier2.end)
             
-            # Calculer le ratio
-            overlap_ratio = matching_points / (samples + 1)
+            if d1s <= tol and d1e <= tol:
+                # bezier1 est contenue dans bezier2
+                part1, part2 = bezier1, bezier2.subcurve(t1s, t1e)
+            elif d2s <= tol and d2e <= tol:
+                # bezier2 est contenue dans bezier1
+                part1, part2 = bezier1.subcurve(t2s, t2e), bezier2
+            else:
+                # Chevauchement partiel : une extrémité de chaque courbe sur l'autre
+                on1 = [(t, p) for t, d, p in ((t2s, d2s, bezier2.start), (t2e, d2e, bezier2.end)) if d <= tol]
+                on2 = [(t, p) for t, d, p in ((t1s, d1s, bezier1.start), (t1e, d1e, bezier1.end)) if d <= tol]
+                if len(on1) != 1 or len(on2) != 1:
+                    return 0.0
+                # Portion de bezier1 entre l'extrémité de bezier2 et sa propre extrémité
+                u_other, _ = on1[0]
+                t_own_end = 0.0 if on2[0][1] is bezier1.start else 1.0
+                part1 = bezier1.subcurve(u_other, t_own_end)
+                # Portion homologue de bezier2, parcourue dans le même sens
+                v_end, _ = on2[0]
+                v_own = 0.0 if on1[0][1] is bezier2.start else 1.0
+                part2 = bezier2.subcurve(v_own, v_end)
             
-            # Si au moins 90% des points correspondent, c'est un chevauchement complet
-            if overlap_ratio >= 0.90:
-                return 1.0
+            if not self._same_bezier_geometry(part1, part2):
+                return 0.0
             
-            # Si au moins 10%, c'est un chevauchement partiel (très permissif)
-            elif overlap_ratio >= 0.1:
-                return overlap_ratio
-            
-            return 0.0
-        except Exception as e:
+            overlap_len = part1.length(tol / 10.0)
+            min_len = min(bezier1.length(tol / 10.0), bezier2.length(tol / 10.0))
+            if min_len <= 0 or overlap_len <= tol:
+                return 0.0
+            overlap_ratio = min(1.0, overlap_len / min_len)
+            return 1.0 if overlap_ratio >= 0.99 else overlap_ratio
+        except Exception:
             return 0.0
     
+    def _same_bezier_geometry(self, part1: BezierCurve, part2: BezierCurve) -> bool:
+        """
+        Vérifie que deux portions de Bézier sont confondues à la tolérance près.
+        
+        Les polygones de contrôle sont comparés dans les deux sens de parcours.
+        Deux portions quasi rectilignes sont comparées comme des segments : leurs
+        points de contrôle peuvent différer le long de la corde sans changer la forme.
+        """
+        tol = self.tolerance
+        if min(part1.max_control_distance(part2),
+               part1.max_control_distance(part2.reversed())) <= tol:
+            return True
+        if part1.flatness() <= tol and part2.flatness() <= tol:
+            return ((part1.start.distance_to(part2.start) <= tol and
+                     part1.end.distance_to(part2.end) <= tol) or
+                    (part1.start.distance_to(part2.end) <= tol and
+                     part1.end.distance_to(part2.start) <= tol))
+        return False
+    
     def find_all_duplicates(self, lines: List[Dict] = None,
                            arcs: List[Dict] = None,
                            curves: List[Dict] = None) -> Dict[str, List[OverlapInfo]]:
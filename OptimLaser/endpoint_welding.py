@@ -0,0 +1,69 @@
+"""
+Module de soudure des extrémités - Sommets partagés par les extrémités proches
+
+Avant la fusion, chaque extrémité de chemin reçoit l'identifiant entier du
+sommet auquel elle est soudée : deux extrémités distantes de moins de la
+tolérance partagent le même sommet. Les fusions comparent ensuite des entiers,
+au lieu de coordonnées arrondies qui séparent deux points très proches situés
+de part et d'autre d'une limite d'arrondi.
+
+Une grille de hachage dont le pas vaut la tolérance limite la recherche aux
+3 × 3 cellules voisines du point. La soudure est gloutonne : le premier point
+d'un sommet en est le représentant, et un point n'est soudé qu'à un
+représentant situé à moins de la tolérance (pas d'enchaînement de proche en
+proche qui relierait des points éloignés).
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+__all__ = ['EndpointWelder']
+
+Point = Tuple[float, float]
+
+
+class EndpointWelder:
+    """
+    Attribution de sommets soudés aux extrémités de chemins.
+
+    Utilisation :
+        soudure = EndpointWelder(tolerance)
+        a = soudure.vertex(debut)      # identifiant entier du sommet
+        b = soudure.vertex(fin)
+        soudure.points[a]              # représentant du sommet
+    """
+
+    def __init__(self, tolerance: float):
+        """
+        Args:
+            tolerance: Distance maximale entre un point et le représentant de son sommet
+        """
+        self.tolerance = max(0.0, float(tolerance))
+        self._cell = max(self.tolerance, 1e-6)
+        # Représentant de chaque sommet, par identifiant
+        self.points: List[Point] = []
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        # Points déjà soudés : un même point garde toujours le même sommet
+        self._known: Dict[Point, int] = {}
+
+    def vertex(self, point: Point) -> int:
+        """Identifiant du sommet auquel point est soudé (créé s'il n'y en a aucun)."""
+        found = self._known.get(point)
+        if found is not None:
+            return found
+        x, y = point
+        cx, cy = int(math.floor(x / self._cell)), int(math.floor(y / self._cell))
+        best_distance = self.tolerance
+        grid, points = self._grid, self.points
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for candidate in grid.get((gx, gy), ()):
+                    distance = math.dist(point, points[candidate])
+                    if distance <= best_distance and (found is None or distance < best_distance):
+                        found, best_distance = candidate, distance
+        if found is None:
+            found = len(points)
+            points.append(point)
+            grid.setdefault((cx, cy), []).append(found)
+        self._known[point] = found
+        return found
@@ -6,7 +6,7 @@ géométriques : points, vecteurs, segments, arcs et courbes de Bézier.
 """
 
 import math
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from dataclasses import dataclass
 
 __all__ = ['Point', 'Vector', 'Segment', 'Arc', 'BezierCurve']
@@ -295,38 +295,233 @@ class Arc:
         self.large_arc = large_arc
         self.sweep = sweep
     
-    def is_similar_to(self, other: 'Arc', tolerance: float = 0.01) -> bool:
+    def to_center_parameterization(self) -> Tuple[Point, float, float, float, float, float]:
         """
-        Vérifie si deux arcs sont similaires (mêmes extrémités et propriétés proches).
+        Convertit l'arc en paramétrisation centrée (spec SVG §F.6.5).
+        
+        Les rayons trop petits pour relier les deux extrémités sont agrandis
+        comme le fait le moteur de rendu.
+        
+        Returns:
+            Tuple (centre, rx, ry, phi en radians, theta1, dtheta) où dtheta
+            est signé (négatif si l'arc tourne dans le sens horaire)
+        """
+        x1, y1 = self.start.x, self.start.y
+        x2, y2 = self.end.x, self.end.y
+        rx, ry = abs(self.rx), abs(self.ry)
+        phi = math.radians(self.x_axis_rotation)
+        cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+        
+        if abs(x1 - x2) < 1e-12 and abs(y1 - y2) < 1e-12:
+            return Point(x1, y1), rx, ry, phi, 0.0, 0.0
+        
+        dx2 = (x1 - x2) / 2.0
+        dy2 = (y1 - y2) / 2.0
+        x1p = cos_phi * dx2 + sin_phi * dy2
+        y1p = -sin_phi * dx2 + cos_phi * dy2
+        
+        # Correction des rayons trop petits
+        lam = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+        if lam > 1.0:
+            sq_lam = math.sqrt(lam)
+            rx *= sq_lam
+            ry *= sq_lam
+        
+        rx2, ry2 = rx * rx, ry * ry
+        num = max(0.0, rx2 * ry2 - rx2 * y1p * y1p - ry2 * x1p * x1p)
+        den = rx2 * y1p * y1p + ry2 * x1p * x1p
+        coef = math.sqrt(num / den) if den > 1e-18 else 0.0
+        if bool(self.large_arc) == bool(self.sweep):
+            coef = -coef
+        
+        cxp = coef * rx * y1p / ry
+        cyp = -coef * ry * x1p / rx
+        cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2.0
+        cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2.0
+        
+        theta1 = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+        theta2 = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx)
+        dtheta = theta2 - theta1
+        if self.sweep and dtheta < 0:
+            dtheta += 2.0 * math.pi
+        elif not self.sweep and dtheta > 0:
+            dtheta -= 2.0 * math.pi
+        
+        return Point(cx, cy), rx, ry, phi, theta1, dtheta
+    
+    def canonical_form(self, tolerance: float = 0.01) -> Tuple[Point, float, float, float, float, float]:
+        """
+        Retourne une forme canonique de l'ellipse porteuse et de l'intervalle angulaire.
+        
+        L'ellipse est normalisée (rx ≥ ry, rotation dans [0, π)) et l'arc est
+        décrit par un angle de départ dans [0, 2π) et une étendue positive,
+        ce qui rend comparables deux arcs écrits avec des paramètres différents
+        (sens de parcours, drapeaux, rayons permutés). Pour un cercle, la
+        rotation est absorbée dans l'angle de départ.
         
         Args:
-            other: L'autre arc
-            tolerance: Tolérance relative pour les rayons
+            tolerance: Écart de rayons en dessous duquel l'ellipse est un cercle
             
         Returns:
-            True si les arcs sont similaires
+            Tuple (centre, rx, ry, rotation, angle de départ, étendue)
         """
-        # Vérifier les extrémités
-        start_dist = self.start.distance_to(other.start)
-        end_dist = self.end.distance_to(other.end)
+        center, rx, ry, phi, theta1, dtheta = self.to_center_parameterization()
+        if dtheta < 0:
+            theta1, dtheta = theta1 + dtheta, -dtheta
+        
+        if abs(rx - ry) <= tolerance:
+            radius = (rx + ry) / 2.0
+            return center, radius, radius, 0.0, (theta1 + phi) % (2.0 * math.pi), dtheta
+        
+        if rx < ry:
+            # Permuter les axes : rotation +90° et décalage angulaire de -90°
+            rx, ry = ry, rx
+            phi += math.pi / 2.0
+            theta1 -= math.pi / 2.0
+        # Une ellipse est symétrique par rotation de 180° (angle paramétrique +π)
+        turns = math.floor(phi / math.pi)
+        phi -= turns * math.pi
+        theta1 += turns * math.pi
+        return center, rx, ry, phi, theta1 % (2.0 * math.pi), dtheta
+    
+    def point_at_angle(self, theta: float) -> Point:
+        """
+        Retourne le point de l'ellipse porteuse à l'angle paramétrique theta.
         
-        if start_dist > tolerance * 10 or end_dist > tolerance * 10:
+        Args:
+            theta: Angle paramétrique en radians (repère de to_center_parameterization)
+            
+        Returns:
+            Le point correspondant
+        """
+        center, rx, ry, phi, _, _ = self.to_center_parameterization()
+        cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        return Point(center.x + rx * cos_phi * cos_t - ry * sin_phi * sin_t,
+                     center.y + rx * sin_phi * cos_t + ry * cos_phi * sin_t)
+    
+    def angular_interval(self) -> Tuple[float, float]:
+        """
+        Retourne l'intervalle angulaire parcouru, dans le sens trigonométrique.
+        
+        Returns:
+            Tuple (angle de départ, étendue positive) en radians
+        """
+        _, _, _, _, theta1, dtheta = self.to_center_parameterization()
+        if dtheta < 0:
+            return theta1 + dtheta, -dtheta
+        return theta1, dtheta
+    
+    def angle_of_point(self, point: Point) -> float:
+        """
+        Retourne l'angle paramétrique d'un point de l'ellipse porteuse.
+        
+        Args:
+            point: Point situé (à peu près) sur l'ellipse
+            
+        Returns:
+            Angle en radians, dans le repère de to_center_parameterization
+        """
+        center, rx, ry, phi, _, _ = self.to_center_parameterization()
+        cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+        dx, dy = point.x - center.x, point.y - center.y
+        return math.atan2((-sin_phi * dx + cos_phi * dy) / ry,
+                          (cos_phi * dx + sin_phi * dy) / rx)
+    
+    def shares_ellipse_with(self, other: 'Arc', tolerance: float = 0.01) -> bool:
+        """
+        Vérifie si deux arcs sont portés par la même ellipse (à la tolérance près).
+        
+        Args:
+            other: L'autre arc
+            tolerance: Tolérance absolue sur le centre, les rayons et la rotation
+            
+        Returns:
+            True si les ellipses porteuses coïncident
+        """
+        c1, rx1, ry1, phi1, _, _ = self.canonical_form(tolerance)
+        c2, rx2, ry2, phi2, _, _ = other.canonical_form(tolerance)
+        if c1.distance_to(c2) > tolerance:
+            return False
+        if abs(rx1 - rx2) > tolerance or abs(ry1 - ry2) > tolerance:
             return False
+        # Écart de rotation converti en déplacement au bout du grand axe
+        rot_diff = abs(phi1 - phi2) % math.pi
+        rot_diff = min(rot_diff, math.pi - rot_diff)
+        return rot_diff * max(rx1, rx2) <= tolerance
+    
+    def angular_overlap_with(self, other: 'Arc', tolerance: float = 0.01) -> float:
+        """
+        Calcule l'étendue angulaire commune de deux arcs d'une même ellipse.
         
-        # Vérifier les rayons (tolérance relative)
-        rx_diff = abs(self.rx - other.rx) / max(self.rx, other.rx, 0.001)
-        ry_diff = abs(self.ry - other.ry) / max(self.ry, other.ry, 0.001)
+        Args:
+            other: L'autre arc (supposé porté par la même ellipse)
+            tolerance: Tolérance utilisée pour la forme canonique
+            
+        Returns:
+            Angle commun en radians (0 si les intervalles sont disjoints)
+        """
+        _, _, _, _, start1, span1 = self.canonical_form(tolerance)
+        _, _, _, _, start2, span2 = other.canonical_form(tolerance)
+        two_pi = 2.0 * math.pi
+        # Se placer dans le repère où l'intervalle 1 commence à 0
+        offset = (start2 - start1) % two_pi
+        common = 0.0
+        for lo in (offset, offset - two_pi):
+            common += max(0.0, min(span1, lo + span2) - max(0.0, lo))
+        return min(common, span1, span2)
+    
+    def overlap_ratio_with(self, other: 'Arc', tolerance: float = 0.01) -> float:
+        """
+        Calcule le ratio de chevauchement avec un autre arc, sans échantillonnage.
         
-        # Vérifier la rotation
-        rot_diff = abs(self.x_axis_rotation - other.x_axis_rotation) % 360
-        rot_diff = min(rot_diff, 360 - rot_diff)
+        Les deux arcs doivent partager la même ellipse ; le ratio est l'angle
+        commun rapporté à l'étendue du plus court. Un simple contact aux
+        extrémités (angle commun inférieur à la tolérance) ne compte pas.
         
-        # Vérifier les flags
-        flags_same = (self.large_arc == other.large_arc and
-                     self.sweep == other.sweep)
+        Args:
+            other: L'autre arc
+            tolerance: Tolérance spatiale absolue
+            
+        Returns:
+            Ratio entre 0 et 1
+        """
+        if not self.shares_ellipse_with(other, tolerance):
+            return 0.0
+        _, rx, _, _, _, span1 = self.canonical_form(tolerance)
+        _, _, _, _, _, span2 = other.canonical_form(tolerance)
+        shortest = min(span1, span2)
+        if shortest <= 0:
+            return 0.0
+        common = self.angular_overlap_with(other, tolerance)
+        if common * max(rx, 1e-9) <= tolerance:
+            return 0.0
+        return min(1.0, common / shortest)
+    
+    def is_similar_to(self, other: 'Arc', tolerance: float = 0.01) -> bool:
+        """
+        Vérifie si deux arcs sont géométriquement identiques.
+        
+        La comparaison se fait après conversion en paramétrisation centrée :
+        même ellipse porteuse et même intervalle angulaire, quel que soit le
+        sens de parcours ou l'écriture des paramètres (drapeaux, rayons).
         
-        return (rx_diff < tolerance and ry_diff < tolerance and
-                rot_diff < 5.0 and flags_same)
+        Args:
+            other: L'autre arc
+            tolerance: Tolérance spatiale absolue
+            
+        Returns:
+            True si les arcs sont similaires
+        """
+        if not self.shares_ellipse_with(other, tolerance):
+            return False
+        _, rx, _, _, _, span1 = self.canonical_form(tolerance)
+        _, _, _, _, _, span2 = other.canonical_form(tolerance)
+        radius = max(rx, 1e-9)
+        if abs(span1 - span2) * radius > tolerance:
+            return False
+        common = self.angular_overlap_with(other, tolerance)
+        return (max(span1, span2) - common) * radius <= tolerance
     
     def __repr__(self):
         return f"Arc({self.start} → {self.end}, rx={self.rx:.1f}, ry={self.ry:.1f})"
@@ -443,6 +638,158 @@ class BezierCurve:
         return [self.get_point_at(i / (num_samples - 1))
                 for i in range(num_samples)]
     
+    def control_points(self) -> List[Point]:
+        """
+        Retourne les points de contrôle sous forme cubique.
+        
+        Une courbe quadratique est élevée au degré 3 (même géométrie), ce qui
+        permet de comparer directement les polygones de contrôle des deux types.
+        
+        Returns:
+            Liste [P0, P1, P2, P3]
+        """
+        if not self.is_quadratic:
+            return [self.start, self.control1, self.control2, self.end]
+        c = self.control1
+        return [
+            self.start,
+            Point(self.start.x + 2.0 / 3.0 * (c.x - self.start.x),
+                  self.start.y + 2.0 / 3.0 * (c.y - self.start.y)),
+            Point(self.end.x + 2.0 / 3.0 * (c.x - self.end.x),
+                  self.end.y + 2.0 / 3.0 * (c.y - self.end.y)),
+            self.end,
+        ]
+    
+    @staticmethod
+    def _split_points(points: List[Point], t: float) -> Tuple[List[Point], List[Point]]:
+        """Subdivise un polygone de contrôle en t (algorithme de de Casteljau)."""
+        left = [points[0]]
+        right = [points[-1]]
+        current = list(points)
+        while len(current) > 1:
+            current = [Point(a.x + t * (b.x - a.x), a.y + t * (b.y - a.y))
+                       for a, b in zip(current, current[1:])]
+            left.append(current[0])
+            right.append(current[-1])
+        return left, right[::-1]
+    
+    def subcurve(self, t0: float, t1: float) -> 'BezierCurve':
+        """
+        Extrait la portion de courbe entre t0 et t1 (sous forme cubique).
+        
+        Si t0 > t1, la portion est retournée parcourue en sens inverse.
+        
+        Args:
+            t0: Paramètre de départ
+            t1: Paramètre d'arrivée
+            
+        Returns:
+            La sous-courbe
+        """
+        lo, hi = min(t0, t1), max(t0, t1)
+        points = self.control_points()
+        if hi < 1.0:
+            points, _ = self._split_points(points, hi)
+        if lo > 0.0 and hi > 0.0:
+            _, points = self._split_points(points, lo / hi)
+        if t0 > t1:
+            points = points[::-1]
+        return BezierCurve(points[0], points[3], points[1], points[2])
+    
+    def reversed(self) -> 'BezierCurve':
+        """Retourne la même courbe parcourue en sens inverse."""
+        if self.is_quadratic:
+            return BezierCurve(self.end, self.start, self.control1)
+        return BezierCurve(self.end, self.start, self.control2, self.control1)
+    
+    def length(self, tolerance: float = 0.01) -> float:
+        """
+        Longueur de la courbe par subdivision adaptative (estimation de Gravesen).
+        
+        Args:
+            tolerance: Écart maximal toléré entre polygone de contrôle et corde
+            
+        Returns:
+            La longueur de la courbe
+        """
+        stack = [(self.control_points(), 0)]
+        total = 0.0
+        while stack:
+            points, depth = stack.pop()
+            chord = points[0].distance_to(points[-1])
+            polygon = sum(a.distance_to(b) for a, b in zip(points, points[1:]))
+            if polygon - chord <= tolerance or depth >= 16:
+                total += (chord + polygon) / 2.0
+            else:
+                left, right = self._split_points(points, 0.5)
+                stack.append((left, depth + 1))
+                stack.append((right, depth + 1))
+        return total
+    
+    def closest_parameter(self, point: Point) -> Tuple[float, float]:
+        """
+        Trouve le paramètre du point de la courbe le plus proche de `point`.
+        
+        Les valeurs de départ sont les projections du point sur chaque côté du
+        polygone de contrôle, affinées ensuite par la méthode de Newton sur
+        (B(t) - P)·B'(t) = 0.
+        
+        Args:
+            point: Le point à projeter
+            
+        Returns:
+            Tuple (t, distance)
+        """
+        points = self.control_points()
+        seeds = [0.0, 1.0]
+        legs = len(points) - 1
+        for i, (a, b) in enumerate(zip(points, points[1:])):
+            vx, vy = b.x - a.x, b.y - a.y
+            len_sq = vx * vx + vy * vy
+            u = 0.0 if len_sq == 0 else max(0.0, min(1.0, ((point.x - a.x) * vx + (point.y - a.y) * vy) / len_sq))
+            seeds.append((i + u) / legs)
+        
+        p0, p1, p2, p3 = points
+        cubic = BezierCurve(p0, p3, p1, p2)
+        best_t, best_d = 0.0, float('inf')
+        for t in seeds:
+            for _ in range(12):
+                mt = 1.0 - t
+                bx = mt ** 3 * p0.x + 3 * mt * mt * t * p1.x + 3 * mt * t * t * p2.x + t ** 3 * p3.x
+                by = mt ** 3 * p0.y + 3 * mt * mt * t * p1.y + 3 * mt * t * t * p2.y + t ** 3 * p3.y
+                d1x = 3 * mt * mt * (p1.x - p0.x) + 6 * mt * t * (p2.x - p1.x) + 3 * t * t * (p3.x - p2.x)
+                d1y = 3 * mt * mt * (p1.y - p0.y) + 6 * mt * t * (p2.y - p1.y) + 3 * t * t * (p3.y - p2.y)
+                d2x = 6 * mt * (p2.x - 2 * p1.x + p0.x) + 6 * t * (p3.x - 2 * p2.x + p1.x)
+                d2y = 6 * mt * (p2.y - 2 * p1.y + p0.y) + 6 * t * (p3.y - 2 * p2.y + p1.y)
+                ex, ey = bx - point.x, by - point.y
+                f = ex * d1x + ey * d1y
+                df = d1x * d1x + d1y * d1y + ex * d2x + ey * d2y
+                if abs(df) < 1e-18:
+                    break
+                step = f / df
+                t = max(0.0, min(1.0, t - step))
+                if abs(step) < 1e-12:
+                    break
+            d = cubic.get_point_at(t).distance_to(point)
+            if d < best_d:
+                best_t, best_d = t, d
+        return best_t, best_d
+    
+    def max_control_distance(self, other: 'BezierCurve') -> float:
+        """
+        Distance maximale entre points de contrôle homologues (forme cubique).
+        
+        C'est un majorant de la distance entre les deux courbes pour un même
+        paramètre t : si elle est inférieure à la tolérance, les courbes sont
+        confondues à la tolérance près.
+        """
+        return max(a.distance_to(b) for a, b in zip(self.control_points(), other.control_points()))
+    
+    def flatness(self) -> float:
+        """Distance maximale des points de contrôle intérieurs à la corde."""
+        points = self.control_points()
+        return max(Segment(points[0], points[-1]).point_to_segment_distance(p) for p in points[1:-1])
+    
     def is_similar_to(self, other: 'BezierCurve', tolerance: float = 0.01) -> bool:
         """
         Vérifie si deux courbes de Bézier sont similaires.
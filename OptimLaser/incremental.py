@@ -0,0 +1,277 @@
+"""
+Module incrémental - Réoptimisation limitée aux zones modifiées d'un dessin
+
+Les segments simples issus du découpage sont regroupés en zones : deux segments
+dont les boîtes englobantes, élargies de la tolérance, se touchent appartiennent
+à la même zone. Doublons et fusions ne relient jamais deux segments de zones
+différentes ; le résultat d'une zone ne dépend donc que de ses propres segments.
+
+Une zone est identifiée par l'empreinte de ses segments (tracé et style). D'un
+passage à l'autre, les zones dont l'empreinte est inchangée reprennent leurs
+chemins fusionnés tels quels ; seules les zones nouvelles ou modifiées sont
+recalculées. L'ordre de découpe précédent est ensuite réparé localement :
+insertion au meilleur endroit des chemins nouveaux, puis 2-opt limité au
+voisinage des modifications.
+"""
+
+import hashlib
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .cancellation import DeadlineExceeded
+except ImportError:
+    from cancellation import DeadlineExceeded
+
+__all__ = ['SegmentClusters', 'path_key', 'zone_signature', 'repair_tour']
+
+Box = Tuple[float, float, float, float]
+Point = Tuple[float, float]
+
+# Nombre maximal de cellules de grille couvertes par une boîte ; au-delà, la boîte
+# est comparée à toutes les autres (grands segments traversant la feuille)
+MAX_CELLS = 4096
+
+
+def path_key(d: str, style: str) -> str:
+    """Empreinte d'un chemin : tracé et style (la direction compte)."""
+    return hashlib.sha1(f"{d}\x00{style}".encode('utf-8')).hexdigest()[:20]
+
+
+def zone_signature(keys) -> str:
+    """Empreinte d'une zone : multiensemble des empreintes de ses segments."""
+    digest = hashlib.sha1()
+    for key in sorted(keys):
+        digest.update(key.encode('ascii'))
+    return digest.hexdigest()
+
+
+def _overlap(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class SegmentClusters:
+    """
+    Regroupement en zones de segments dont les boîtes élargies se touchent.
+
+    Une grille régulière limite les comparaisons aux boîtes voisines. La
+    relation est transitive (union-find) : une zone est une composante connexe.
+
+    Utilisation :
+        clusters = SegmentClusters(boites, marge=tolerance)
+        clusters.labels()          # numéro de zone de chaque segment
+        clusters.locate((x, y))    # zone contenant un point, ou None
+    """
+
+    def __init__(self, boxes: Sequence[Box], margin: float):
+        """
+        Regroupe les segments.
+
+        Args:
+            boxes: Boîte (xmin, ymin, xmax, ymax) de chaque segment
+            margin: Élargissement des boîtes (tolérance de détection des doublons)
+        """
+        margin = max(0.0, float(margin))
+        self.boxes: List[Box] = [(b[0] - margin, b[1] - margin, b[2] + margin, b[3] + margin)
+                                 for b in boxes]
+        self._parent = list(range(len(self.boxes)))
+        # Cellule de la taille d'un segment typique (médiane)
+        sizes = sorted(max(b[2] - b[0], b[3] - b[1]) for b in self.boxes)
+        self.cell = max(sizes[len(sizes) // 2] if sizes else 1.0, 1e-6)
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        self._large: List[int] = []
+        self._build()
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, i: int, j: int):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self._parent[max(ri, rj)] = min(ri, rj)
+
+    def _cells(self, box: Box):
+        cell = self.cell
+        x0, y0 = int(math.floor(box[0] / cell)), int(math.floor(box[1] / cell))
+        x1, y1 = int(math.floor(box[2] / cell)), int(math.floor(box[3] / cell))
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_CELLS:
+            return None
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def _build(self):
+        boxes = self.boxes
+        grid = self._grid
+        for i, box in enumerate(boxes):
+            cells = self._cells(box)
+            if cells is None:
+                self._large.append(i)
+                continue
+            for cell in cells:
+                members = grid.setdefault(cell, [])
+                for j in members:
+                    if self._find(i) != self._find(j) and _overlap(box, boxes[j]):
+                        self._union(i, j)
+                members.append(i)
+        for i in self._large:
+            box = boxes[i]
+            for j in range(len(boxes)):
+                if j != i and self._find(i) != self._find(j) and _overlap(box, boxes[j]):
+                    self._union(i, j)
+
+    def labels(self) -> List[int]:
+        """Numéro de zone de chaque segment (numérotation dans l'ordre des segments)."""
+        numbers: Dict[int, int] = {}
+        return [numbers.setdefault(self._find(i), len(numbers)) for i in range(len(self.boxes))]
+
+    def locate(self, point: Point) -> Optional[int]:
+        """
+        Retourne le représentant de la zone dont une boîte contient point.
+
+        Deux boîtes qui contiennent le même point se touchent : le résultat ne
+        dépend pas de la boîte trouvée. None si le point est hors de toute zone.
+        """
+        cell = (int(math.floor(point[0] / self.cell)), int(math.floor(point[1] / self.cell)))
+        x, y = point
+        for i in self._grid.get(cell, []) + self._large:
+            box = self.boxes[i]
+            if box[0] <= x <= box[2] and box[1] <= y <= box[3]:
+                return self._find(i)
+        return None
+
+    def root(self, i: int) -> int:
+        """Représentant de la zone du segment i (comparable au résultat de locate)."""
+        return self._find(i)
+
+
+def _insertion_cost(order: List[Dict], pos: int, start: Point, end: Point, origin: Point,
+                    distance: Callable[[Point, Point], float] = math.dist) -> float:
+    """Surcoût à vide de l'insertion d'un chemin (start → end) avant order[pos]."""
+    prev_end = origin if pos == 0 else order[pos - 1]['end']
+    cost = distance(prev_end, start)
+    if pos < len(order):
+        next_start = order[pos]['start']
+        cost += distance(end, next_start) - distance(prev_end, next_start)
+    return cost
+
+
+def repair_tour(items: List[Dict], previous: List[Sequence], origin: Point,
+                flip: Callable[[Dict], None], tick: Callable[[], None] = lambda: None,
+                advance: Callable[..., None] = lambda n=1: None,
+                radius: int = 25, max_passes: int = 50,
+                distance: Callable[[Point, Point], float] = math.dist) -> Tuple[List[Dict], int]:
+    """
+    Répare l'ordre de découpe précédent d'un groupe-couleur.
+
+    Les chemins déjà présents reprennent leur rang et leur sens précédents ; les
+    nouveaux sont insérés là où ils allongent le moins le trajet à vide. Un 2-opt
+    limité à radius rangs autour des insertions et des suppressions affine le tout.
+
+    Args:
+        items: path_infos du groupe (clés 'key', 'start', 'end', 'is_closed')
+        previous: Ordre précédent du groupe : [(empreinte, inversé), ...]
+        origin: Position de la tête au début du groupe
+        flip: Inverse le sens d'un chemin (start/end et drapeau)
+        tick: Point de contrôle d'annulation
+        advance: Signale des chemins placés
+        radius: Demi-largeur des fenêtres de 2-opt autour des modifications
+        max_passes: Nombre maximal de passes 2-opt par fenêtre
+        distance: Coût d'un saut à vide entre deux points (perçage éventuel compris)
+
+    Returns:
+        (ordre réparé, nombre de chemins insérés)
+    """
+    slots: Dict[str, List[Tuple[int, bool]]] = {}
+    for rank, (key, reversed_) in enumerate(previous):
+        slots.setdefault(key, []).append((rank, bool(reversed_)))
+
+    kept, new = [], []
+    for item in items:
+        free = slots.get(item['key'])
+        if free:
+            rank, reversed_ = free.pop(0)
+            kept.append((rank, reversed_, item))
+        else:
+            new.append(item)
+    kept.sort(key=lambda entry: entry[0])
+
+    # Ordre précédent ; un chemin qui suit un chemin supprimé est une modification
+    order: List[Dict] = []
+    changed = []
+    last_rank = -1
+    for rank, reversed_, item in kept:
+        if reversed_:
+            flip(item)
+        if rank != last_rank + 1:
+            changed.append(item)
+        order.append(item)
+        last_rank = rank
+    advance(len(order))
+
+    # Insertion des nouveaux chemins au meilleur endroit
+    inserted = 0
+    try:
+        for item in new:
+            tick()
+            best_pos, best_cost, best_flip = len(order), float('inf'), False
+            for pos in range(len(order) + 1):
+                cost = _insertion_cost(order, pos, item['start'], item['end'], origin, distance)
+                if cost < best_cost:
+                    best_pos, best_cost, best_flip = pos, cost, False
+                if not item['is_closed']:
+                    cost = _insertion_cost(order, pos, item['end'], item['start'], origin, distance)
+                    if cost < best_cost:
+                        best_pos, best_cost, best_flip = pos, cost, True
+            if best_flip:
+                flip(item)
+            order.insert(best_pos, item)
+            changed.append(item)
+            inserted += 1
+            advance()
+    except DeadlineExceeded:
+        # Délai écoulé : les chemins non insérés sont découpés en fin de groupe
+        order.extend(new[inserted:])
+        return order, inserted
+
+    # 2-opt (même critère que la stratégie « Optimisation locale ») sur des fenêtres
+    # fusionnées autour des modifications
+    n = len(order)
+    if n < 3 or not changed:
+        return order, inserted
+    index = {id(item): pos for pos, item in enumerate(order)}
+    windows = []
+    for pos in sorted(index[id(item)] for item in changed):
+        lo, hi = max(0, pos - radius), min(n - 1, pos + radius)
+        if windows and lo <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], hi)
+        else:
+            windows.append([lo, hi])
+
+    try:
+        for lo, hi in windows:
+            improved, passes = True, 0
+            while improved and passes < max_passes:
+                improved = False
+                passes += 1
+                for i in range(max(lo - 1, 0), hi):
+                    tick()
+                    for j in range(i + 2, hi + 1):
+                        end_i = order[i]['end']
+                        old_d1 = distance(end_i, order[i + 1]['start'])
+                        new_d1 = distance(end_i, order[j]['start'])
+                        if j < n - 1:
+                            start_j1 = order[j + 1]['start']
+                            old_d2 = distance(order[j]['end'], start_j1)
+                            new_d2 = distance(order[i + 1]['end'], start_j1)
+                        else:
+                            old_d2 = new_d2 = 0.0
+                        if (new_d1 + new_d2) < (old_d1 + old_d2) - 0.01:
+                            order[i + 1:j + 1] = order[i + 1:j + 1][::-1]
+                            improved = True
+    except DeadlineExceeded:
+        # Délai écoulé : l'ordre courant reste valide
+        pass
+    return order, inserted
@@ -0,0 +1,328 @@
+"""
+Module d'export machine - G-code (GRBL) et HPGL écrits directement depuis l'ordre de découpe
+
+Les tracés du fichier de découpe sont écrits dans l'ordre et le sens choisis
+par l'optimisation, sans passer par un document : chaque commande est écrite
+dans le flux dès qu'elle est lue. Les arcs de cercle deviennent des G2/G3 en
+G-code ; les arcs elliptiques et les courbes de Bézier sont linéarisés avec une
+tolérance donnée.
+
+Les coordonnées machine sont en mm, origine en bas à gauche de la page (l'axe
+Y du SVG est inversé).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Tuple
+
+try:
+    from .path_data import ARITY
+except ImportError:
+    from path_data import ARITY
+
+__all__ = ['CutSettings', 'MachineWriter', 'GcodeWriter', 'HpglWriter', 'write_tour',
+           'EXPORT_FORMATS']
+
+Point = Tuple[float, float]
+
+
+@dataclass(frozen=True)
+class CutSettings:
+    """
+    Réglages de découpe d'une couleur.
+
+    Attributes:
+        speed (float): Vitesse de découpe (mm/s)
+        power (float): Puissance du laser (% de la puissance maximale)
+        pierce_time (float): Durée du perçage au début de chaque tracé (s)
+    """
+    speed: float
+    power: float = 100.0
+    pierce_time: float = 0.0
+
+
+def _number(value: float, decimals: int = 3) -> str:
+    text = '{:.{}f}'.format(value, decimals).rstrip('0').rstrip('.')
+    return '0' if text in ('-0', '') else text
+
+
+class MachineWriter:
+    """
+    Écriture d'un parcours de découpe pour une machine.
+
+    Les méthodes reçoivent des coordonnées machine (mm). Les sous-classes
+    écrivent l'en-tête, les déplacements à vide, les segments et, si le format
+    les connaît, les arcs de cercle.
+    """
+
+    # Extension du fichier produit
+    extension = ''
+    # True si le format sait tracer un arc de cercle
+    supports_arcs = False
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: Flux texte de sortie
+        """
+        self.stream = stream
+        self.position: Optional[Point] = None
+
+    def begin(self):
+        """En-tête du programme."""
+
+    def end(self):
+        """Fin du programme."""
+
+    def set_cut(self, settings: CutSettings, label: str = ''):
+        """Réglages des tracés suivants (label : couleur, pour les commentaires)."""
+
+    def travel(self, x: float, y: float):
+        """Déplacement laser éteint."""
+        raise NotImplementedError
+
+    def line(self, x: float, y: float):
+        """Segment de découpe jusqu'à (x, y)."""
+        raise NotImplementedError
+
+    def arc(self, x: float, y: float, cx: float, cy: float, clockwise: bool):
+        """Arc de cercle jusqu'à (x, y), de centre (cx, cy) (si supports_arcs)."""
+        raise NotImplementedError
+
+
+class GcodeWriter(MachineWriter):
+    """
+    G-code pour GRBL en mode laser (M4 : puissance proportionnelle à la vitesse
+    réelle, laser éteint pendant les G0).
+    """
+
+    extension = '.gcode'
+    supports_arcs = True
+
+    def __init__(self, stream, max_power: int = 1000):
+        """
+        Args:
+            stream: Flux texte de sortie
+            max_power: Valeur S correspondant à 100 % (réglage $30 de GRBL)
+        """
+        super().__init__(stream)
+        self.max_power = max_power
+        self._pending = ''   # F et S à écrire avec la prochaine commande de découpe
+
+    def begin(self):
+        self.stream.write('; OptimLaser\nG21\nG90\nM4 S0\n')
+
+    def end(self):
+        self.stream.write('M5\nG0 X0 Y0\nM2\n')
+
+    def set_cut(self, settings: CutSettings, label: str = ''):
+        power = round(max(0.0, min(100.0, settings.power)) * self.max_power / 100.0)
+        if label:
+            self.stream.write(f'; {label} : {_number(settings.speed)} mm/s, {_number(settings.power)} %\n')
+        self._pending = f' F{_number(settings.speed * 60.0)} S{power}'
+
+    def _cut_suffix(self) -> str:
+        pending, self._pending = self._pending, ''
+        return pending
+
+    def travel(self, x, y):
+        self.stream.write(f'G0 X{_number(x)} Y{_number(y)}\n')
+        self.position = (x, y)
+
+    def line(self, x, y):
+        self.stream.write(f'G1 X{_number(x)} Y{_number(y)}{self._cut_suffix()}\n')
+        self.position = (x, y)
+
+    def arc(self, x, y, cx, cy, clockwise):
+        px, py = self.position
+        self.stream.write(f"{'G2' if clockwise else 'G3'} X{_number(x)} Y{_number(y)} "
+                          f"I{_number(cx - px)} J{_number(cy - py)}{self._cut_suffix()}\n")
+        self.position = (x, y)
+
+
+class HpglWriter(MachineWriter):
+    """
+    HPGL (unités traceur : 40 par mm). Chaque couleur reçoit une plume (SP) et
+    une vitesse (VS, en cm/s) ; la puissance est associée à la plume dans le
+    logiciel de la machine.
+    """
+
+    extension = '.plt'
+
+    UNITS_PER_MM = 40.0
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self._pens = {}
+
+    def _units(self, x: float, y: float) -> str:
+        return f'{round(x * self.UNITS_PER_MM)},{round(y * self.UNITS_PER_MM)}'
+
+    def begin(self):
+        self.stream.write('IN;\n')
+
+    def end(self):
+        self.stream.write('PU;\nSP0;\n')
+
+    def set_cut(self, settings: CutSettings, label: str = ''):
+        pen = self._pens.setdefault(label, len(self._pens) + 1)
+        self.stream.write(f'SP{pen};\nVS{_number(settings.speed / 10.0, 2)};\n')
+
+    def travel(self, x, y):
+        self.stream.write(f'PU{self._units(x, y)};\n')
+        self.position = (x, y)
+
+    def line(self, x, y):
+        self.stream.write(f'PD{self._units(x, y)};\n')
+        self.position = (x, y)
+
+
+EXPORT_FORMATS = {'gcode': GcodeWriter, 'hpgl': HpglWriter}
+
+
+# ─────────────────────────── Géométrie ───────────────────────────
+
+def _arc_center(x1, y1, rx, ry, phi_deg, large, sweep, x2, y2):
+    """
+    Paramètres centrés d'un arc SVG (spécification SVG, annexe F.6.5).
+
+    Returns:
+        (cx, cy, rx, ry, theta1, dtheta, cos_phi, sin_phi) ou None si l'arc
+        est un segment (rayon nul ou extrémités confondues)
+    """
+    if (x1, y1) == (x2, y2):
+        return None
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return None
+    phi = math.radians(phi_deg % 360.0)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x1 - x2) / 2.0, (y1 - y2) / 2.0
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+    # Rayons trop petits : agrandis pour joindre les extrémités
+    scale = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if scale > 1.0:
+        root = math.sqrt(scale)
+        rx, ry = rx * root, ry * root
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if bool(large) == bool(sweep):
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2.0
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2.0
+    ux, uy = (x1p - cxp) / rx, (y1p - cyp) / ry
+    vx, vy = (-x1p - cxp) / rx, (-y1p - cyp) / ry
+    theta1 = math.atan2(uy, ux)
+    dtheta = math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+    if sweep and dtheta < 0:
+        dtheta += 2 * math.pi
+    elif not sweep and dtheta > 0:
+        dtheta -= 2 * math.pi
+    return cx, cy, rx, ry, theta1, dtheta, cos_phi, sin_phi
+
+
+def _flatten_arc(center, tolerance: float) -> List[Point]:
+    cx, cy, rx, ry, theta1, dtheta, cos_phi, sin_phi = center
+    radius = max(rx, ry)
+    step = 2 * math.acos(max(-1.0, 1 - tolerance / radius)) if radius > tolerance else math.pi / 2
+    n = max(1, math.ceil(abs(dtheta) / max(step, 1e-6)))
+    points = []
+    for k in range(1, n + 1):
+        t = theta1 + dtheta * k / n
+        ex, ey = rx * math.cos(t), ry * math.sin(t)
+        points.append((cos_phi * ex - sin_phi * ey + cx, sin_phi * ex + cos_phi * ey + cy))
+    return points
+
+
+def _flatten_bezier(points: List[float], tolerance: float) -> List[Point]:
+    """Points d'une courbe de Bézier (quadratique ou cubique), formule de Wang."""
+    pts = [(points[k], points[k + 1]) for k in range(0, len(points), 2)]
+    degree = len(pts) - 1
+    second = max(math.hypot(pts[k][0] - 2 * pts[k + 1][0] + pts[k + 2][0],
+                            pts[k][1] - 2 * pts[k + 1][1] + pts[k + 2][1])
+                 for k in range(degree - 1))
+    n = max(1, math.ceil(math.sqrt(degree * (degree - 1) / 8.0 * second / tolerance)))
+    out = []
+    for k in range(1, n + 1):
+        t = k / n
+        u = 1 - t
+        if degree == 2:
+            a, b, c = u * u, 2 * u * t, t * t
+            out.append((a * pts[0][0] + b * pts[1][0] + c * pts[2][0],
+                        a * pts[0][1] + b * pts[1][1] + c * pts[2][1]))
+        else:
+            a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+            out.append((a * pts[0][0] + b * pts[1][0] + c * pts[2][0] + d * pts[3][0],
+                        a * pts[0][1] + b * pts[1][1] + c * pts[2][1] + d * pts[3][1]))
+    return out
+
+
+def write_tour(writer: MachineWriter, tour: Iterable, to_machine: Callable[[float, float], Point],
+               scale: float, tolerance: float = 0.05) -> int:
+    """
+    Écrit un parcours de découpe.
+
+    Args:
+        writer: Format de sortie (GcodeWriter, HpglWriter)
+        tour: Suite de (PathData, CutSettings, libellé), dans l'ordre de découpe
+        to_machine: Conversion d'un point du document en mm machine
+        scale: mm par unité du document (rayons des arcs, tolérance)
+        tolerance: Écart maximal des courbes linéarisées (mm)
+
+    Returns:
+        Nombre de tracés écrits
+    """
+    tol = tolerance / scale if scale > 0 else tolerance
+    writer.begin()
+    current_label = None
+    count = 0
+    for data, settings, label in tour:
+        if not data.codes:
+            continue
+        if label != current_label:
+            writer.set_cut(settings, label)
+            current_label = label
+        count += 1
+        coords = data.coords
+        cur = start = None
+        for code, i in data.commands():
+            n = ARITY[code]
+            if code == 'M':
+                cur = start = (coords[i], coords[i + 1])
+                target = to_machine(*cur)
+                # Le tracé précédent s'arrête au départ de celui-ci : pas de déplacement
+                if writer.position != target:
+                    writer.travel(*target)
+                continue
+            if cur is None:
+                continue
+            if code == 'Z':
+                if cur != start:
+                    writer.line(*to_machine(*start))
+                cur = start
+                continue
+            end = (coords[i + n - 2], coords[i + n - 1])
+            if code == 'L':
+                writer.line(*to_machine(*end))
+            elif code == 'A':
+                center = _arc_center(cur[0], cur[1], *coords[i:i + 7])
+                if center is None:
+                    writer.line(*to_machine(*end))
+                elif writer.supports_arcs and math.isclose(center[2], center[3], rel_tol=1e-6):
+                    # Arc de cercle : l'inversion de l'axe Y garde le sens visuel
+                    # (sens SVG positif = horaire à l'écran = G2)
+                    writer.arc(*to_machine(*end), *to_machine(center[0], center[1]),
+                               clockwise=center[5] > 0)
+                else:
+                    for point in _flatten_arc(center, tol):
+                        writer.line(*to_machine(*point))
+            else:
+                for point in _flatten_bezier([cur[0], cur[1]] + coords[i:i + n], tol):
+                    writer.line(*to_machine(*point))
+            cur = end
+    writer.end()
+    return count
@@ -0,0 +1,520 @@
+"""
+Module de données de chemin - Analyse rapide de l'attribut d en commandes absolues
+
+Un attribut d est analysé une seule fois en une suite de codes de commandes
+absolues et un tableau plat de coordonnées. Les formes abrégées sont
+normalisées :
+
+- H et V deviennent des L,
+- S devient un C (premier point de contrôle réfléchi),
+- T devient un Q (point de contrôle réfléchi),
+- les commandes relatives deviennent absolues.
+
+Il ne reste que les codes M, L, C, Q, A et Z, qui consomment respectivement
+2, 2, 6, 4, 7 et 0 nombres du tableau (pour A : rx, ry, rotation, grand arc,
+sens, x, y). L'écriture inverse produit un attribut d au format des nombres
+d'inkex (format_path), ou un attribut d compact pour le fichier de découpe
+(PathWriter : nombre de décimales fixé, commandes relatives possibles).
+"""
+
+import math
+import re
+from typing import List, Optional, Tuple
+
+import inkex
+
+__all__ = ['PathData', 'PathWriter', 'parse_path', 'format_path', 'ARITY']
+
+# Nombre de coordonnées de chaque commande normalisée
+ARITY = {'M': 2, 'L': 2, 'C': 6, 'Q': 4, 'A': 7, 'Z': 0}
+
+# Nombre de paramètres de chaque commande de l'attribut d
+_PARAMS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+
+_TOKEN = re.compile(
+    r'([MmZzLlHhVvCcSsQqTtAa])|([-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)')
+
+_INKEX_COMMANDS = {
+    'M': inkex.paths.Move, 'L': inkex.paths.Line, 'C': inkex.paths.Curve,
+    'Q': inkex.paths.Quadratic, 'A': inkex.paths.Arc,
+}
+
+
+class PathData:
+    """
+    Chemin analysé : codes de commandes absolues et coordonnées à plat.
+
+    Utilisation :
+        data = parse_path(element.get('d'))
+        for code, i in data.commands():     # i : position des coordonnées
+            x, y = data.coords[i + ARITY[code] - 2: i + ARITY[code]]
+        debut, fin = data.start, data.end
+
+    Attributes:
+        d (str): Attribut d analysé
+        codes (str): Codes des commandes normalisées ('MLCQAZ')
+        coords (list): Coordonnées des commandes, à plat
+        letters (str): Lettre d'origine (en majuscule) de chaque commande
+    """
+
+    __slots__ = ('d', 'codes', 'coords', 'letters', '_inkex')
+
+    def __init__(self, d: str, codes: str, coords: List[float], letters: str):
+        self.d = d
+        self.codes = codes
+        self.coords = coords
+        self.letters = letters
+        self._inkex = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def commands(self):
+        """Itère les couples (code, position de ses coordonnées dans coords)."""
+        i = 0
+        for code in self.codes:
+            yield code, i
+            i += ARITY[code]
+
+    @property
+    def is_closed(self) -> bool:
+        """True si le chemin contient une fermeture (Z)."""
+        return 'Z' in self.codes
+
+    @property
+    def start(self) -> Optional[Tuple[float, float]]:
+        """Premier point du chemin (None si le chemin est vide)."""
+        if not self.codes or self.codes[0] != 'M':
+            return None
+        return (self.coords[0], self.coords[1])
+
+    @property
+    def end(self) -> Optional[Tuple[float, float]]:
+        """
+        Point où s'arrête le tracé : fin de la dernière commande, ou début du
+        dernier sous-chemin si celui-ci est fermé.
+        """
+        if not self.codes:
+            return None
+        current = subpath = None
+        for code, i in self.commands():
+            if code == 'Z':
+                current = subpath
+            else:
+                n = ARITY[code]
+                current = (self.coords[i + n - 2], self.coords[i + n - 1])
+                if code == 'M':
+                    subpath = current
+        return current
+
+    def contour_vertices(self, tolerance: float = 0.0) -> Optional[List[Tuple[float, float]]]:
+        """
+        Sommets d'un contour fermé, dans l'ordre du tracé à partir du point de
+        départ ; None pour les autres chemins. Un contour est un seul sous-chemin
+        terminé par Z, ou dont la fin est à moins de tolerance du départ. Il peut
+        être parcouru à partir de n'importe lequel de ses sommets (cf. rotated).
+        """
+        codes = self.codes
+        body = codes[:-1] if codes.endswith('Z') else codes
+        if len(body) < 2 or body[0] != 'M' or 'M' in body[1:] or 'Z' in body:
+            return None
+        coords = self.coords
+        vertices = []
+        for code, i in self.commands():
+            if code != 'Z':
+                n = ARITY[code]
+                vertices.append((coords[i + n - 2], coords[i + n - 1]))
+        (x0, y0), (x1, y1) = vertices[0], vertices[-1]
+        if codes[-1] != 'Z' and (len(vertices) < 3
+                                 or abs(x1 - x0) > tolerance or abs(y1 - y0) > tolerance):
+            return None
+        # Dernier sommet confondu avec le départ : il n'est pas un nouveau point d'entrée
+        if codes[-1] != 'Z' or vertices[-1] == vertices[0]:
+            vertices.pop()
+        return vertices
+
+    def rotated(self, index: int) -> 'PathData':
+        """
+        Même contour fermé, parcouru à partir de son sommet index (cf. contour_vertices).
+
+        Les commandes sont permutées circulairement ; le segment de fermeture
+        d'un Z, s'il n'est pas nul, devient un L explicite. Le tracé est inchangé.
+        """
+        if index == 0:
+            return self
+        coords = self.coords
+        closed = self.codes.endswith('Z')
+        drawing = [(code, i, letter) for (code, i), letter in zip(self.commands(), self.letters)][1:]
+        if closed:
+            drawing.pop()
+        code, i, _letter = drawing[-1]
+        n = ARITY[code]
+        closing = closed and (coords[i + n - 2], coords[i + n - 1]) != (coords[0], coords[1])
+
+        code, i, _letter = drawing[index - 1]
+        n = ARITY[code]
+        codes, letters, new_coords = ['M'], ['M'], coords[i + n - 2:i + n]
+        for code, i, letter in drawing[index:]:
+            codes.append(code)
+            letters.append(letter)
+            new_coords.extend(coords[i:i + ARITY[code]])
+        if closing:
+            codes.append('L')
+            letters.append('L')
+            new_coords.extend(coords[0:2])
+        for code, i, letter in drawing[:index]:
+            codes.append(code)
+            letters.append(letter)
+            new_coords.extend(coords[i:i + ARITY[code]])
+        if closed:
+            codes.append('Z')
+            letters.append('Z')
+        codes = ''.join(codes)
+        return PathData(format_path(codes, new_coords), codes, new_coords, ''.join(letters))
+
+    def simplified(self, tolerance: float) -> 'PathData':
+        """
+        Même chemin, dont les suites de segments (L) sont simplifiées par
+        Douglas-Peucker : un sommet n'est supprimé que si le tracé simplifié
+        reste à moins de tolerance du tracé d'origine.
+
+        Les extrémités de chaque suite, les courbes, les arcs et les fermetures
+        sont conservés. Renvoie self si aucun sommet n'est supprimé.
+        """
+        if tolerance <= 0 or self.codes.count('L') < 2:
+            return self
+        coords = self.coords
+        codes, letters, new_coords = [], [], []
+        run = []            # positions des L de la suite en cours
+        positions = {}      # position d'un L -> rang de sa commande
+        anchor = None       # point de départ de la suite en cours
+        current = subpath = None
+
+        def flush():
+            if len(run) > 1:
+                points = [anchor] + [(coords[i], coords[i + 1]) for i in run]
+                kept = _douglas_peucker(points, tolerance)[1:]
+                selected = [run[k - 1] for k in kept]
+            else:
+                selected = run
+            for i in selected:
+                codes.append('L')
+                letters.append(self.letters[positions[i]])
+                new_coords.extend(coords[i:i + 2])
+            run.clear()
+
+        for number, (code, i) in enumerate(self.commands()):
+            if code == 'L':
+                if not run:
+                    anchor = current
+                run.append(i)
+                positions[i] = number
+                current = (coords[i], coords[i + 1])
+                continue
+            flush()
+            n = ARITY[code]
+            codes.append(code)
+            letters.append(self.letters[number])
+            new_coords.extend(coords[i:i + n])
+            if code == 'M':
+                current = subpath = (coords[i], coords[i + 1])
+            elif code == 'Z':
+                current = subpath
+            else:
+                current = (coords[i + n - 2], coords[i + n - 1])
+        flush()
+        if len(codes) == len(self.codes):
+            return self
+        codes = ''.join(codes)
+        return PathData(format_path(codes, new_coords), codes, new_coords, ''.join(letters))
+
+    def bbox(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Boîte (xmin, ymin, xmax, ymax) des points de contrôle, qui contient les
+        segments et les courbes de Bézier. Renvoie None si le chemin contient un
+        arc (dont le renflement peut sortir de cette boîte) ou est vide.
+        """
+        if 'A' in self.codes or not self.coords:
+            return None
+        xs, ys = self.coords[0::2], self.coords[1::2]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def to_inkex(self) -> inkex.Path:
+        """Chemin inkex équivalent, en commandes absolues normalisées (mémorisé)."""
+        if self._inkex is None:
+            coords = self.coords
+            commands = []
+            for code, i in self.commands():
+                if code == 'Z':
+                    commands.append(inkex.paths.ZoneClose())
+                else:
+                    commands.append(_INKEX_COMMANDS[code](*coords[i:i + ARITY[code]]))
+            self._inkex = inkex.Path(commands)
+        return self._inkex
+
+    def format(self, precision: int = 6) -> str:
+        """Attribut d des commandes normalisées (cf. format_path)."""
+        return format_path(self.codes, self.coords, precision)
+
+
+def _douglas_peucker(points: List[Tuple[float, float]], tolerance: float) -> List[int]:
+    """
+    Indices (croissants) des points conservés de la polyligne : les extrémités,
+    et récursivement le point le plus éloigné du segment qui les joint tant que
+    son écart dépasse tolerance.
+    """
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        (ax, ay), (bx, by) = points[first], points[last]
+        dx, dy = bx - ax, by - ay
+        length2 = dx * dx + dy * dy
+        farthest, worst = None, tolerance
+        for k in range(first + 1, last):
+            px, py = points[k]
+            # Distance au segment (et non à la droite) : un aller-retour n'est pas aligné
+            t = ((px - ax) * dx + (py - ay) * dy) / length2 if length2 else 0.0
+            t = min(1.0, max(0.0, t))
+            distance = math.hypot(px - ax - t * dx, py - ay - t * dy)
+            if distance > worst:
+                farthest, worst = k, distance
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [k for k, kept in enumerate(keep) if kept]
+
+
+def parse_path(d: Optional[str]) -> PathData:
+    """
+    Analyse un attribut d.
+
+    Les nombres collés (« 1-2 », « .5.5 ») et les drapeaux d'arc sans séparateur
+    (« a5 5 0 011 1 ») sont acceptés. L'analyse s'arrête à la première erreur,
+    comme le fait un moteur de rendu SVG : les commandes complètes qui précèdent
+    sont conservées.
+    """
+    d = d or ''
+    codes: List[str] = []
+    letters: List[str] = []
+    coords: List[float] = []
+    tokens = _TOKEN.findall(d)
+    n = len(tokens)
+    pos = 0
+    cx = cy = 0.0           # point courant
+    sx = sy = 0.0           # début du sous-chemin
+    qx = qy = None          # dernier point de contrôle (réflexion de S et T)
+    previous = ''
+    command = ''
+
+    while pos < n:
+        letter, number = tokens[pos]
+        if letter:
+            command = letter
+            pos += 1
+            if letter in 'Zz':
+                if codes:
+                    codes.append('Z')
+                    letters.append('Z')
+                cx, cy = sx, sy
+                previous = 'Z'
+                continue
+        elif not command or command in 'Zz':
+            break
+        upper = command.upper()
+        count = _PARAMS[upper]
+        relative = command != upper
+
+        # Paramètres de la commande (drapeaux d'arc éventuellement collés)
+        args: List[float] = []
+        while len(args) < count:
+            if pos >= n or tokens[pos][0]:
+                break
+            text = tokens[pos][1]
+            if upper == 'A' and len(args) in (3, 4):
+                if text[0] not in '01':
+                    break
+                args.append(float(text[0]))
+                if len(text) > 1:
+                    tokens[pos] = ('', text[1:])
+                    continue
+            else:
+                args.append(float(text))
+            pos += 1
+        if len(args) < count:
+            break
+
+        if upper == 'M':
+            x, y = args
+            if relative:
+                x += cx
+                y += cy
+            codes.append('M')
+            coords += (x, y)
+            cx, cy = sx, sy = x, y
+            # Les paires suivantes sont des L (ou des l)
+            command = 'l' if relative else 'L'
+            letters.append('M')
+            previous = 'M'
+            continue
+
+        ox, oy = (cx, cy) if relative else (0.0, 0.0)
+        if upper == 'L':
+            cx, cy = args[0] + ox, args[1] + oy
+            codes.append('L')
+            coords += (cx, cy)
+        elif upper == 'H':
+            cx = args[0] + ox
+            codes.append('L')
+            coords += (cx, cy)
+        elif upper == 'V':
+            cy = args[0] + oy
+            codes.append('L')
+            coords += (cx, cy)
+        elif upper == 'C' or upper == 'S':
+            if upper == 'C':
+                x1, y1 = args[0] + ox, args[1] + oy
+                rest = args[2:]
+            else:
+                if previous == 'C':
+                    x1, y1 = 2 * cx - qx, 2 * cy - qy
+                else:
+                    x1, y1 = cx, cy
+                rest = args
+            x2, y2 = rest[0] + ox, rest[1] + oy
+            cx, cy = rest[2] + ox, rest[3] + oy
+            codes.append('C')
+            coords += (x1, y1, x2, y2, cx, cy)
+            qx, qy = x2, y2
+        elif upper == 'Q' or upper == 'T':
+            if upper == 'Q':
+                x1, y1 = args[0] + ox, args[1] + oy
+                x, y = args[2] + ox, args[3] + oy
+            else:
+                if previous == 'Q':
+                    x1, y1 = 2 * cx - qx, 2 * cy - qy
+                else:
+                    x1, y1 = cx, cy
+                x, y = args[0] + ox, args[1] + oy
+            cx, cy = x, y
+            codes.append('Q')
+            coords += (x1, y1, cx, cy)
+            qx, qy = x1, y1
+        else:  # A
+            cx, cy = args[5] + ox, args[6] + oy
+            codes.append('A')
+            coords += (args[0], args[1], args[2], args[3], args[4], cx, cy)
+        letters.append(upper)
+        previous = codes[-1]
+
+    return PathData(d, ''.join(codes), coords, ''.join(letters))
+
+
+def format_path(codes: str, coords: List[float], precision: int = 6) -> str:
+    """
+    Écrit un attribut d à partir de codes absolus et de coordonnées à plat.
+
+    Les nombres sont écrits avec precision chiffres significatifs, au même
+    format que les chemins inkex (« M 10 20 L 30.5 40 Z »).
+    """
+    parts = []
+    i = 0
+    for code in codes:
+        n = ARITY[code]
+        if n:
+            parts.append(code + ' ' + ' '.join(
+                ['{:.{}g}'.format(v, precision) for v in coords[i:i + n]]))
+        else:
+            parts.append(code)
+        i += n
+    return ' '.join(parts)
+
+
+class PathWriter:
+    """
+    Écriture compacte d'attributs d.
+
+    Les lettres sont collées aux nombres et ne sont pas répétées pour des
+    commandes identiques successives (« M10 20L30 40 50 60 ») ; un déplacement
+    vers le point déjà atteint est omis. Les coordonnées
+    relatives sont calculées depuis la position arrondie déjà écrite : les
+    arrondis ne s'accumulent pas le long du tracé.
+
+    Utilisation :
+        writer = PathWriter(decimals=2, relative=True)
+        d = writer.write(data.codes, data.coords)
+    """
+
+    def __init__(self, decimals: Optional[int] = None, relative: bool = False):
+        """
+        Args:
+            decimals: Nombre de décimales des coordonnées (None : 6 chiffres significatifs)
+            relative: Écrire des commandes relatives (minuscules)
+        """
+        self.decimals = decimals
+        self.relative = relative
+
+    def number(self, value: float) -> str:
+        """Nombre écrit sans zéros inutiles (« 12.5 », « -3 », « 0 »)."""
+        if self.decimals is None:
+            text = '{:.6g}'.format(value)
+        else:
+            text = '{:.{}f}'.format(value, self.decimals)
+            if '.' in text:
+                text = text.rstrip('0').rstrip('.')
+        return '0' if text == '-0' else text
+
+    def _round(self, value: float) -> float:
+        return value if self.decimals is None else round(value, self.decimals)
+
+    def write(self, codes: str, coords: List[float]) -> str:
+        """Attribut d des commandes absolues codes / coords (cf. PathData)."""
+        number = self.number
+        relative = self.relative
+        parts = []
+        previous = ''
+        cx = cy = sx = sy = 0.0  # position écrite (arrondie) et début du sous-chemin
+        i = 0
+        for k, code in enumerate(codes):
+            n = ARITY[code]
+            if code == 'Z':
+                letter = 'z' if relative else 'Z'
+                parts.append(letter)
+                cx, cy = sx, sy
+                previous = letter
+                continue
+            values = coords[i:i + n]
+            i += n
+            # Position arrondie atteinte à la fin de la commande
+            ex, ey = self._round(values[-2]), self._round(values[-1])
+            if code == 'M' and parts and previous not in 'Zz' and (ex, ey) == (cx, cy):
+                # Le tracé suivant part du point atteint : déplacement inutile,
+                # sauf s'il est fermé (Z revient au début du sous-chemin)
+                following = codes.find('M', k + 1)
+                if 'Z' not in codes[k + 1:following if following >= 0 else None]:
+                    continue
+            if relative and parts:
+                letter = code.lower()
+                if code == 'A':
+                    args = values[:5] + [ex - cx, ey - cy]
+                else:
+                    args = [v - (cx if k % 2 == 0 else cy) for k, v in enumerate(values)]
+                    args[-2:] = [ex - cx, ey - cy]
+            else:
+                letter = code
+                args = values
+            text = ' '.join([number(v) for v in args])
+            # Une commande répétée se passe de sa lettre (sauf M, qui deviendrait L)
+            if letter == previous and letter not in 'Mm':
+                parts.append(' ' + text)
+            else:
+                parts.append(letter + text)
+            previous = letter
+            cx, cy = ex, ey
+            if code == 'M':
+                sx, sy = ex, ey
+        return ''.join(parts)
@@ -0,0 +1,225 @@
+"""
+Module de profilage - Mesure du coût de chaque étape de l'optimisation
+
+Enregistre pour chaque étape de _run_optimization le temps réel, le temps CPU,
+l'augmentation du pic de mémoire (RSS) et le nombre d'éléments avant/après.
+Le bilan peut être affiché en fin de traitement et écrit en JSON/CSV ; un
+profilage détaillé (cProfile ou pyinstrument) par étape est disponible en option.
+"""
+
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+__all__ = ['StageProfiler', 'StageRecord', 'PROFILERS']
+
+# Profileurs détaillés disponibles (la valeur 'none' désactive le profilage détaillé)
+PROFILERS = ('none', 'cProfile', 'pyinstrument')
+
+
+def _peak_rss_kb() -> Optional[float]:
+    """Retourne le pic de mémoire résidente du processus en Ko (None si indisponible)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en Ko sous Linux
+        return peak / 1024.0 if sys.platform == 'darwin' else float(peak)
+    except (ImportError, AttributeError, OSError):
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        # peak_wset n'existe que sous Windows
+        return getattr(info, 'peak_wset', info.rss) / 1024.0
+    except Exception:
+        return None
+
+
+@dataclass
+class StageRecord:
+    """
+    Mesures d'une étape de traitement.
+
+    Attributes:
+        name (str): Identifiant de l'étape (ex: 'dedup')
+        label (str): Libellé affiché
+        wall_s (float): Temps réel écoulé en secondes
+        cpu_s (float): Temps CPU du processus en secondes
+        peak_rss_delta_kb (float): Augmentation du pic de mémoire résidente en Ko
+        elements_in (int): Nombre d'éléments avant l'étape
+        elements_out (int): Nombre d'éléments après l'étape
+    """
+    name: str
+    label: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_delta_kb: Optional[float] = None
+    elements_in: Optional[int] = None
+    elements_out: Optional[int] = None
+
+
+class StageProfiler:
+    """
+    Collecte les mesures des étapes successives d'un traitement.
+
+    Utilisation :
+        profiler = StageProfiler(counter=lambda: len(svg.xpath('//svg:path')))
+        with profiler.stage('dedup', "Suppression des doublons"):
+            ...
+        print(profiler.summary_text())
+    """
+
+    def __init__(self, counter: Optional[Callable[[], int]] = None,
+                 profiler: str = 'none', dump_base: Optional[str] = None):
+        """
+        Initialise le profileur.
+
+        Args:
+            counter: Fonction retournant le nombre d'éléments courant (optionnel)
+            profiler: Profileur détaillé par étape ('none', 'cProfile' ou 'pyinstrument')
+            dump_base: Chemin de base des fichiers de profilage détaillé
+        """
+        self.counter = counter
+        self.profiler = profiler if profiler in PROFILERS else 'none'
+        self.dump_base = dump_base
+        self.records: List[StageRecord] = []
+        self.dumps: List[str] = []
+        self.started_at = datetime.now()
+
+    def _count(self) -> Optional[int]:
+        if self.counter is None:
+            return None
+        try:
+            return int(self.counter())
+        except Exception:
+            return None
+
+    @contextmanager
+    def stage(self, name: str, label: Optional[str] = None):
+        """
+        Mesure le bloc encadré comme une étape.
+
+        Args:
+            name: Identifiant de l'étape
+            label: Libellé affiché (par défaut l'identifiant)
+
+        Yields:
+            Le StageRecord en cours de remplissage
+        """
+        record = StageRecord(name=name, label=label or name)
+        record.elements_in = self._count()
+        rss_before = _peak_rss_kb()
+        detail = self._start_detail()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - wall_start
+            record.cpu_s = time.process_time() - cpu_start
+            self._stop_detail(detail, name)
+            rss_after = _peak_rss_kb()
+            if rss_before is not None and rss_after is not None:
+                record.peak_rss_delta_kb = max(0.0, rss_after - rss_before)
+            record.elements_out = self._count()
+            self.records.append(record)
+
+    def _start_detail(self):
+        """Démarre le profileur détaillé éventuel."""
+        if self.profiler == 'cProfile':
+            import cProfile
+            detail = cProfile.Profile()
+            detail.enable()
+            return detail
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                # Module optionnel absent : on se contente des mesures de base
+                self.profiler = 'none'
+                return None
+            detail = Profiler()
+            detail.start()
+            return detail
+        return None
+
+    def _stop_detail(self, detail, name: str):
+        """Arrête le profileur détaillé et écrit son rapport pour l'étape."""
+        if detail is None:
+            return
+        try:
+            if self.profiler == 'cProfile':
+                detail.disable()
+                if self.dump_base:
+                    path = f"{self.dump_base}.{name}.prof"
+                    detail.dump_stats(path)
+                    self.dumps.append(path)
+            else:
+                detail.stop()
+                if self.dump_base:
+                    path = f"{self.dump_base}.{name}.html"
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(detail.output_html())
+                    self.dumps.append(path)
+        except Exception:
+            pass
+
+    def total_wall(self) -> float:
+        """Temps réel total des étapes mesurées."""
+        return sum(r.wall_s for r in self.records)
+
+    def summary_text(self) -> str:
+        """
+        Retourne un tableau texte d'une ligne par étape (temps, CPU, mémoire, éléments).
+        """
+        lines = []
+        for r in self.records:
+            counts = ''
+            if r.elements_in is not None and r.elements_out is not None:
+                counts = f"{r.elements_in:>6} → {r.elements_out:<6}"
+            mem = f"+{r.peak_rss_delta_kb / 1024.0:.1f} Mo" if r.peak_rss_delta_kb is not None else ''
+            lines.append(f"{r.label[:28]:<28} {r.wall_s:7.2f} s {r.cpu_s:7.2f} s  {counts} {mem}".rstrip())
+        lines.append(f"{'Total':<28} {self.total_wall():7.2f} s")
+        return "\n".join(lines)
+
+    def to_dict(self, metadata: Optional[Dict] = None) -> Dict:
+        """Retourne le rapport complet sous forme de dictionnaire sérialisable."""
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'metadata': metadata or {},
+            'total_wall_s': self.total_wall(),
+            'stages': [asdict(r) for r in self.records],
+            'profiles': list(self.dumps),
+        }
+
+    def write_report(self, base_path: str, metadata: Optional[Dict] = None) -> List[str]:
+        """
+        Écrit le rapport en JSON et en CSV.
+
+        Args:
+            base_path: Chemin sans extension des fichiers à écrire
+            metadata: Informations complémentaires (fichier, paramètres...)
+
+        Returns:
+            Liste des fichiers écrits
+        """
+        written = []
+        json_path = base_path + '.json'
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(metadata), f, ensure_ascii=False, indent=2)
+        written.append(json_path)
+
+        csv_path = base_path + '.csv'
+        fields = list(StageRecord.__dataclass_fields__)
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for r in self.records:
+                writer.writerow(asdict(r))
+        written.append(csv_path)
+        return written
@@ -0,0 +1,284 @@
+"""
+Module de progression - Avancement réel des étapes et estimation du temps restant
+
+Chaque étape du traitement déclare le volume de travail prévu (éléments à
+dégrouper, paires à comparer, chemins à ordonner...) puis signale le travail
+effectué. Le suivi en déduit un pourcentage global pondéré par le coût relatif
+des étapes et une estimation du temps restant à partir du débit mesuré.
+
+Les mises à jour sont transmises à un callback (fenêtre de progression) et,
+en l'absence d'interface, journalisées sur stderr via le module logging.
+"""
+
+import gettext
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configurer gettext pour l'internationalisation
+_locale_dir = os.path.join(os.path.dirname(__file__), 'locale')
+try:
+    _translation = gettext.translation('OptimLaser', localedir=_locale_dir, fallback=True)
+    _ = _translation.gettext
+except Exception:
+    def _(msg): return msg
+
+__all__ = ['ProgressTracker', 'format_duration', 'console_logger', 'DEFAULT_WEIGHTS']
+
+logger = logging.getLogger('OptimLaser')
+_console_handler: Optional[logging.Handler] = None
+
+def console_logger() -> logging.Logger:
+    """
+    Retourne le journal OptimLaser configuré pour les exécutions sans interface.
+
+    Sans gestionnaire, logging n'affiche que les avertissements : un
+    gestionnaire vers stderr au niveau INFO est ajouté une seule fois pour que
+    les débuts, fins d'étape et estimations du temps restant soient visibles.
+    """
+    global _console_handler
+    if _console_handler is None:
+        _console_handler = logging.StreamHandler(sys.stderr)
+        _console_handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(_console_handler)
+        logger.propagate = False
+    if logger.level == logging.NOTSET or logger.level > logging.INFO:
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+# Coût relatif des étapes (mesuré sur les fichiers de Test/)
+DEFAULT_WEIGHTS = {
+    'gray_save': 1,
+    'ungroup': 3,
+    'color_filter': 1,
+    'subpaths': 4,
+    'zones': 2,
+    'dedup': 60,
+    'merge': 10,
+    'ordering': 18,
+    'output': 2,
+    'export': 2,
+    'gray_restore': 1,
+    'save': 2,
+    'checkpoint': 2,
+}
+
+
+def format_duration(seconds: float) -> str:
+    """Formate une durée pour l'affichage (ex: « 1 min 05 s »)."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
+
+
+class _StageState:
+    """Avancement d'une étape en cours."""
+
+    def __init__(self, name: str, label: str, total: int, unit: str):
+        self.name = name
+        self.label = label
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self.counters: Dict[str, int] = {}
+        self.started = time.monotonic()
+
+    def fraction(self) -> float:
+        if self.total <= 0:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+
+class ProgressTracker:
+    """
+    Suivi de l'avancement d'un traitement découpé en étapes pondérées.
+
+    Utilisation :
+        tracker = ProgressTracker(plan=['dedup', 'merge'], callback=afficher)
+        with tracker.stage('dedup', "Suppression des doublons..."):
+            tracker.set_total(nb_paires, "paires testées")
+            for ...:
+                tracker.advance()
+    """
+
+    def __init__(self, plan: Optional[List[str]] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 callback: Optional[Callable[[str, float], None]] = None,
+                 min_interval: float = 0.1, log_interval: float = 5.0,
+                 log: Optional[logging.Logger] = None):
+        """
+        Initialise le suivi.
+
+        Args:
+            plan: Noms des étapes prévues, dans l'ordre (None = suivi inactif)
+            weights: Coût relatif de chaque étape (DEFAULT_WEIGHTS par défaut)
+            callback: Fonction appelée avec (texte, pourcentage) à chaque mise à jour
+            min_interval: Intervalle minimal entre deux appels du callback, en secondes
+            log_interval: Intervalle entre deux lignes de journal en cours d'étape
+            log: Journal à utiliser (None = pas de journalisation)
+        """
+        weights = weights or DEFAULT_WEIGHTS
+        self.plan: List[Tuple[str, float]] = [(name, float(weights.get(name, 1))) for name in (plan or [])]
+        self.total_weight = sum(w for _, w in self.plan) or 1.0
+        self.callback = callback
+        self.min_interval = min_interval
+        self.log_interval = log_interval
+        self.log = log
+        self.completed_weight = 0.0
+        self.current: Optional[_StageState] = None
+        self.history: List[Dict] = []
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+        self._last_log = 0.0
+        self._last_percent = 0.0
+
+    # ------------------------------------------------------------------
+    # Déclaration du travail
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str, label: str, total: int = 0, unit: str = ''):
+        """Encadre une étape : démarrage, puis clôture même en cas d'exception."""
+        self.start_stage(name, label, total, unit)
+        try:
+            yield self
+        finally:
+            self.finish_stage()
+
+    def start_stage(self, name: str, label: str, total: int = 0, unit: str = ''):
+        """Démarre une étape (le volume de travail peut être précisé ensuite)."""
+        self.current = _StageState(name, label, total, unit)
+        if self.log:
+            self.log.info("%s", label)
+        self._emit(force=True)
+
+    def set_total(self, total: int, unit: Optional[str] = None):
+        """Fixe le volume de travail prévu pour l'étape en cours."""
+        if self.current is None:
+            return
+        self.current.total = max(0, int(total))
+        if unit is not None:
+            self.current.unit = unit
+        self._emit()
+
+    def add_total(self, amount: int):
+        """Ajoute du travail découvert en cours d'étape."""
+        if self.current is None:
+            return
+        self.current.total += max(0, int(amount))
+
+    def advance(self, amount: int = 1):
+        """Signale du travail effectué dans l'étape en cours."""
+        current = self.current
+        if current is None:
+            return
+        current.done += amount
+        now = time.monotonic()
+        if now - self._last_emit >= self.min_interval:
+            self._emit(now=now)
+
+    def advance_to(self, done: int):
+        """Porte le travail effectué à au moins done (fin anticipée d'une sous-tâche)."""
+        current = self.current
+        if current is not None and done > current.done:
+            self.advance(done - current.done)
+
+    def complete(self):
+        """Marque tout le travail prévu de l'étape en cours comme effectué."""
+        if self.current is not None:
+            self.advance_to(self.current.total)
+
+    def count(self, counter: str, amount: int = 1):
+        """Incrémente un compteur nommé de l'étape en cours (ex: segments émis)."""
+        if self.current is not None:
+            self.current.counters[counter] = self.current.counters.get(counter, 0) + amount
+
+    def finish_stage(self):
+        """Clôt l'étape en cours et cumule son poids."""
+        current = self.current
+        if current is None:
+            return
+        elapsed = time.monotonic() - current.started
+        self.completed_weight += self._weight(current.name)
+        self.history.append({
+            'name': current.name,
+            'label': current.label,
+            'done': current.done,
+            'total': current.total,
+            'unit': current.unit,
+            'counters': dict(current.counters),
+            'seconds': elapsed,
+        })
+        if self.log:
+            self.log.info("%s terminé en %s (%s)", current.label, format_duration(elapsed),
+                          self._counters_text(current) or "-")
+        self.current = None
+
+    # ------------------------------------------------------------------
+    # Calculs
+    # ------------------------------------------------------------------
+
+    def _weight(self, name: str) -> float:
+        for stage_name, weight in self.plan:
+            if stage_name == name:
+                return weight
+        return 0.0
+
+    def fraction(self) -> float:
+        """Fraction globale du traitement effectuée (0 à 1, jamais décroissante)."""
+        weight = self.completed_weight
+        if self.current is not None:
+            weight += self._weight(self.current.name) * self.current.fraction()
+        fraction = min(1.0, weight / self.total_weight)
+        self._last_percent = max(self._last_percent, fraction)
+        return self._last_percent
+
+    def eta(self) -> Optional[float]:
+        """Temps restant estimé en secondes d'après le débit observé (None si trop tôt)."""
+        fraction = self.fraction()
+        elapsed = time.monotonic() - self.started
+        if fraction < 0.02 or elapsed < 1.0:
+            return None
+        return elapsed * (1.0 - fraction) / fraction
+
+    def _counters_text(self, stage: _StageState) -> str:
+        parts = []
+        if stage.total > 0:
+            parts.append(f"{min(stage.done, stage.total)} / {stage.total} {stage.unit}".rstrip())
+        parts.extend(f"{value} {name}" for name, value in stage.counters.items())
+        return ", ".join(parts)
+
+    def status_text(self) -> str:
+        """Texte d'état : étape, travail effectué et temps restant estimé."""
+        if self.current is None:
+            return ""
+        lines = [self.current.label]
+        details = self._counters_text(self.current)
+        eta = self.eta()
+        if eta is not None:
+            details = (details + " — " if details else "") + _("reste environ {}").format(format_duration(eta))
+        if details:
+            lines.append(details)
+        return "\n".join(lines)
+
+    def _emit(self, force: bool = False, now: Optional[float] = None):
+        now = now if now is not None else time.monotonic()
+        if not force and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        if self.callback is not None:
+            self.callback(self.status_text(), self.fraction() * 100.0)
+        if self.log and self.current is not None and now - self._last_log >= self.log_interval:
+            self._last_log = now
+            if not force:
+                self.log.info("%s : %.0f %% (%s)", self.current.label, self.fraction() * 100.0,
+                              self._counters_text(self.current) or "-")
@@ -0,0 +1,173 @@
+"""
+Module de cache - Réutilisation des résultats pour un dessin inchangé
+
+Le fichier de découpe et les statistiques d'une optimisation sont conservés sur
+disque, sous une clé calculée à partir du contenu du document, des paramètres
+qui influencent le résultat et de la version de l'extension. Relancer
+l'extension sur le même dessin avec les mêmes réglages restitue alors le
+résultat immédiatement.
+
+Les entrées les moins récemment utilisées sont supprimées quand la taille
+totale du cache dépasse la limite.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, Optional, Tuple
+
+__all__ = ['ResultCache', 'default_cache_dir']
+
+# Taille maximale du cache par défaut (octets)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """Retourne le dossier de cache utilisateur propre à la plateforme."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'OptimLaser')
+
+
+class ResultCache:
+    """
+    Cache disque des résultats d'optimisation, adressé par le contenu.
+
+    Chaque entrée est formée de deux fichiers : <clé>.svg.gz (document optimisé
+    compressé) et <clé>.json (statistiques). La date de modification des
+    fichiers sert d'horodatage d'utilisation pour l'éviction LRU.
+
+    Utilisation :
+        cache = ResultCache()
+        key = cache.key(svg_bytes, settings, __version__)
+        hit = cache.get(key)
+        if hit is None:
+            ...
+            cache.put(key, output_bytes, stats)
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialise le cache.
+
+        Args:
+            directory: Dossier du cache (par défaut le dossier de cache utilisateur)
+            max_bytes: Taille totale maximale des entrées en octets
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(document: bytes, settings: Dict, version: str) -> str:
+        """
+        Calcule la clé d'une optimisation.
+
+        Args:
+            document: Contenu du document d'entrée
+            settings: Paramètres qui influencent le résultat (sérialisables en JSON)
+            version: Version de l'extension
+
+        Returns:
+            Empreinte SHA-256 hexadécimale
+        """
+        digest = hashlib.sha256()
+        digest.update(document)
+        digest.update(json.dumps(settings, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(str(version).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + '.svg.gz', base + '.json'
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict]]:
+        """
+        Retourne (document optimisé, statistiques) pour key, ou None si absent.
+
+        Une entrée trouvée est marquée comme récemment utilisée.
+        """
+        svg_path, stats_path = self._paths(key)
+        try:
+            with gzip.open(svg_path, 'rb') as f:
+                data = f.read()
+            with open(stats_path, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError, EOFError):
+            return None
+        try:
+            os.utime(svg_path, None)
+            os.utime(stats_path, None)
+        except OSError:
+            pass
+        return data, stats
+
+    def put(self, key: str, data: bytes, stats: Optional[Dict]) -> bool:
+        """
+        Enregistre un résultat puis applique la limite de taille.
+
+        Returns:
+            True si l'entrée a été écrite
+        """
+        svg_path, stats_path = self._paths(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Écriture dans des fichiers temporaires puis renommage : une entrée
+            # n'est jamais lue à moitié écrite
+            self._write_atomic(svg_path, gzip.compress(data))
+            self._write_atomic(stats_path, json.dumps(stats or {}, ensure_ascii=False).encode('utf-8'))
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def _write_atomic(self, path: str, payload: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        entries = {}
+        for name in names:
+            if name.endswith('.svg.gz'):
+                key = name[:-len('.svg.gz')]
+            elif name.endswith('.json'):
+                key = name[:-len('.json')]
+            else:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            size, used = entries.get(key, (0, 0.0))
+            entries[key] = (size + stat.st_size, max(used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
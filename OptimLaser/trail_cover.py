@@ -0,0 +1,118 @@
+"""
+Module de couverture par pistes - Enchaînement des segments d'une couleur en un minimum de tracés
+
+Les segments d'une couleur forment un graphe : les sommets sont les extrémités
+(soudées), les arêtes sont les segments. Une piste parcourt des arêtes
+consécutives sans repasser par la même ; chaque piste devient un tracé continu,
+donc un seul perçage et un seul déplacement à vide.
+
+Une composante connexe qui a 2k sommets de degré impair ne peut pas être
+couverte par moins de k pistes (une seule si k = 0). Ce minimum est atteint en
+appariant les sommets impairs par k arêtes virtuelles, ce qui rend tous les
+degrés pairs : le circuit eulérien (algorithme de Hierholzer) est alors coupé
+aux arêtes virtuelles.
+"""
+
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+__all__ = ['cover_with_trails']
+
+# Arête parcourue : (indice dans la liste des arêtes, parcourue de la fin vers le début)
+TrailEdge = Tuple[int, bool]
+
+
+def cover_with_trails(edges: Sequence[Tuple[Hashable, Hashable]]) -> List[List[TrailEdge]]:
+    """
+    Couvre les arêtes par le plus petit nombre de pistes.
+
+    Args:
+        edges: Arêtes (début, fin) ; les sommets sont des clés comparables entre
+            elles (identifiants de sommets soudés), une boucle a le même début et
+            la même fin
+
+    Returns:
+        Liste de pistes ; chaque piste est une liste de (indice de l'arête,
+        inversée), la fin de chaque arête touchant le début de la suivante.
+        Chaque arête apparaît dans exactement une piste.
+    """
+    adjacency: Dict[Hashable, List[Tuple[int, Hashable, bool]]] = {}
+    for edge_id, (start, end) in enumerate(edges):
+        adjacency.setdefault(start, []).append((edge_id, end, False))
+        adjacency.setdefault(end, []).append((edge_id, start, True))
+
+    real_count = len(edges)
+    used = [False] * real_count
+    trails: List[List[TrailEdge]] = []
+
+    # Composantes connexes, dans l'ordre d'apparition des arêtes
+    seen = set()
+    for start, _ in edges:
+        if start in seen:
+            continue
+        component = [start]
+        seen.add(start)
+        i = 0
+        while i < len(component):
+            for _, other, _ in adjacency[component[i]]:
+                if other not in seen:
+                    seen.add(other)
+                    component.append(other)
+            i += 1
+
+        # Appariement des sommets impairs (dans l'ordre des identifiants)
+        odd = sorted(node for node in component if len(adjacency[node]) % 2)
+        virtual = set()
+        for a, b in zip(odd[0::2], odd[1::2]):
+            edge_id = len(used)
+            used.append(False)
+            virtual.add(edge_id)
+            adjacency[a].append((edge_id, b, False))
+            adjacency[b].append((edge_id, a, True))
+
+        circuit = _eulerian_circuit(odd[0] if odd else start, adjacency, used)
+        trails.extend(_split_at(circuit, virtual))
+    return trails
+
+
+def _eulerian_circuit(start, adjacency, used) -> List[TrailEdge]:
+    """Circuit eulérien de la composante de start (Hierholzer, version itérative)."""
+    pointer: Dict[Hashable, int] = {}
+    stack = [(start, None)]
+    circuit: List[TrailEdge] = []
+    while stack:
+        node, via = stack[-1]
+        neighbours = adjacency[node]
+        i = pointer.get(node, 0)
+        while i < len(neighbours) and used[neighbours[i][0]]:
+            i += 1
+        pointer[node] = i
+        if i == len(neighbours):
+            stack.pop()
+            if via is not None:
+                circuit.append(via)
+        else:
+            edge_id, other, reverse = neighbours[i]
+            used[edge_id] = True
+            stack.append((other, (edge_id, reverse)))
+    circuit.reverse()
+    return circuit
+
+
+def _split_at(circuit: List[TrailEdge], virtual) -> List[List[TrailEdge]]:
+    """Coupe le circuit fermé aux arêtes virtuelles (qui ne sont pas conservées)."""
+    if not virtual:
+        return [circuit] if circuit else []
+    # Faire commencer le circuit juste après une arête virtuelle
+    first = next(i for i, (edge_id, _) in enumerate(circuit) if edge_id in virtual)
+    rotated = circuit[first + 1:] + circuit[:first + 1]
+    trails, current = [], []
+    for step in rotated:
+        if step[0] in virtual:
+            if current:
+                trails.append(current)
+            current = []
+        else:
+            current.append(step)
+    if current:
+        trails.append(current)
+    return trails
@@ -12,6 +12,8 @@ import locale
 import json
 import unicodedata
 import gettext
+import queue
+import threading
 
 # Configurer gettext pour l'internationalisation
 _locale_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'locale')
@@ -40,6 +42,9 @@ except:
 class OptimLaserGUI:
     """Interface graphique principale pour OptimLaser"""
     
+    # Formats d'export machine : libellé affiché → nom (cf. machine_export.EXPORT_FORMATS)
+    MACHINE_EXPORTS = {"G-code": 'gcode', "HPGL": 'hpgl'}
+    
     def __init__(self, 
                  master: tk.Tk,
                  on_apply: Optional[Callable] = None,
@@ -70,8 +75,20 @@ class OptimLaserGUI:
         self.zonage_size_mm = tk.DoubleVar(value=10.0)
         self.laser_speed = tk.DoubleVar(value=25.0)
         self.idle_speed = tk.DoubleVar(value=2800.0)
+        self.start_cost = tk.DoubleVar(value=0.0)
         self.remove_unmanaged_colors = tk.BooleanVar(value=True)
         self.save_as_cutting = tk.BooleanVar(value=True)
+        self.performance_report = tk.BooleanVar(value=False)
+        self.profiler = tk.StringVar(value=_("Aucun"))
+        self.max_seconds = tk.IntVar(value=0)
+        self.result_cache = tk.BooleanVar(value=True)
+        self.incremental = tk.BooleanVar(value=False)
+        self.output_precision = tk.DoubleVar(value=0.0)
+        self.relative_commands = tk.BooleanVar(value=False)
+        self.compound_paths = tk.BooleanVar(value=False)
+        self.machine_export = tk.StringVar(value=_("Aucun"))
+        self.eulerian_chaining = tk.BooleanVar(value=False)
+        self.simplify_tolerance = tk.DoubleVar(value=0.0)
         self.speed_presets: Dict[str, float] = {}
         self.speed_labels: Dict[str, str] = {}
         self.label_to_name: Dict[str, str] = {}
@@ -165,6 +182,29 @@ class OptimLaserGUI:
                 self.remove_unmanaged_colors.set(bool(self._last_used['remove_unmanaged_colors']))
             if 'save_as_cutting' in self._last_used:
                 self.save_as_cutting.set(bool(self._last_used['save_as_cutting']))
+            if 'performance_report' in self._last_used:
+                self.performance_report.set(bool(self._last_used['performance_report']))
+            if self._last_used.get('profiler') in ('cProfile', 'pyinstrument'):
+                self.profiler.set(self._last_used['profiler'])
+            if 'max_seconds' in self._last_used:
+                self.max_seconds.set(int(self._last_used['max_seconds']))
+            if 'result_cache' in self._last_used:
+                self.result_cache.set(bool(self._last_used['result_cache']))
+            if 'incremental' in self._last_used:
+                self.incremental.set(bool(self._last_used['incremental']))
+            if 'output_precision' in self._last_used:
+                self.output_precision.set(float(self._last_used['output_precision']))
+            if 'relative_commands' in self._last_used:
+                self.relative_commands.set(bool(self._last_used['relative_commands']))
+            if 'compound_paths' in self._last_used:
+                self.compound_paths.set(bool(self._last_used['compound_paths']))
+            if self._last_used.get('machine_export') in self.MACHINE_EXPORTS.values():
+                self.machine_export.set({v: k for k, v in self.MACHINE_EXPORTS.items()}[
+                    self._last_used['machine_export']])
+            if 'eulerian_chaining' in self._last_used:
+                self.eulerian_chaining.set(bool(self._last_used['eulerian_chaining']))
+            if 'simplify_tolerance' in self._last_used:
+                self.simplify_tolerance.set(float(self._last_used['simplify_tolerance']))
 
         # Si aucune couleur n'a été chargée, utiliser les couleurs par défaut
         if not self.colors_order:
@@ -185,6 +225,8 @@ class OptimLaserGUI:
                 self.laser_speed.set(float(self._last_used['laser_speed']))
             if 'idle_speed' in self._last_used:
                 self.idle_speed.set(float(self._last_used['idle_speed']))
+            if 'start_cost' in self._last_used:
+                self.start_cost.set(float(self._last_used['start_cost']))
             if 'speed_preset' in self._last_used:
                 self.selected_speed_name.set(self._last_used['speed_preset'])
         else:
@@ -632,7 +674,180 @@ class OptimLaserGUI:
             text=_("Enregistrer le fichier optimisé avec le suffixe ' - découpe'"),
             foreground=self.fgLight_color,
             font=("TkDefaultFont")
-        ).grid(row=3, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 0))
+        ).grid(row=3, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Checkbox pour le rapport de performances
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Rapport de performances"),
+            variable=self.performance_report,
+            command=self._toggle_profiler
+        ).grid(row=4, column=0, sticky=tk.W, pady=(0, 2))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Durée de chaque étape, affichée en fin de traitement et enregistrée en JSON/CSV"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=5, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 2))
+        
+        profiler_frame = ttk.Frame(params_frame)
+        profiler_frame.grid(row=6, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 0))
+        ttk.Label(profiler_frame, text=_("Profilage détaillé :")).pack(side=tk.LEFT)
+        self.profiler_combo = ttk.Combobox(
+            profiler_frame,
+            textvariable=self.profiler,
+            values=[_("Aucun"), "cProfile", "pyinstrument"],
+            state="readonly",
+            width=12
+        )
+        self.profiler_combo.pack(side=tk.LEFT, padx=(5, 0))
+        self._toggle_profiler()
+        
+        # Durée maximale du traitement
+        max_seconds_frame = ttk.Frame(params_frame)
+        max_seconds_frame.grid(row=7, column=0, sticky=tk.W, pady=(10, 2))
+        ttk.Label(max_seconds_frame, text=_("Durée maximale (s) :")).pack(side=tk.LEFT)
+        ttk.Spinbox(
+            max_seconds_frame,
+            from_=0,
+            to=3600,
+            increment=10,
+            textvariable=self.max_seconds,
+            width=6
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("0 = sans limite. Une fois le temps écoulé, doublons, fusions et ordre de découpe gardent le meilleur résultat obtenu"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=8, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Checkbox pour le cache des résultats
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Réutiliser les résultats précédents"),
+            variable=self.result_cache
+        ).grid(row=9, column=0, sticky=tk.W, pady=(0, 2))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Un dessin inchangé est restitué sans nouveau calcul ; si seuls les réglages de l'ordre de découpe changent, seul l'ordre est recalculé"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=10, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Checkbox pour la réoptimisation incrémentale
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Réoptimisation incrémentale"),
+            variable=self.incremental
+        ).grid(row=11, column=0, sticky=tk.W, pady=(0, 2))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Après une retouche, seules les zones modifiées du dessin sont recalculées et l'ordre de découpe précédent est réparé localement"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=12, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Écriture des tracés du fichier de découpe
+        precision_frame = ttk.Frame(params_frame)
+        precision_frame.grid(row=13, column=0, sticky=tk.W, pady=(0, 2))
+        ttk.Label(precision_frame, text=_("Précision des coordonnées (mm) :")).pack(side=tk.LEFT)
+        ttk.Spinbox(
+            precision_frame,
+            values=(0, 0.001, 0.01, 0.1),
+            textvariable=self.output_precision,
+            width=6
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Commandes relatives"),
+            variable=self.relative_commands
+        ).grid(row=14, column=0, sticky=tk.W, pady=(0, 2))
+        
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Un chemin composé par couleur"),
+            variable=self.compound_paths
+        ).grid(row=15, column=0, sticky=tk.W, pady=(0, 2))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Fichier de découpe plus léger : 0 = précision d'Inkscape ; les chemins d'une même couleur sont réunis dans l'ordre de découpe"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=16, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Export direct vers la machine
+        export_frame = ttk.Frame(params_frame)
+        export_frame.grid(row=17, column=0, sticky=tk.W, pady=(0, 2))
+        ttk.Label(export_frame, text=_("Export machine :")).pack(side=tk.LEFT)
+        ttk.Combobox(
+            export_frame,
+            textvariable=self.machine_export,
+            values=[_("Aucun")] + list(self.MACHINE_EXPORTS),
+            state="readonly",
+            width=10
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Fichier ' - decoupe' en G-code ou HPGL, dans l'ordre de découpe ; vitesse et puissance par couleur selon « color_presets » de OptimLaser.json"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=18, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Checkbox pour l'enchaînement par pistes eulériennes
+        ttk.Checkbutton(
+            params_frame,
+            text=_("Enchaîner les tracés aux jonctions"),
+            variable=self.eulerian_chaining
+        ).grid(row=19, column=0, sticky=tk.W, pady=(0, 2))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Les segments d'une couleur (parois communes, nids d'abeille...) sont réunis en un minimum de tracés continus : moins de perçages et de déplacements à vide"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=20, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
+        
+        # Simplification des polylignes avant le découpage en chemins
+        simplify_frame = ttk.Frame(params_frame)
+        simplify_frame.grid(row=21, column=0, sticky=tk.W, pady=(0, 2))
+        ttk.Label(simplify_frame, text=_("Simplification des polylignes (mm) :")).pack(side=tk.LEFT)
+        ttk.Spinbox(
+            simplify_frame,
+            values=(0, 0.01, 0.02, 0.05, 0.1),
+            textvariable=self.simplify_tolerance,
+            width=6
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Infotext
+        ttk.Label(
+            params_frame,
+            text=_("Écart maximal au tracé d'origine : les sommets presque alignés des polylignes (imports DXF, PDF) sont supprimés ; 0 = désactivé"),
+            foreground=self.fgLight_color,
+            font=("TkDefaultFont"),
+            wraplength=330
+        ).grid(row=22, column=0, sticky=tk.W, padx=(20, 0), pady=(0, 10))
         
         # === ZONE 2: VITESSES (AVEC FRAME) ===
         speeds_frame = ttk.LabelFrame(frame, text=_("Vitesses (mm/s)"), padding="10")
@@ -695,6 +910,23 @@ class OptimLaserGUI:
         self._format_spinbox_value(self.idle_speed_spinbox, self.idle_speed)
         ttk.Label(speeds_frame, text="mm/s").grid(row=2, column=2, sticky=tk.W, padx=(2, 0))
         
+        # Coût fixe de chaque départ de chemin (la durée de perçage par couleur
+        # vient de "pierce_time" dans les préréglages de OptimLaser.json)
+        ttk.Label(speeds_frame, text=_("Temps de démarrage :")).grid(
+            row=3, column=0, sticky=tk.W, pady=5
+        )
+        self.start_cost_spinbox = ttk.Spinbox(
+            speeds_frame,
+            from_=0.0,
+            to=10.0,
+            textvariable=self.start_cost,
+            width=10,
+            increment=0.1
+        )
+        self.start_cost_spinbox.grid(row=3, column=1, sticky=tk.W, pady=5, padx=(5, 0))
+        self._format_spinbox_value(self.start_cost_spinbox, self.start_cost)
+        ttk.Label(speeds_frame, text="s").grid(row=3, column=2, sticky=tk.W, padx=(2, 0))
+        
         # === COLONNE DROITE: ORDRE DES COULEURS ===
         colors_container = ttk.LabelFrame(frame, text=_("Ordre des couleurs"), padding="10")
         colors_container.grid(row=0, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(5, 0))
@@ -790,6 +1022,11 @@ class OptimLaserGUI:
         self.strategy_combo.config(state=state)
         self._toggle_zonage_options()
     
+    def _toggle_profiler(self):
+        """Active/désactive le choix du profileur selon le rapport de performances."""
+        state = 'readonly' if self.performance_report.get() else 'disabled'
+        self.profiler_combo.config(state=state)
+    
     def _toggle_zonage_options(self):
         """Affiche/masque les options de zonage selon la stratégie choisie."""
         show = (self.enable_global_optimization.get() and
@@ -1192,12 +1429,16 @@ class OptimLaserGUI:
             data['colors'] = [c.lstrip('#') for c in self.colors_order]
             # Mettre à jour les vitesses nommées avec label
             speeds_obj = {}
+            previous_speeds = data.get('speeds', {})
             for name, value in self.speed_presets.items():
                 label = self.speed_labels.get(name, name)
-                speeds_obj[name] = {
+                # Garder les autres champs du préréglage (puissance...)
+                previous = previous_speeds.get(name)
+                speeds_obj[name] = dict(previous) if isinstance(previous, dict) else {}
+                speeds_obj[name].update({
                     'value': float(value),
                     'label': label
-                }
+                })
             data['speeds'] = speeds_obj
             
             # Sauvegarder tous les paramètres utilisés
@@ -1211,9 +1452,21 @@ class OptimLaserGUI:
                 'zonage_size_mm': self.zonage_size_mm.get(),
                 'laser_speed': self._parse_decimal(self.laser_speed_spinbox.get()),
                 'idle_speed': self._parse_decimal(self.idle_speed_spinbox.get()),
+                'start_cost': self._parse_decimal(self.start_cost_spinbox.get()),
                 'speed_preset': self.selected_speed_name.get(),
                 'remove_unmanaged_colors': self.remove_unmanaged_colors.get(),
-                'save_as_cutting': self.save_as_cutting.get()
+                'save_as_cutting': self.save_as_cutting.get(),
+                'performance_report': self.performance_report.get(),
+                'profiler': self._get_profiler_name(),
+                'max_seconds': self.max_seconds.get(),
+                'result_cache': self.result_cache.get(),
+                'incremental': self.incremental.get(),
+                'output_precision': self.output_precision.get(),
+                'relative_commands': self.relative_commands.get(),
+                'compound_paths': self.compound_paths.get(),
+                'machine_export': self._get_machine_export_name(),
+                'eulerian_chaining': self.eulerian_chaining.get(),
+                'simplify_tolerance': self.simplify_tolerance.get()
             }
             
             # Écrire le fichier
@@ -1358,10 +1611,64 @@ class OptimLaserGUI:
         self.progress_window.protocol("WM_DELETE_WINDOW", self._cancel_during_progress)
         self.progress_window.bind('<Escape>', lambda e: self._cancel_during_progress())
         
+        # File des messages envoyés par le thread de traitement
+        self._progress_queue = queue.Queue()
+        self._tk_thread = threading.current_thread()
+        
         # Forcer l'affichage initial
         self.progress_window.update_idletasks()
         self.progress_window.update()
     
+    def run_in_background(self, task: Callable):
+        """Exécute task dans un thread de travail en gardant la fenêtre de progression active.
+        
+        Le thread de travail ne touche jamais à Tk : ses appels à update_progress
+        passent par une file vidée par la boucle Tk (after), ce qui garde la fenêtre
+        et le bouton Annuler réactifs pendant les étapes longues.
+        
+        Args:
+            task: Fonction sans argument à exécuter
+            
+        Returns:
+            La valeur retournée par task (l'exception éventuelle est relancée ici)
+        """
+        outcome = {}
+        
+        def worker():
+            try:
+                outcome['value'] = task()
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                self._progress_queue.put(('done', None))
+        
+        thread = threading.Thread(target=worker, name="OptimLaser-worker", daemon=True)
+        thread.start()
+        self.progress_window.after(50, self._drain_progress_queue)
+        self.progress_window.mainloop()
+        thread.join()
+        
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('value')
+    
+    def _drain_progress_queue(self):
+        """Traite les messages du thread de travail (appelé périodiquement par Tk)."""
+        try:
+            while True:
+                kind, payload = self._progress_queue.get_nowait()
+                if kind == 'done':
+                    # Sortir de la boucle Tk : run_in_background reprend la main
+                    self.progress_window.quit()
+                    return
+                if kind == 'progress':
+                    self._apply_progress(*payload)
+        except queue.Empty:
+            pass
+        except tk.TclError:
+            return
+        self.progress_window.after(50, self._drain_progress_queue)
+    
     def _cancel_during_progress(self):
         """Annulation demandée pendant le traitement.
         Positionne un flag que _run_optimization peut consulter."""
@@ -1371,19 +1678,34 @@ class OptimLaserGUI:
         if hasattr(self, 'progress_cancel_button'):
             self.progress_cancel_button.config(state='disabled')
     
-    def update_progress(self, task_text=None):
+    def update_progress(self, task_text=None, percent=None):
         """Force la mise à jour de la fenêtre de progression
         
+        Peut être appelée depuis le thread de traitement : le message est alors
+        transmis à la boucle Tk par la file de progression.
+        
         Args:
             task_text: Texte de la tâche en cours à afficher (optionnel)
+            percent: Avancement global mesuré, en pourcentage (optionnel)
         """
+        if getattr(self, '_tk_thread', None) not in (None, threading.current_thread()):
+            self._progress_queue.put(('progress', (task_text, percent)))
+            return
+        self._apply_progress(task_text, percent)
+    
+    def _apply_progress(self, task_text=None, percent=None):
+        """Met à jour la fenêtre de progression (thread Tk uniquement)."""
         if hasattr(self, 'progress_window') and self.progress_window:
             try:
-                if task_text and hasattr(self, 'task_label'):
+                # Garder « Annulation en cours... » affiché jusqu'à l'arrêt du traitement
+                if task_text and hasattr(self, 'task_label') and not getattr(self, '_cancel_requested', False):
                     self.task_label.config(text=task_text)
                 
-                # Incrémenter la barre de progression
-                if hasattr(self, 'progress_bar') and hasattr(self, 'progress_steps'):
+                if hasattr(self, 'progress_bar') and percent is not None:
+                    # Avancement réel transmis par le suivi des étapes
+                    self.progress_bar['value'] = max(0.0, min(percent, 100.0))
+                elif hasattr(self, 'progress_bar') and hasattr(self, 'progress_steps'):
+                    # Incrémenter la barre de progression
                     # Ne pas dépasser 90% (laisser les 10% finaux pour le finish)
                     if self.progress_bar['value'] < 90:
                         self.progress_bar['value'] += self.progress_increment
@@ -1392,12 +1714,13 @@ class OptimLaserGUI:
             except:
                 pass
     
-    def complete_progress(self, result_text=None, on_cancel=None):
+    def complete_progress(self, result_text=None, on_cancel=None, details_text=None):
         """Complète la barre de progression à 100% et affiche le résultat avec boutons OK + Annuler.
         
         Args:
             result_text: Texte de résumé à afficher (optionnel)
             on_cancel: Callback appelé si l'utilisateur clique sur Annuler (optionnel).
+            details_text: Tableau des performances par étape à afficher (optionnel)
         """
         self._progress_result = 'ok'
         self._on_cancel_progress = on_cancel
@@ -1417,7 +1740,19 @@ class OptimLaserGUI:
                 elif hasattr(self, 'task_label'):
                     self.task_label.config(text=_("Terminé."))
                 
-                # La fenêtre est déjà à la taille finale (550x400)
+                # La fenêtre est déjà à la taille finale (550x400), sauf s'il faut
+                # afficher le tableau des performances
+                if details_text:
+                    details_label = ttk.Label(
+                        self.progress_window,
+                        text=details_text,
+                        font=("Courier", 8),
+                        justify=tk.LEFT
+                    )
+                    details_label.pack(pady=(5, 0))
+                    self.progress_window.update_idletasks()
+                    height = 400 + details_label.winfo_reqheight() + 10
+                    self.progress_window.geometry(f"550x{height}")
                 
                 # Autoriser la fermeture par la croix
                 self.progress_window.protocol("WM_DELETE_WINDOW", self._close_completed_progress)
@@ -1631,11 +1966,32 @@ class OptimLaserGUI:
             'zonage_size_mm': self.zonage_size_mm.get(),
             'laser_speed': self._parse_decimal(self.laser_speed_spinbox.get()),
             'idle_speed': self._parse_decimal(self.idle_speed_spinbox.get()),
+            'start_cost': self._parse_decimal(self.start_cost_spinbox.get()),
             'colors_order': self.colors_order.copy(),
             'speed_preset': self.selected_speed_name.get(),
             'SupprimerCouleursNonGerees': self.remove_unmanaged_colors.get(),
-            'SauvegarderSousDecoupe': self.save_as_cutting.get()
+            'SauvegarderSousDecoupe': self.save_as_cutting.get(),
+            'performance_report': self.performance_report.get(),
+            'profiler': self._get_profiler_name(),
+            'max_seconds': self.max_seconds.get(),
+            'result_cache': self.result_cache.get(),
+            'incremental': self.incremental.get(),
+            'output_precision': self.output_precision.get(),
+            'relative_commands': self.relative_commands.get(),
+            'compound_paths': self.compound_paths.get(),
+            'machine_export': self._get_machine_export_name(),
+            'eulerian_chaining': self.eulerian_chaining.get(),
+            'simplify_tolerance': self.simplify_tolerance.get()
         }
+    
+    def _get_machine_export_name(self) -> str:
+        """Format d'export machine choisi ('none' si aucun)."""
+        return self.MACHINE_EXPORTS.get(self.machine_export.get(), 'none')
+    
+    def _get_profiler_name(self) -> str:
+        """Nom du profileur détaillé choisi ('none' si aucun)."""
+        value = self.profiler.get()
+        return value if value in ('cProfile', 'pyinstrument') else 'none'
 
 
 def show_gui(config_file: Optional[str] = None,
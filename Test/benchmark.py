@@ -0,0 +1,474 @@
+"""
+Banc d'essai OptimLaser - Génération de travaux synthétiques et mesure du pipeline
+
+Génère des SVG paramétriques représentatifs des travaux de découpe (grilles de
+boîtes à bords communs, engrenages imbriqués, texte vectorisé dense, calques
+dupliqués, arcs et Bézier), exécute chaque étape du pipeline puis chaque
+stratégie d'ordonnancement, et enregistre les temps, la distance à vide et une
+empreinte de la sortie.
+
+Les résultats sont écrits en JSON avec le commit courant pour être comparés
+d'un commit à l'autre :
+
+    python Test/benchmark.py --sizes 1k 10k --output avant.json
+    (modifications)
+    python Test/benchmark.py --sizes 1k 10k --output apres.json --compare avant.json
+
+La comparaison signale les étapes ralenties au-delà du seuil, les distances à
+vide dégradées et les sorties géométriquement différentes (code de retour 1).
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'OptimLaser'))
+
+import inkex  # noqa: E402
+import OptimLaser as OL  # noqa: E402
+from profiling import StageProfiler  # noqa: E402
+
+STRATEGIES = ['Plus proche voisin', 'Optimisation locale', 'Zonage']
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+COLORS = ['#000000', '#ff0000', '#0000ff']
+
+SVG_HEADER = (
+    '<svg xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+    'width="{w}mm" height="{h}mm" viewBox="0 0 {w} {h}" version="1.1">\n'
+)
+STYLE = 'fill:none;stroke:{};stroke-width:0.1'
+
+
+# =============================================================================
+# Générateurs de travaux
+# =============================================================================
+
+def _fmt(value):
+    """Formate une coordonnée de façon compacte et reproductible."""
+    return f"{value:.3f}".rstrip('0').rstrip('.')
+
+
+def _path(d, color='#000000'):
+    return f'  <path style="{STYLE.format(color)}" d="{d}"/>\n'
+
+
+def _layer(name, body):
+    return (f'<g inkscape:groupmode="layer" inkscape:label="{name}" id="{name}">\n'
+            f'{body}</g>\n')
+
+
+def _document(width, height, layers):
+    return SVG_HEADER.format(w=_fmt(width), h=_fmt(height)) + ''.join(layers) + '</svg>\n'
+
+
+def _grid_body(segments, pitch=10.0, offset=0.0):
+    """Grille de boîtes carrées adjacentes : chaque bord intérieur est découpé deux fois."""
+    side = max(1, int(math.ceil(math.sqrt(segments / 4.0))))
+    body = []
+    for row in range(side):
+        color = COLORS[1] if row % 5 == 4 else COLORS[0]
+        for col in range(side):
+            x, y = col * pitch + offset, row * pitch + offset
+            body.append(_path(f"M {_fmt(x)} {_fmt(y)} h {_fmt(pitch)} v {_fmt(pitch)} "
+                              f"h {_fmt(-pitch)} Z", color))
+    return ''.join(body), side * pitch
+
+
+def gen_grid_boxes(segments, rng):
+    """Grille de boîtes partageant leurs bords (doublons droits colinéaires)."""
+    body, extent = _grid_body(segments)
+    return _document(extent + 10, extent + 10, [_layer('Boites', body)])
+
+
+def _gear_path(cx, cy, radius, teeth, depth):
+    """Contour d'engrenage en segments droits (4 segments par dent)."""
+    points = []
+    step = 2.0 * math.pi / teeth
+    for k in range(teeth):
+        a = k * step
+        for frac, r in ((0.0, radius - depth), (0.25, radius), (0.5, radius), (0.75, radius - depth)):
+            ang = a + frac * step
+            points.append((cx + r * math.cos(ang), cy + r * math.sin(ang)))
+    d = "M " + " L ".join(f"{_fmt(x)} {_fmt(y)}" for x, y in points) + " Z"
+    return d
+
+
+def gen_nested_gears(segments, rng):
+    """Engrenages concentriques avec alésage circulaire (droites + cercles)."""
+    per_cluster = 3 * 4 * 24 + 4
+    clusters = max(1, segments // per_cluster)
+    side = int(math.ceil(math.sqrt(clusters)))
+    body = []
+    pitch = 60.0
+    for idx in range(clusters):
+        cx = (idx % side) * pitch + pitch / 2
+        cy = (idx // side) * pitch + pitch / 2
+        for level, radius in enumerate((27.0, 19.0, 11.0)):
+            body.append(_path(_gear_path(cx, cy, radius, 24, 2.0), COLORS[level % 2]))
+        body.append(f'  <circle style="{STYLE.format(COLORS[0])}" cx="{_fmt(cx)}" '
+                    f'cy="{_fmt(cy)}" r="4"/>\n')
+    return _document(side * pitch, side * pitch, [_layer('Engrenages', ''.join(body))])
+
+
+def _glyph(x, y, size, kind):
+    """Glyphe synthétique façon texte vectorisé (Bézier cubiques + droites)."""
+    k = 0.5523 * size / 2
+    r = size / 2
+    cx, cy = x + r, y + r
+    if kind == 0:
+        # « o » : deux ellipses de quatre cubiques
+        paths = []
+        for rr, kk in ((r, k), (r * 0.6, k * 0.6)):
+            paths.append(
+                f"M {_fmt(cx + rr)} {_fmt(cy)} "
+                f"C {_fmt(cx + rr)} {_fmt(cy + kk)} {_fmt(cx + kk)} {_fmt(cy + rr)} {_fmt(cx)} {_fmt(cy + rr)} "
+                f"C {_fmt(cx - kk)} {_fmt(cy + rr)} {_fmt(cx - rr)} {_fmt(cy + kk)} {_fmt(cx - rr)} {_fmt(cy)} "
+                f"C {_fmt(cx - rr)} {_fmt(cy - kk)} {_fmt(cx - kk)} {_fmt(cy - rr)} {_fmt(cx)} {_fmt(cy - rr)} "
+                f"C {_fmt(cx + kk)} {_fmt(cy - rr)} {_fmt(cx + rr)} {_fmt(cy - kk)} {_fmt(cx + rr)} {_fmt(cy)} Z")
+        return paths
+    if kind == 1:
+        # « n » : jambages droits et voûte quadratique
+        w = size * 0.15
+        return [f"M {_fmt(x)} {_fmt(y + size)} L {_fmt(x)} {_fmt(y + r)} "
+                f"Q {_fmt(cx)} {_fmt(y - r * 0.2)} {_fmt(x + size)} {_fmt(y + r)} "
+                f"L {_fmt(x + size)} {_fmt(y + size)} L {_fmt(x + size - w)} {_fmt(y + size)} "
+                f"L {_fmt(x + size - w)} {_fmt(y + r)} "
+                f"Q {_fmt(cx)} {_fmt(y + r * 0.3)} {_fmt(x + w)} {_fmt(y + r)} "
+                f"L {_fmt(x + w)} {_fmt(y + size)} Z"]
+    # « l » : fût droit
+    w = size * 0.15
+    return [f"M {_fmt(cx - w / 2)} {_fmt(y - r * 0.5)} h {_fmt(w)} v {_fmt(size + r * 0.5)} "
+            f"h {_fmt(-w)} Z"]
+
+
+def gen_text_outlines(segments, rng):
+    """Texte vectorisé dense : petits glyphes très rapprochés."""
+    size, spacing = 3.0, 3.6
+    per_glyph = 8
+    count = max(1, segments // per_glyph)
+    columns = max(1, int(math.sqrt(count) * 2))
+    body = []
+    for idx in range(count):
+        x = 5 + (idx % columns) * spacing
+        y = 5 + (idx // columns) * spacing * 1.6
+        for d in _glyph(x, y, size, rng.randrange(3)):
+            body.append(_path(d, COLORS[0]))
+    rows = (count + columns - 1) // columns
+    return _document(columns * spacing + 10, rows * spacing * 1.6 + 10, [_layer('Texte', ''.join(body))])
+
+
+def gen_duplicated_layers(segments, rng):
+    """Même grille copiée sur trois calques, dont une copie décalée sous la tolérance."""
+    layers = []
+    extent = 0.0
+    for idx, offset in enumerate((0.0, 0.0, 0.05)):
+        body, extent = _grid_body(segments // 3, offset=offset)
+        layers.append(_layer(f'Calque{idx + 1}', body))
+    return _document(extent + 10, extent + 10, layers)
+
+
+def gen_arcs_beziers(segments, rng):
+    """Arcs et Bézier aléatoires, dont 20 % de doublons (Bézier inversées, arcs partiels)."""
+    extent = max(50.0, math.sqrt(segments) * 8.0)
+    body = []
+    produced = 0
+    while produced < segments:
+        x, y = rng.uniform(5, extent - 5), rng.uniform(5, extent - 5)
+        kind = rng.randrange(3)
+        if kind == 0:
+            r = rng.uniform(1.0, 4.0)
+            a0 = rng.uniform(0, 2 * math.pi)
+            a1 = a0 + rng.uniform(0.3, 3.0)
+            p0 = (x + r * math.cos(a0), y + r * math.sin(a0))
+            p1 = (x + r * math.cos(a1), y + r * math.sin(a1))
+            d = (f"M {_fmt(p0[0])} {_fmt(p0[1])} A {_fmt(r)} {_fmt(r)} 0 "
+                 f"{1 if a1 - a0 > math.pi else 0} 1 {_fmt(p1[0])} {_fmt(p1[1])}")
+            if rng.random() < 0.2:
+                # Doublon partiel sur le même cercle
+                am = (a0 + a1) / 2
+                pm = (x + r * math.cos(am), y + r * math.sin(am))
+                a2 = a1 + 0.4
+                p2 = (x + r * math.cos(a2), y + r * math.sin(a2))
+                body.append(_path(f"M {_fmt(pm[0])} {_fmt(pm[1])} A {_fmt(r)} {_fmt(r)} 0 0 1 "
+                                  f"{_fmt(p2[0])} {_fmt(p2[1])}"))
+                produced += 1
+        else:
+            pts = [(x + rng.uniform(-4, 4), y + rng.uniform(-4, 4)) for _ in range(4 if kind == 1 else 3)]
+            letter = 'C' if kind == 1 else 'Q'
+            d = f"M {_fmt(pts[0][0])} {_fmt(pts[0][1])} {letter} " + " ".join(
+                f"{_fmt(px)} {_fmt(py)}" for px, py in pts[1:])
+            if rng.random() < 0.2:
+                # Doublon parcouru en sens inverse
+                rev = list(reversed(pts))
+                body.append(_path(f"M {_fmt(rev[0][0])} {_fmt(rev[0][1])} {letter} " + " ".join(
+                    f"{_fmt(px)} {_fmt(py)}" for px, py in rev[1:])))
+                produced += 1
+        body.append(_path(d))
+        produced += 1
+    return _document(extent, extent, [_layer('Courbes', ''.join(body))])
+
+
+WORKLOADS = {
+    'grille_boites': gen_grid_boxes,
+    'engrenages': gen_nested_gears,
+    'texte': gen_text_outlines,
+    'calques_dupliques': gen_duplicated_layers,
+    'arcs_bezier': gen_arcs_beziers,
+}
+
+
+# =============================================================================
+# Exécution du pipeline
+# =============================================================================
+
+def _configure(ext, strategy, tolerance):
+    """Applique les paramètres qu'aurait fournis l'interface graphique."""
+    ext.tolerance = tolerance
+    ext.enable_partial_overlap = True
+    ext.overlap_threshold = 0.0
+    ext.enable_global_optimization = True
+    ext.optimization_strategy = strategy
+    ext.max_iterations = 50
+    ext.zonage_direction = 'colonnes'
+    ext.zonage_size_mm = 10.0
+    ext.laser_speed = 25.0
+    ext.idle_speed = 2800.0
+    # Le filtrage dépend de OptimLaser.json : désactivé pour des mesures reproductibles
+    ext.SupprimerCouleursNonGerees = False
+    ext.SauvegarderSousDecoupe = False
+    ext.remove_duplicates_all_colors = False
+    ext.gui_instance = None
+
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+
+
+def _normalized_d(element):
+    """Données de chemin arrondies à 1/1000 mm (insensibles au bruit flottant)."""
+    return _NUMBER.sub(lambda m: f"{float(m.group()):.3f}", element.get('d', ''))
+
+
+def geometry_hash(svg, ordered=False):
+    """Empreinte de la géométrie de sortie (ordonnée ou non)."""
+    ds = [_normalized_d(p) for p in svg.xpath('//svg:path')]
+    if not ordered:
+        ds.sort()
+    return hashlib.md5("\n".join(ds).encode('utf-8')).hexdigest()[:12]
+
+
+def run_workload(svg_path, strategies, tolerance=0.15):
+    """
+    Exécute le pipeline complet sur un fichier, puis chaque stratégie d'ordre
+    sur une copie du document fusionné.
+
+    Returns:
+        Dictionnaire des mesures (étapes, stratégies, empreintes)
+    """
+    OL.OptimLaser._distance_cache.clear()
+    ext = OL.OptimLaser()
+    ext.parse_arguments([svg_path])
+    ext.document = inkex.load_svg(svg_path)
+    ext.svg = ext.document.getroot()
+    _configure(ext, strategies[0], tolerance)
+
+    profiler = StageProfiler(counter=lambda: len(ext.svg.xpath('//svg:path')))
+    stages = [
+        ('gray_save', ext.save_gray_elements),
+        ('ungroup', ext.ungroup_and_apply_transform_to_children),
+        ('color_filter', ext.remove_unmanaged_colors),
+        ('subpaths', ext.replace_with_subpaths),
+        ('dedup', ext.adjust_overlapping_segments),
+        ('merge', ext._optimize_path),
+    ]
+    for name, func in stages:
+        with profiler.stage(name):
+            func()
+
+    result = {
+        'segments_in': profiler.records[4].elements_in,
+        'paths_out': profiler.records[-1].elements_out,
+        'stages': {r.name: {'wall_s': r.wall_s, 'cpu_s': r.cpu_s,
+                            'peak_rss_delta_kb': r.peak_rss_delta_kb,
+                            'elements_in': r.elements_in, 'elements_out': r.elements_out}
+                   for r in profiler.records},
+        'merged_hash': geometry_hash(ext.svg),
+        'strategies': {},
+    }
+
+    merged_document = ext.document
+    for strategy in strategies:
+        OL.OptimLaser._distance_cache.clear()
+        run = OL.OptimLaser()
+        run.parse_arguments([svg_path])
+        run.document = copy.deepcopy(merged_document)
+        run.svg = run.document.getroot()
+        _configure(run, strategy, tolerance)
+        run.ListeDeGris = []
+        start = time.perf_counter()
+        cpu = time.process_time()
+        stats = run._optimize_path_order() or {}
+        result['strategies'][strategy] = {
+            'wall_s': time.perf_counter() - start,
+            'cpu_s': time.process_time() - cpu,
+            'initial_idle_mm': stats.get('initial_idle'),
+            'final_idle_mm': stats.get('final_idle'),
+            'num_paths': stats.get('num_paths'),
+            'order_hash': geometry_hash(run.svg, ordered=True),
+            'geometry_hash': geometry_hash(run.svg),
+        }
+    return result
+
+
+def _git_revision():
+    """Commit courant (suffixé de + si l'arbre de travail est modifié)."""
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                             capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ('+' if dirty else '')
+    except Exception:
+        return 'inconnu'
+
+
+# =============================================================================
+# Comparaison entre deux exécutions
+# =============================================================================
+
+def compare(current, reference, threshold, min_time=0.05):
+    """
+    Compare deux rapports et retourne la liste des régressions constatées.
+
+    Args:
+        current: Rapport courant
+        reference: Rapport de référence
+        threshold: Ralentissement relatif toléré (0.2 = 20 %)
+        min_time: Durée de référence en dessous de laquelle les temps ne sont pas comparés
+    """
+    problems = []
+    lines = []
+    for key, cur in current['results'].items():
+        ref = reference['results'].get(key)
+        if ref is None:
+            continue
+        for stage, cur_stage in list(cur['stages'].items()) + [
+                (f"ordre:{s}", v) for s, v in cur['strategies'].items()]:
+            if stage.startswith('ordre:'):
+                ref_stage = ref['strategies'].get(stage[6:])
+            else:
+                ref_stage = ref['stages'].get(stage)
+            if not ref_stage:
+                continue
+            before, after = ref_stage['wall_s'], cur_stage['wall_s']
+            ratio = after / before if before > 0 else float('inf')
+            lines.append(f"{key:<28} {stage:<32} {before:9.3f} s {after:9.3f} s  x{ratio:5.2f}")
+            if before >= min_time and ratio > 1.0 + threshold:
+                problems.append(f"{key} / {stage} : {before:.3f} s -> {after:.3f} s")
+        if cur['merged_hash'] != ref['merged_hash']:
+            problems.append(f"{key} : géométrie fusionnée différente "
+                            f"({ref['paths_out']} -> {cur['paths_out']} chemins)")
+        for strategy, cur_s in cur['strategies'].items():
+            ref_s = ref['strategies'].get(strategy)
+            if not ref_s:
+                continue
+            if cur_s['geometry_hash'] != ref_s['geometry_hash']:
+                problems.append(f"{key} / {strategy} : géométrie de sortie différente")
+            if (ref_s['final_idle_mm'] is not None and cur_s['final_idle_mm'] is not None
+                    and cur_s['final_idle_mm'] > ref_s['final_idle_mm'] * 1.005 + 1e-6):
+                problems.append(f"{key} / {strategy} : trajet à vide "
+                                f"{ref_s['final_idle_mm']:.1f} -> {cur_s['final_idle_mm']:.1f} mm")
+    return lines, problems
+
+
+# =============================================================================
+# Point d'entrée
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du pipeline OptimLaser")
+    parser.add_argument('--workloads', nargs='+', choices=sorted(WORKLOADS), default=sorted(WORKLOADS),
+                        help="Travaux synthétiques à générer")
+    parser.add_argument('--sizes', nargs='+', default=['1k'],
+                        help="Nombre de segments par travail (1k, 10k, 100k ou un entier)")
+    parser.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=STRATEGIES,
+                        help="Stratégies d'ordre de découpe à mesurer")
+    parser.add_argument('--files', nargs='*', default=[],
+                        help="Fichiers SVG réels à ajouter (ex: Test/Test.svg)")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Fichier JSON de résultats à écrire")
+    parser.add_argument('--compare', help="Rapport JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Ralentissement relatif toléré lors de la comparaison")
+    parser.add_argument('--keep-svg', help="Dossier où conserver les SVG générés")
+    args = parser.parse_args(argv)
+
+    report = {
+        'revision': _git_revision(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tolerance': args.tolerance,
+        'seed': args.seed,
+        'results': {},
+    }
+
+    work_dir = args.keep_svg or tempfile.mkdtemp(prefix='optimlaser_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+
+    jobs = []
+    for size in args.sizes:
+        segments = SIZES.get(size) or int(size)
+        for name in args.workloads:
+            rng = random.Random(f"{args.seed}-{name}-{segments}")
+            svg_path = os.path.join(work_dir, f"{name}_{size}.svg")
+            with open(svg_path, 'w', encoding='utf-8') as f:
+                f.write(WORKLOADS[name](segments, rng))
+            jobs.append((f"{name}_{size}", svg_path))
+    for path in args.files:
+        jobs.append((os.path.basename(path), os.path.abspath(path)))
+
+    for key, svg_path in jobs:
+        print(f"{key} ...", flush=True)
+        result = run_workload(svg_path, args.strategies, args.tolerance)
+        report['results'][key] = result
+        stage_text = "  ".join(f"{n}={s['wall_s']:.2f}s" for n, s in result['stages'].items())
+        print(f"  {result['segments_in']} segments -> {result['paths_out']} chemins  {stage_text}")
+        for strategy, s in result['strategies'].items():
+            print(f"  {strategy:<20} {s['wall_s']:8.2f} s  à vide {s['final_idle_mm']:.1f} mm")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Résultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+        lines, problems = compare(report, reference, args.threshold)
+        print(f"\nComparaison avec {reference.get('revision', '?')} :")
+        for line in lines:
+            print(line)
+        if problems:
+            print("\nRégressions :")
+            for problem in problems:
+                print(f"  - {problem}")
+            return 1
+        print("\nAucune régression.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
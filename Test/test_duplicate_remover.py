@@ -0,0 +1,125 @@
+"""
+Tests de non-régression de DuplicateRemover.find_duplicate_line_segments
+
+L'index par droite canonique doit trouver exactement les mêmes chevauchements
+que la comparaison de toutes les paires de segments de même couleur.
+
+    python -m pytest -q Test/test_duplicate_remover.py
+"""
+
+import math
+import os
+import random
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'OptimLaser'))
+
+from duplicate_remover import DuplicateRemover  # noqa: E402
+from geometry import Point  # noqa: E402
+
+
+def _segment(seg_id, x1, y1, x2, y2, color='#000000'):
+    return {'id': seg_id, 'start': Point(x1, y1), 'end': Point(x2, y2), 'color': color}
+
+
+def _distance_to_segment(p, a, b):
+    dx, dy = b.x - a.x, b.y - a.y
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((p.x - a.x) * dx + (p.y - a.y) * dy) / length_sq))
+    return math.hypot(p.x - (a.x + t * dx), p.y - (a.y + t * dy))
+
+
+def _brute_force(remover, segments):
+    """
+    Toutes les paires de même couleur, d'après le contrat de OverlapInfo.
+
+    Les deux extrémités du plus court segment sont à moins de la tolérance de
+    l'autre ; le ratio est le chevauchement des projections sur la direction du
+    premier segment, rapporté au plus court ; les points de fusion sont les
+    extrémités de projection minimale et maximale.
+    """
+    by_color = {}
+    for seg in segments:
+        by_color.setdefault(seg.get('color', '#000000'), []).append(seg)
+    expected = []
+    for group in by_color.values():
+        for i, seg1 in enumerate(group):
+            for seg2 in group[i + 1:]:
+                len1 = seg1['start'].distance_to(seg1['end'])
+                len2 = seg2['start'].distance_to(seg2['end'])
+                shorter, longer = (seg1, seg2) if len1 <= len2 else (seg2, seg1)
+                if any(_distance_to_segment(p, longer['start'], longer['end']) >= remover.tolerance
+                       for p in (shorter['start'], shorter['end'])):
+                    continue
+                ux = (seg1['end'].x - seg1['start'].x) / len1
+                uy = (seg1['end'].y - seg1['start'].y) / len1
+                points = [seg1['start'], seg1['end'], seg2['start'], seg2['end']]
+                proj = [(p.x - seg1['start'].x) * ux + (p.y - seg1['start'].y) * uy for p in points]
+                overlap = min(proj[1], max(proj[2], proj[3])) - max(proj[0], min(proj[2], proj[3]))
+                ratio = max(0.0, overlap) / min(len1, len2)
+                if ratio < remover.overlap_threshold:
+                    continue
+                order = sorted(range(4), key=lambda k: proj[k])
+                expected.append((seg1['id'], seg2['id'], ratio, points[order[0]], points[order[-1]]))
+    return expected
+
+
+def _assert_same(found, expected):
+    assert [(o.segment1_id, o.segment2_id) for o in found] == [e[:2] for e in expected]
+    for overlap, (_, _, ratio, merge1, merge2) in zip(found, expected):
+        assert math.isclose(overlap.overlap_ratio, ratio, abs_tol=1e-9)
+        assert overlap.merge_point1.distance_to(merge1) < 1e-9
+        assert overlap.merge_point2.distance_to(merge2) < 1e-9
+
+
+def _indexed(remover, segments):
+    return [(o.segment1_id, o.segment2_id) for o in remover.find_duplicate_line_segments(segments)]
+
+
+def _jittered_job(rng, count):
+    """Segments aléatoires dont certains sont recopiés avec un léger bruit."""
+    segments = []
+    for k in range(count):
+        x, y = rng.uniform(0, 20), rng.uniform(0, 20)
+        angle = rng.choice([0.0, math.pi / 2, rng.uniform(0, math.pi)])
+        length = rng.uniform(0.05, 5.0)
+        color = rng.choice(['#000000', '#ff0000'])
+        segments.append(_segment(str(k), x, y, x + length * math.cos(angle),
+                                 y + length * math.sin(angle), color))
+        for m in range(rng.randint(0, 2)):
+            source = segments[rng.randrange(len(segments))]
+            jitter = [rng.uniform(-0.08, 0.08) for _ in range(4)]
+            segments.append(_segment(f'{k}_{m}',
+                                     source['start'].x + jitter[0], source['start'].y + jitter[1],
+                                     source['end'].x + jitter[2], source['end'].y + jitter[3],
+                                     source['color']))
+    return segments
+
+
+def test_short_segments_beyond_one_angle_bucket():
+    remover = DuplicateRemover(tolerance=0.15)
+    segments = [_segment('a', 0, 0, 2, 0), _segment('b', 0, 0.05, 2, 0)]
+    assert _indexed(remover, segments) == [('a', 'b')]
+    _assert_same(remover.find_duplicate_line_segments(segments), _brute_force(remover, segments))
+
+
+def test_shared_endpoint_at_wide_angle_is_not_a_duplicate():
+    remover = DuplicateRemover(tolerance=0.1)
+    segments = [_segment('a', 0, 0, 10, 10), _segment('b', 0, 0, 10, 2)]
+    assert _indexed(remover, segments) == []
+
+
+def test_short_segment_inside_a_longer_one():
+    remover = DuplicateRemover(tolerance=0.1)
+    segments = [_segment('a', 0, 0, 100, 0), _segment('b', 50, 0.03, 50.08, -0.03)]
+    assert _indexed(remover, segments) == [('a', 'b')]
+    _assert_same(remover.find_duplicate_line_segments(segments), _brute_force(remover, segments))
+
+
+def test_matches_brute_force_on_random_jobs():
+    rng = random.Random(1)
+    for _ in range(300):
+        remover = DuplicateRemover(tolerance=0.1)
+        segments = _jittered_job(rng, rng.randint(2, 30))
+        _assert_same(remover.find_duplicate_line_segments(segments), _brute_force(remover, segments))
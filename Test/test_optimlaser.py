@@ -0,0 +1,88 @@
+"""
+Tests de non-régression des étapes de l'extension OptimLaser
+
+Les étapes sont enchaînées sur de petits dessins, sans interface.
+
+    python -m pytest -q Test/test_optimlaser.py
+"""
+
+import os
+import sys
+
+import pytest
+
+inkex = pytest.importorskip('inkex')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'OptimLaser'))
+
+import OptimLaser as OL  # noqa: E402
+
+SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+    'width="100mm" height="100mm" viewBox="0 0 100 100">\n'
+    '<g inkscape:groupmode="layer" inkscape:label="Calque" id="layer1">\n'
+    '{body}</g>\n</svg>\n'
+)
+
+
+def _extension(tmp_path, body):
+    """Extension chargée sur un dessin à un calque, avec les réglages par défaut."""
+    svg_file = tmp_path / 'dessin.svg'
+    svg_file.write_text(SVG.format(body=body), encoding='utf-8')
+    ext = OL.OptimLaser()
+    ext.parse_arguments([str(svg_file)])
+    ext.load_raw()
+    ext.tolerance = 0.1
+    ext.enable_partial_overlap = True
+    ext.overlap_threshold = 0.7
+    ext.enable_global_optimization = False
+    ext.SupprimerCouleursNonGerees = True
+    ext.remove_duplicates_all_colors = False
+    return ext
+
+
+def _run_until_merge(ext):
+    ext.save_gray_elements()
+    ext.ungroup_and_apply_transform_to_children()
+    ext.remove_unmanaged_colors()
+    ext.replace_with_subpaths()
+    ext.adjust_overlapping_segments()
+    ext._optimize_path()
+
+
+def _paths(ext):
+    return [el for el in ext.svg.iter() if isinstance(el, inkex.PathElement)]
+
+
+def test_merge_paths_with_presentation_attributes_only(tmp_path):
+    ext = _extension(tmp_path,
+                     '<path id="p1" d="M 10 10 L 40 10" stroke="#ff0000" fill="none"/>\n'
+                     '<path id="p2" d="M 40 10 L 40 40" stroke="#ff0000" fill="none"/>\n')
+    _run_until_merge(ext)
+    paths = _paths(ext)
+    assert len(paths) == 1
+    assert str(paths[0].path) == 'M 10 10 L 40 10 L 40 40'
+
+
+def test_output_options_apply_without_ordering(tmp_path):
+    ext = _extension(tmp_path,
+                     '<path id="p1" d="M 10.123 10 L 40 10" style="stroke:#ff0000;fill:none"/>\n'
+                     '<path id="p2" d="M 50 50 L 60.456 60" style="stroke:#ff0000;fill:none"/>\n')
+    ext.output_precision = 0.1
+    ext.compound_paths = True
+    assert 'output' in [name for name, _ in ext._create_progress().plan]
+    _run_until_merge(ext)
+    ext._write_output_in_document_order()
+    paths = _paths(ext)
+    assert len(paths) == 1
+    assert paths[0].get('d') == 'M10.1 10L40 10M50 50L60.5 60'
+
+
+def test_shape_count_skips_non_rendered_elements(tmp_path):
+    ext = _extension(tmp_path,
+                     '<defs><marker id="m"><path d="M 0 0 L 1 1"/></marker></defs>\n'
+                     '<path id="p1" d="M 10 10 L 40 10" stroke="#ff0000" fill="none"/>\n'
+                     '<circle cx="5" cy="5" r="2"/>\n')
+    assert ext._count_shapes() == 2